@@ -1,6 +1,25 @@
 ### DB
 
+# The records are kept in a SQLite file, in a CSV file if the
+# backend is "csv" or in a binary record log if it is "log", the
+# records of the CSV file are copied once to a new SQLite file or
+# log and the CSV file isn't read again
+DB_BACKEND = "sqlite"
 DB_FILEPATH = "records.csv"
+SQLITE_DB_FILEPATH = "records.db"
+RECORD_LOG_FILEPATH = "records.log"
+# The cleared rows of the record log are removed when there are
+# at least this many of them and they are half of its rows
+RECORD_LOG_COMPACTION_ROWS = 1024
+# The best records are kept in memory and the CSV
+# and the log backends save them next to their file
+DB_TOP_RECORDS_COUNT = 10
+TOP_RECORDS_FILE_SUFFIX = ".top.json"
+# The records are written by a writer thread in batches, a batch
+# is written when it is full or after the flush interval in seconds
+RECORD_WRITER_QUEUE_SIZE = 64
+RECORD_WRITER_BATCH_SIZE = 16
+RECORD_WRITER_FLUSH_INTERVAL = 1.0
 
 
 ### SOUNDS
@@ -8,6 +27,13 @@ DB_FILEPATH = "records.csv"
 MAIN_MENU_THEME_PATH = "assets/sounds/main_menu_theme.mp3"
 GAME_THEME_PATH = "assets/sounds/game_theme.mp3"
 
+### ASSETS
+
+ATLAS_DIR = "assets/atlases"
+ATLAS_MANIFEST_PATH = "assets/atlases/manifest.json"
+ATLAS_MAX_WIDTH = 2048
+BAKE_CACHE_PATH = ".cache/assets.bin"
+
 ### SIZES
 
 # Screen
@@ -27,6 +53,13 @@ PROMPT_WIDTH = SCREEN_WIDTH / 2 + 60
 PROMPT_HEIGHT = SCREEN_HEIGHT / 5
 PROMPT_TITLE_WIDTH = PROMPT_WIDTH - 30
 PROMPT_TITLE_HEIGHT = 65
+DEBUG_STATS_FONT_SIZE = 22
+DEBUG_STATS_TEXT_COLOR = (255, 255, 0)
+TEXT_CACHE_SIZE = 128
+LEADERBOARD_SIZE = 10
+LEADERBOARD_FONT_SIZE = 28
+LEADERBOARD_TITLE_FONT_SIZE = 50
+LEADERBOARD_TEXT_COLOR = (230, 230, 230)
 
 # Player
 PLAYER_WIDTH = 140
@@ -58,7 +91,11 @@ ENEMY_HEIGHT = 90
 ### GAME OPTIONS
 
 # Speeds
+# The game speeds are per tick and the game runs
+# TICK_RATE ticks per second at any frame rate
 FPS = 120
+TICK_RATE = 120
+MAX_TICKS_PER_FRAME = 10
 GAME_SPEED = 5
 MAX_GAME_SPEED = 10
 GAME_SPEED_INCREMENT_FACTOR = 0.0008
@@ -77,13 +114,57 @@ MAX_SPRITES_ON_SCREEN = 4
 MIN_SPRITES_DISTANCE_FACTOR = 5
 MAX_SPRITES_DISTANCE_FACTOR = 12
 SPRITES_ON_SCREEN_INCREMENT_FACTOR = 0.005
-SPRITES_DISTANCE_DECREMENT_FACTOR = 0.002
+SPRITES_DISTANCE_DECREMENT_FACTOR = 0.0016
 PLAYER_MAX_HEATH = 3
 SPRINT_ACTION_DURATION_IN_MS = 6000
 SHIELD_ACTION_DURATION_IN_MS = 8000
 SCORE_BOOST_ACTION_DURATION_IN_MS = 10000
 ENEMY_KILL_SCORE = 5
 OBSTACLE_PASSING_SCORE = 2
+# Check the model masks after the rects are colliding,
+# otherwise the player rect without its empty spaces is used.
+# The sprite distance decrement is tuned for the masks
+PIXEL_PERFECT_COLLISION = True
+
+# Rendering
+# Only the changed areas of the game screen are updated
+# and if they are more than the max area factor of the
+# screen, the whole screen is updated
+DIRTY_RECT_RENDERING = True
+DIRTY_RECTS_MAX_AREA_FACTOR = 0.75
+
+# Sprites
+# The sprite positions and animations can be kept in NumPy
+# arrays and updated at once, it is only used if NumPy is
+# installed and it is faster with hundreds of sprites
+ARRAY_SPRITE_STORE = False
+SPRITE_STORE_CAPACITY = 64
+# Killed sprites are reused and this count of every
+# sprite class is made before starting the game
+SPRITE_POOL_PREWARM_COUNT = 2
+# Count of the upcoming spawns that are generated before
+# they happen, they are about a few seconds of the game
+SPAWN_SCHEDULE_LOOK_AHEAD = 4
+
+# Debug
+SHOW_DEBUG_STATS = False
+
+# Replays
+# The seed and the inputs of every game are saved in
+# the replays directory, play them with `python -m game.replay`
+RECORD_REPLAYS = False
+REPLAYS_DIR = "replays"
+REPLAY_FILE_SUFFIX = ".replay"
+
+# Spawn difficulty tiers
+# The drop chances of every sprite category are multiplied
+# by the factors of the tier, the tier is picked by the game
+# speed without the sprint
+SPAWN_DIFFICULTY_TIERS = [
+    {"min_speed": 0, "enemy": 1, "obstacle": 1, "item": 1},
+    {"min_speed": 7, "enemy": 1.15, "obstacle": 1.1, "item": 0.95},
+    {"min_speed": 9, "enemy": 1.3, "obstacle": 1.2, "item": 0.9},
+]
 
 # Sprite drop chances
 SINGLE_BLOCK_DROP_CHANCE = 1.5
@@ -1,14 +1,104 @@
 import csv, os
+from abc import ABC, abstractmethod
+from heapq import nlargest
+from itertools import islice
+from operator import attrgetter
+from config import conf
 from .record import Record
+from .top_records import TopRecords
 
+# The record values that the records can be ordered by
+RECORD_ORDERS = ("score", "kills", "coins")
 
-class DB:
+
+def check_record_order(by: str):
+    if by not in RECORD_ORDERS:
+        raise ValueError(f"Unknown record order : {by}")
+
+
+class DB(ABC):
+    # Base of the record backends, every backend keeps the
+    # records in its own file and a backend without one of
+    # the abstract methods can't be created
     def __init__(self, filepath: str) -> None:
         self.filepath = filepath
 
+        # The best records are kept in memory, so a high
+        # score is found without reading the records
+        self.top_records = TopRecords(conf.DB_TOP_RECORDS_COUNT)
+
+    @property
+    def best_score(self):
+        return self.top_records.best_score
+
+    @property
+    def file_signature(self):
+        stat = os.stat(self.filepath)
+
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def load_top_records(self, read_records):
+        # The file backends save their top records next to their file,
+        # the records are read again with the given function only if
+        # the top records file is missing or the records file is changed
+        self.top_records_filepath = self.filepath + conf.TOP_RECORDS_FILE_SUFFIX
+
+        if not self.top_records.load(self.top_records_filepath, self.file_signature):
+            self.top_records.set(read_records())
+            self.save_top_records()
+
+    def save_top_records(self):
+        self.top_records.save(self.top_records_filepath, self.file_signature)
+
+    @abstractmethod
+    def add_record(self, record: Record):
+        pass
+
+    def add_records(self, records: list[Record]):
+        for record in records:
+            self.add_record(record)
+
+    def is_there_any_higher_records(self, record: Record):
+        return self.best_score is not None and self.best_score > record.score
+
+    @abstractmethod
+    def clear_all_records(self):
+        pass
+
+    @abstractmethod
+    def iter_records(self, offset: int = 0, limit: int = None):
+        # Yields the records in the order that they are added
+        # from the offset, without reading all of them at once
+        pass
+
+    def get_all_records(self) -> list[Record]:
+        return list(self.iter_records())
+
+    def top(self, k: int, by: str = "score") -> list[Record]:
+        # The best k records by the given value, the records
+        # with equal values are in the order that they are added
+        check_record_order(by)
+
+        # The best score records are already in memory
+        if by == "score" and k <= self.top_records.count:
+            return self.top_records.records[:k]
+
+        # Only k records are kept while all of them are read
+        return nlargest(k, self.iter_records(), key=attrgetter(by))
+
+    def close(self):
+        pass
+
+
+class CSVDB(DB):
+    def __init__(self, filepath: str) -> None:
+        super().__init__(filepath)
+
         if not os.path.exists(filepath):
             self.__create_csv_file()
 
+        self.load_top_records(lambda: read_csv_records(self.filepath))
+
     def __create_csv_file(self):
         with open(self.filepath, mode="w", newline="") as csv_file:
             writer = csv.DictWriter(csv_file, fieldnames=Record.HEADERS)
@@ -16,43 +106,69 @@ class DB:
             writer.writerows([])
 
     def add_record(self, record: Record):
+        self.add_records([record])
+
+    def add_records(self, records: list[Record]):
         with open(self.filepath, mode="a", newline="") as csv_file:
             writer = csv.DictWriter(csv_file, fieldnames=Record.HEADERS)
-            writer.writerow(
+            writer.writerows(
                 {
                     "date": record.date,
                     "score": record.score,
                     "kills": record.kills,
                     "coins": record.coins,
                 }
+                for record in records
             )
 
-    def is_there_any_higher_records(self, record: Record):
-        with open(self.filepath, mode="r", newline="") as csv_file:
-            reader = csv.DictReader(csv_file)
-
-            for row in reader:
-                if int(row["score"]) > record.score:
-                    return True
+        for record in records:
+            self.top_records.add(record)
 
-        return False
+        self.save_top_records()
 
     def clear_all_records(self):
         self.__create_csv_file()
 
-    def get_all_records(self):
-        records = []
-
-        with open(self.file_path, mode="r", newline="") as csv_file:
-            reader = csv.DictReader(csv_file)
-            for row in reader:
-                records.append(
-                    Record(
-                        coins=int(row["coins"]),
-                        date=row["date"],
-                        kills=int(row["kills"]),
-                        score=int(row["score"]),
-                    )
-                )
-
-        return records
+        self.top_records.clear()
+        self.save_top_records()
+
+    def iter_records(self, offset: int = 0, limit: int = None):
+        return islice(
+            read_csv_records(self.filepath),
+            offset,
+            None if limit is None else offset + limit,
+        )
+
+
+def read_csv_records(filepath: str):
+    with open(filepath, mode="r", newline="") as csv_file:
+        reader = csv.DictReader(csv_file)
+
+        for row in reader:
+            yield Record(
+                coins=int(row["coins"]),
+                date=row["date"],
+                kills=int(row["kills"]),
+                score=int(row["score"]),
+            )
+
+
+def open_db(backend: str = None) -> DB:
+    # Opens the records of the backend in the config, the records
+    # of the CSV file are moved to a new SQLite file or record log
+    backend = backend or conf.DB_BACKEND
+
+    if backend == "csv":
+        return CSVDB(conf.DB_FILEPATH)
+
+    if backend == "sqlite":
+        from .sqlite_db import SQLiteDB
+
+        return SQLiteDB(conf.SQLITE_DB_FILEPATH, csv_filepath=conf.DB_FILEPATH)
+
+    if backend == "log":
+        from .log_db import RecordLogDB
+
+        return RecordLogDB(conf.RECORD_LOG_FILEPATH, csv_filepath=conf.DB_FILEPATH)
+
+    raise ValueError(f"Unknown DB backend : {backend}")
@@ -0,0 +1,338 @@
+import argparse, mmap, os, struct, sys
+from config import conf
+from .db import DB, CSVDB, read_csv_records, check_record_order
+from .record import Record
+
+# NumPy is optional, the records are read
+# row by row if it is not installed
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Every log file starts with the magic bytes and all the rows after
+# it have the same size, so a row is found without reading the others
+MAGIC = b"SHRLOG01"
+# Seconds since the epoch, score, kills and coins
+ROW = struct.Struct("<qiii")
+# Seconds of the marker row that clears the records, the rows
+# before it are never read and are removed by the compaction
+CLEARED_SECONDS = -(2**63)
+
+if numpy is not None:
+    # The same row as an array item, so the mapped file is read as an array
+    ROW_DTYPE = numpy.dtype(
+        [("seconds", "<i8"), ("score", "<i4"), ("kills", "<i4"), ("coins", "<i4")]
+    )
+
+
+def pack_record(record: Record):
+    return ROW.pack(record.seconds, record.score, record.kills, record.coins)
+
+
+def unpack_record(values: tuple):
+    return Record.from_seconds(*values)
+
+
+def get_top_indices(values, k: int):
+    # Indices of the k biggest values, the equal values are
+    # in the order of their indices like the added records
+    if k <= 0:
+        return numpy.arange(0)
+
+    if k < len(values):
+        # Only the values that can be in the top k are sorted
+        kth_value = numpy.partition(values, len(values) - k)[len(values) - k]
+        indices = numpy.flatnonzero(values >= kth_value)
+    else:
+        indices = numpy.arange(len(values))
+
+    order = numpy.argsort(-values[indices].astype(numpy.int64), kind="stable")
+
+    return indices[order[:k]]
+
+
+class RecordLogDB(DB):
+    # The records are appended to a binary log as fixed size rows and
+    # read through a map of the file, the rows are never parsed as text
+    def __init__(self, filepath: str, csv_filepath: str = None) -> None:
+        super().__init__(filepath)
+
+        is_new = not os.path.exists(filepath)
+
+        self.__map: mmap.mmap = None
+        self.__rows = self.__open_log_file()
+        self.__first_row = self.__find_first_row()
+
+        if self.__is_compaction_needed():
+            self.compact()
+
+        self.load_top_records(self.__read_top_records)
+
+        # The CSV records are moved only once,
+        # when the log file is created
+        if is_new and csv_filepath and os.path.exists(csv_filepath):
+            self.import_csv(csv_filepath)
+
+    @property
+    def record_count(self):
+        return self.__rows - self.__first_row
+
+    @property
+    def cleared_rows(self):
+        # The rows that are removed by the next compaction
+        return self.__first_row
+
+    def __open_log_file(self):
+        # Creates the log file or checks the old one, a half written
+        # row at the end of it is removed. Returns the count of the rows
+        if not os.path.exists(self.filepath):
+            with open(self.filepath, mode="wb") as log_file:
+                log_file.write(MAGIC)
+
+            return 0
+
+        with open(self.filepath, mode="r+b") as log_file:
+            if log_file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"Not a record log file : {self.filepath}")
+
+            size = os.fstat(log_file.fileno()).st_size
+            rows = (size - len(MAGIC)) // ROW.size
+
+            if len(MAGIC) + rows * ROW.size != size:
+                log_file.truncate(len(MAGIC) + rows * ROW.size)
+
+        return rows
+
+    def __get_map(self):
+        # The file is mapped again after the rows are added, the
+        # old map is closed when its last reader is gone
+        size = len(MAGIC) + self.__rows * ROW.size
+
+        if self.__map is None or len(self.__map) != size:
+            with open(self.filepath, mode="rb") as log_file:
+                self.__map = mmap.mmap(log_file.fileno(), size, access=mmap.ACCESS_READ)
+
+        return self.__map
+
+    def __unmap(self):
+        if self.__map is None:
+            return
+
+        # The map can't be closed while an array of it is used, the
+        # array keeps the old map open and it is closed with the array
+        try:
+            self.__map.close()
+        except BufferError:
+            pass
+
+        self.__map = None
+
+    def __get_offset(self, row: int):
+        return len(MAGIC) + row * ROW.size
+
+    def __find_first_row(self):
+        # The records are the rows after the last marker row
+        if numpy is not None:
+            seconds = numpy.frombuffer(
+                self.__get_map(), dtype=ROW_DTYPE, count=self.__rows, offset=len(MAGIC)
+            )["seconds"]
+            markers = numpy.flatnonzero(seconds == CLEARED_SECONDS)
+
+            return int(markers[-1]) + 1 if len(markers) else 0
+
+        log_map = self.__get_map()
+
+        for row in range(self.__rows - 1, -1, -1):
+            if ROW.unpack_from(log_map, self.__get_offset(row))[0] == CLEARED_SECONDS:
+                return row + 1
+
+        return 0
+
+    def __append(self, data: bytes, rows: int):
+        with open(self.filepath, mode="ab") as log_file:
+            log_file.write(data)
+
+        self.__rows += rows
+
+    def __is_compaction_needed(self):
+        # The log is compacted when it has enough cleared rows
+        # and at least half of its rows are cleared
+        return (
+            self.__first_row >= conf.RECORD_LOG_COMPACTION_ROWS
+            and self.__first_row * 2 >= self.__rows
+        )
+
+    def compact(self):
+        # The records are written to a new file which replaces the log,
+        # so the file is never cut under a map that is still read
+        temp_filepath = f"{self.filepath}.tmp"
+        log_map = self.__get_map()
+
+        with open(temp_filepath, mode="wb") as temp_file, memoryview(log_map) as view:
+            temp_file.write(MAGIC)
+            temp_file.write(view[self.__get_offset(self.__first_row) :])
+
+        self.__unmap()
+        os.replace(temp_filepath, self.filepath)
+
+        self.__rows -= self.__first_row
+        self.__first_row = 0
+
+    def __read_records(self, start: int, stop: int):
+        with memoryview(self.__get_map()) as view:
+            for values in ROW.iter_unpack(
+                view[self.__get_offset(start) : self.__get_offset(stop)]
+            ):
+                yield unpack_record(values)
+
+    def __read_top_records(self):
+        if numpy is None:
+            return self.iter_records()
+
+        return self.__get_top(self.top_records.count, "score")
+
+    def __get_top(self, k: int, by: str):
+        array = self.get_array()
+        log_map = self.__get_map()
+
+        return [
+            unpack_record(
+                ROW.unpack_from(log_map, self.__get_offset(self.__first_row + index))
+            )
+            for index in get_top_indices(array[by], k)
+        ]
+
+    def get_array(self):
+        # The records as a read only array on the mapped file, the values
+        # are not copied and the dates are in seconds since the epoch.
+        # The array is a snapshot of the records, it doesn't see the
+        # records that are added, cleared or compacted after it is made
+        # and it keeps its map of the old file, so it is made again
+        # after them instead of being kept
+        if numpy is None:
+            raise RuntimeError("The record arrays need NumPy")
+
+        return numpy.frombuffer(
+            self.__get_map(),
+            dtype=ROW_DTYPE,
+            count=self.record_count,
+            offset=self.__get_offset(self.__first_row),
+        )
+
+    def import_csv(self, csv_filepath: str):
+        # Returns the count of the imported records
+        records = list(read_csv_records(csv_filepath))
+        self.add_records(records)
+
+        return len(records)
+
+    def add_record(self, record: Record):
+        self.add_records([record])
+
+    def add_records(self, records: list[Record]):
+        self.__append(b"".join(map(pack_record, records)), len(records))
+
+        for record in records:
+            self.top_records.add(record)
+
+        self.save_top_records()
+
+    def clear_all_records(self):
+        # The records are cleared by a marker row, the file is
+        # only written again by the compaction
+        self.__append(ROW.pack(CLEARED_SECONDS, 0, 0, 0), 1)
+        self.__first_row = self.__rows
+
+        if self.__is_compaction_needed():
+            self.compact()
+
+        self.top_records.clear()
+        self.save_top_records()
+
+    def iter_records(self, offset: int = 0, limit: int = None):
+        # The rows of the page are found without reading the rows before it
+        start = min(self.__first_row + offset, self.__rows)
+        stop = self.__rows if limit is None else min(self.__rows, start + limit)
+
+        return self.__read_records(start, stop)
+
+    def top(self, k: int, by: str = "score"):
+        check_record_order(by)
+
+        # The best score records are already in memory
+        if by == "score" and k <= self.top_records.count:
+            return self.top_records.records[:k]
+
+        if numpy is None:
+            return super().top(k, by)
+
+        return self.__get_top(k, by)
+
+    def close(self):
+        self.__unmap()
+
+
+def convert_csv_to_log(csv_filepath: str, log_filepath: str):
+    # The records are added to the end of the log,
+    # returns the count of the converted records
+    log_db = RecordLogDB(log_filepath)
+
+    try:
+        return log_db.import_csv(csv_filepath)
+    finally:
+        log_db.close()
+
+
+def convert_log_to_csv(log_filepath: str, csv_filepath: str):
+    # The records are added to the end of the CSV file with
+    # ctime dates, returns the count of the converted records
+    log_db = RecordLogDB(log_filepath)
+
+    try:
+        records = log_db.get_all_records()
+    finally:
+        log_db.close()
+
+    CSVDB(csv_filepath).add_records(records)
+
+    return len(records)
+
+
+def main(args: list[str] = None):
+    parser = argparse.ArgumentParser(
+        prog="python -m db.log_db",
+        description="Convert the records between a CSV file and a record log",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    to_log = commands.add_parser("to-log", help="add the CSV records to a log")
+    to_log.add_argument("csv_filepath")
+    to_log.add_argument("log_filepath")
+
+    to_csv = commands.add_parser("to-csv", help="add the log records to a CSV file")
+    to_csv.add_argument("log_filepath")
+    to_csv.add_argument("csv_filepath")
+
+    compact = commands.add_parser("compact", help="remove the cleared rows of a log")
+    compact.add_argument("log_filepath")
+
+    args = parser.parse_args(args)
+
+    if args.command == "to-log":
+        count = convert_csv_to_log(args.csv_filepath, args.log_filepath)
+        print(f"{count} records are added to {args.log_filepath}")
+    elif args.command == "to-csv":
+        count = convert_log_to_csv(args.log_filepath, args.csv_filepath)
+        print(f"{count} records are added to {args.csv_filepath}")
+    else:
+        log_db = RecordLogDB(args.log_filepath)
+        rows = log_db.cleared_rows
+        log_db.compact()
+        log_db.save_top_records()
+        log_db.close()
+        print(f"{rows} cleared rows are removed from {args.log_filepath}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
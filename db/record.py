@@ -1,14 +1,45 @@
-from time import time, ctime
+from time import time, ctime, mktime, strptime, strftime
+
+
+def get_seconds(date: str):
+    # Seconds since the epoch of a ctime date, the
+    # dates that aren't made by ctime are the epoch
+    try:
+        return int(mktime(strptime(date)))
+    except (ValueError, OverflowError):
+        return 0
 
 
 class Record:
     HEADERS = ["date", "score", "kills", "coins"]
 
+    # Many records are loaded at once, so they
+    # are kept in slots instead of a dict
+    __slots__ = ("date", "score", "kills", "coins")
+
     def __init__(self, score: int, kills: int, coins: int, date: str = None) -> None:
         self.date = date if date else ctime(time())
         self.score = score
         self.kills = kills
         self.coins = coins
 
+    @classmethod
+    def from_seconds(cls, seconds: int, score: int, kills: int, coins: int):
+        # The binary backends keep the dates as seconds
+        return cls(score=score, kills=kills, coins=coins, date=ctime(seconds))
+
+    @property
+    def seconds(self):
+        return get_seconds(self.date)
+
+    @property
+    def short_date(self):
+        # The day of the record, the date is kept as
+        # it is if it isn't made by ctime
+        try:
+            return strftime("%b %d %Y", strptime(self.date))
+        except ValueError:
+            return self.date
+
     def __str__(self):
         return f"Date : {self.date}, Score : {self.score}, Kills : {self.kills}, Coins : {self.coins}"
@@ -0,0 +1,158 @@
+import os, sqlite3
+from .db import DB, read_csv_records, check_record_order
+from .record import Record, get_seconds
+
+# The version of the records table in the user version of the
+# file, the dates are kept as seconds since the epoch from the
+# version 1 so the date index is in the order of the dates
+SCHEMA_VERSION = 1
+
+# The connection prepares every statement once and
+# reuses it while the same SQL string is executed
+CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS records (
+    id INTEGER PRIMARY KEY,
+    date INTEGER NOT NULL,
+    score INTEGER NOT NULL,
+    kills INTEGER NOT NULL,
+    coins INTEGER NOT NULL
+)
+"""
+CREATE_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS records_score ON records (score)",
+    "CREATE INDEX IF NOT EXISTS records_date ON records (date)",
+    "CREATE INDEX IF NOT EXISTS records_kills ON records (kills)",
+    "CREATE INDEX IF NOT EXISTS records_coins ON records (coins)",
+)
+INSERT_RECORD = "INSERT INTO records (date, score, kills, coins) VALUES (?, ?, ?, ?)"
+# A negative limit means no limit
+SELECT_RECORDS = (
+    "SELECT date, score, kills, coins FROM records ORDER BY id LIMIT ? OFFSET ?"
+)
+# The order column is one of the record orders, every
+# one of them has its own statement and index
+SELECT_TOP_RECORDS = (
+    "SELECT date, score, kills, coins FROM records ORDER BY {by} DESC, id LIMIT ?"
+)
+DELETE_RECORDS = "DELETE FROM records"
+SELECT_TABLE = "SELECT name FROM sqlite_master WHERE type = 'table' AND name = ?"
+SELECT_OLD_RECORDS = "SELECT id, date, score, kills, coins FROM old_records"
+INSERT_RECORD_WITH_ID = (
+    "INSERT INTO records (id, date, score, kills, coins) VALUES (?, ?, ?, ?, ?)"
+)
+
+
+def get_record_values(record: Record):
+    return (record.seconds, record.score, record.kills, record.coins)
+
+
+class SQLiteDB(DB):
+    def __init__(self, filepath: str, csv_filepath: str = None) -> None:
+        super().__init__(filepath)
+
+        is_new = not os.path.exists(filepath)
+
+        # The records can be written by the record writer thread
+        self.connection = sqlite3.connect(filepath, check_same_thread=False)
+
+        # The records are written to the write ahead log, so a
+        # game over doesn't wait for the whole file to be synced
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+
+        if version < SCHEMA_VERSION and self.__has_table("records"):
+            self.__migrate_dates()
+
+        with self.connection:
+            self.connection.execute(CREATE_TABLE)
+
+            for create_index in CREATE_INDEXES:
+                self.connection.execute(create_index)
+
+            self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+        # The CSV records are moved only once,
+        # when the SQLite file is created
+        if is_new and csv_filepath and os.path.exists(csv_filepath):
+            self.import_csv(csv_filepath)
+
+        # The score index is the persisted index of the
+        # top records, so they are read from it once
+        self.top_records.set(self.__query_top(self.top_records.count, "score"))
+
+    def __has_table(self, name: str):
+        return self.connection.execute(SELECT_TABLE, (name,)).fetchone() is not None
+
+    def __migrate_dates(self):
+        # The old files keep the ctime dates as text, the table is made
+        # again with the dates as seconds, its indexes are dropped with
+        # the old table and they are made again after it
+        with self.connection:
+            self.connection.execute("BEGIN")
+            self.connection.execute("ALTER TABLE records RENAME TO old_records")
+            self.connection.execute(CREATE_TABLE)
+
+            rows = self.connection.execute(SELECT_OLD_RECORDS).fetchall()
+            self.connection.executemany(
+                INSERT_RECORD_WITH_ID,
+                (
+                    (record_id, get_seconds(date), score, kills, coins)
+                    for record_id, date, score, kills, coins in rows
+                ),
+            )
+            self.connection.execute("DROP TABLE old_records")
+
+    def __get_records(self, query: str, parameters: tuple = ()):
+        # The rows are read from the cursor one by one
+        for values in self.connection.execute(query, parameters):
+            yield Record.from_seconds(*values)
+
+    def __query_top(self, k: int, by: str):
+        return list(self.__get_records(SELECT_TOP_RECORDS.format(by=by), (k,)))
+
+    def import_csv(self, csv_filepath: str):
+        # Returns the count of the imported records
+        records = list(read_csv_records(csv_filepath))
+
+        with self.connection:
+            self.connection.executemany(INSERT_RECORD, map(get_record_values, records))
+
+        self.top_records.set(self.top_records.records + records)
+
+        return len(records)
+
+    def add_record(self, record: Record):
+        self.add_records([record])
+
+    def add_records(self, records: list[Record]):
+        # All the records are added in one transaction
+        with self.connection:
+            self.connection.executemany(INSERT_RECORD, map(get_record_values, records))
+
+        for record in records:
+            self.top_records.add(record)
+
+    def clear_all_records(self):
+        with self.connection:
+            self.connection.execute(DELETE_RECORDS)
+
+        self.top_records.clear()
+
+    def iter_records(self, offset: int = 0, limit: int = None):
+        return self.__get_records(
+            SELECT_RECORDS, (-1 if limit is None else limit, offset)
+        )
+
+    def top(self, k: int, by: str = "score"):
+        check_record_order(by)
+
+        # The best score records are already in memory
+        if by == "score" and k <= self.top_records.count:
+            return self.top_records.records[:k]
+
+        return self.__query_top(k, by)
+
+    def close(self):
+        self.connection.close()
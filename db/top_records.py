@@ -0,0 +1,74 @@
+import json, os
+from bisect import insort
+from heapq import nsmallest
+from .record import Record
+
+
+def get_negative_score(record: Record):
+    return -record.score
+
+
+class TopRecords:
+    # The records with the best scores, the first one is the
+    # best record and the records with equal scores are kept
+    # in the order that they are added
+    def __init__(self, count: int) -> None:
+        self.count = count
+        self.records: list[Record] = []
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def best_score(self):
+        return self.records[0].score if self.records else None
+
+    def set(self, records):
+        # Only the top records of the given records are kept
+        self.records = nsmallest(self.count, records, key=get_negative_score)
+
+    def add(self, record: Record):
+        insort(self.records, record, key=get_negative_score)
+        del self.records[self.count :]
+
+    def clear(self):
+        self.records = []
+
+    def save(self, filepath: str, signature: list):
+        # The signature shows the state of the records file
+        # that these records are the top records of it
+        data = {
+            "signature": signature,
+            "records": [
+                [record.date, record.score, record.kills, record.coins]
+                for record in self.records
+            ],
+        }
+
+        # Write a new file and replace the old one, so a
+        # half written file is never read
+        temp_filepath = f"{filepath}.tmp"
+
+        with open(temp_filepath, mode="w") as temp_file:
+            json.dump(data, temp_file)
+
+        os.replace(temp_filepath, filepath)
+
+    def load(self, filepath: str, signature: list):
+        # Returns false if the file is missing, broken or
+        # it is saved for another state of the records file
+        try:
+            with open(filepath, mode="r") as top_records_file:
+                data = json.load(top_records_file)
+
+            if data["signature"] != signature:
+                return False
+
+            self.set(
+                Record(score=score, kills=kills, coins=coins, date=date)
+                for date, score, kills, coins in data["records"]
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+
+        return True
@@ -0,0 +1,149 @@
+import atexit, queue, threading
+from concurrent.futures import Future
+from config import conf
+from .db import DB
+from .record import Record
+
+
+class RecordWriter:
+    # Adds the records to the DB in its own thread, so the game never
+    # waits for the disk. The records are written in batches when the
+    # batch is full, when no record is added in the flush interval and
+    # before any other task of the DB is run
+    def __init__(
+        self,
+        db: DB,
+        queue_size: int = conf.RECORD_WRITER_QUEUE_SIZE,
+        batch_size: int = conf.RECORD_WRITER_BATCH_SIZE,
+        flush_interval: float = conf.RECORD_WRITER_FLUSH_INTERVAL,
+    ) -> None:
+        self.db = db
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.is_closed = False
+        # The last error of writing a batch, the batch is
+        # kept and written again with the next batch
+        self.error: Exception = None
+
+        # Nothing is queued after the writer is closed, so
+        # every queued item is taken by the thread
+        self.__lock = threading.Lock()
+        self.__queue = queue.Queue(maxsize=queue_size)
+        self.__batch: list[Record] = []
+        self.__thread = threading.Thread(
+            target=self.__run, name="RecordWriter", daemon=True
+        )
+        self.__thread.start()
+
+        # The queued records are written even if the
+        # game exits without closing the writer
+        atexit.register(self.close)
+
+    @property
+    def is_running(self):
+        return not self.is_closed and self.__thread.is_alive()
+
+    def __put(self, task) -> Future:
+        # The future fails at once if the thread can't take the task
+        # or the queue is full, so the game never waits for the lock
+        future = Future()
+
+        with self.__lock:
+            if not self.is_running:
+                future.set_exception(RuntimeError("The record writer is closed"))
+                return future
+
+            try:
+                self.__queue.put_nowait((task, future))
+            except queue.Full:
+                future.set_exception(RuntimeError("The record writer queue is full"))
+
+        return future
+
+    def add_record(self, record: Record) -> Future:
+        # The future is set to true if the record is a high score
+        # as soon as the writer takes it, before it is written
+        return self.__put(record)
+
+    def submit(self, task, *args) -> Future:
+        # The task is called with the DB and the args after the
+        # queued records are written, the future is set to its result
+        return self.__put(lambda: task(self.db, *args))
+
+    def flush(self):
+        # Wait until the queued records are written, it raises
+        # the RuntimeError of a closed writer or a full queue
+        self.submit(lambda db: None).result()
+
+    def close(self):
+        with self.__lock:
+            if self.is_closed:
+                return
+
+            self.is_closed = True
+            atexit.unregister(self.close)
+
+            # The thread writes the rest of the records and closes the DB
+            if self.__thread.is_alive():
+                self.__queue.put(None)
+
+        self.__thread.join()
+
+    def __is_high_score(self, record: Record):
+        # The records of the batch are not in the DB yet
+        scores = [batch_record.score for batch_record in self.__batch]
+
+        if self.db.best_score is not None:
+            scores.append(self.db.best_score)
+
+        return record.score >= max(scores, default=record.score)
+
+    def __write_batch(self):
+        if not self.__batch:
+            return
+
+        try:
+            self.db.add_records(self.__batch)
+        except Exception as error:
+            self.error = error
+        else:
+            self.__batch = []
+            self.error = None
+
+    def __run(self):
+        while True:
+            # Wait for the flush interval only if there is a batch
+            try:
+                item = self.__queue.get(
+                    timeout=self.flush_interval if self.__batch else None
+                )
+            except queue.Empty:
+                self.__write_batch()
+                continue
+
+            if item is None:
+                self.__write_batch()
+                self.db.close()
+                return
+
+            task, future = item
+
+            if isinstance(task, Record):
+                future.set_result(self.__is_high_score(task))
+                self.__batch.append(task)
+
+                if len(self.__batch) >= self.batch_size:
+                    self.__write_batch()
+
+                continue
+
+            self.__write_batch()
+
+            if self.error is not None:
+                future.set_exception(self.error)
+                continue
+
+            try:
+                future.set_result(task())
+            except Exception as error:
+                future.set_exception(error)
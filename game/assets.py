@@ -1,364 +1,596 @@
-import sys
+import sys, math
 
-from pygame import image, transform, Surface
+from pygame import image, transform, mask, Surface, Rect, SRCALPHA, RLEACCEL
 from config import conf
+from .atlas import MANIFEST, load_frames, pack_frames, get_frame_sources, copy_frame
+from .bake_cache import BakeCache, make_key
 
 # Append root path to file
 sys.path.append("../")
 
-# Backgrounds
-GAME_BG = transform.scale(
-    image.load("assets/ui/game_bg.png"), (conf.SCREEN_WIDTH, conf.SCREEN_HEIGHT)
-)
-MENU_BG = transform.scale(
-    image.load("assets/ui/menu_bg.png"), (conf.SCREEN_WIDTH, conf.SCREEN_HEIGHT)
-)
+# Bake cache
+# The processed (scaled and rotated) models are saved in
+# the bake cache file, so the next launches can make them
+# from the raw pixels without decoding and transforming
+BAKE_CACHE = BakeCache(conf.BAKE_CACHE_PATH)
 
-# Logo
-LOGO = transform.scale(
-    image.load("assets/ui/logo.png"), (conf.LOGO_WIDTH, conf.LOGO_HEIGHT)
-)
 
-# Game stats UI
-SCORE_STATS_ICON = transform.scale(
-    image.load("assets/ui/stats/score.png"),
-    (conf.GAME_STATS_ICON_SIZE, conf.GAME_STATS_ICON_SIZE),
-)
+def _process_model(
+    model: Surface, size: tuple[float] = None, angle=0, rotate_first=False
+):
+    if angle and rotate_first:
+        model = transform.rotate(model, angle)
 
-COINS_STATS_ICON = transform.scale(
-    image.load("assets/ui/stats/coins.png"),
-    (conf.GAME_STATS_ICON_SIZE, conf.GAME_STATS_ICON_SIZE),
-)
+    if size:
+        model = transform.scale(model, size)
 
-KILLS_STATS_ICON = transform.scale(
-    image.load("assets/ui/stats/kills.png"),
-    (conf.GAME_STATS_ICON_SIZE, conf.GAME_STATS_ICON_SIZE),
-)
+    if angle and not rotate_first:
+        model = transform.rotate(model, angle)
 
-LIVES_STATS_ICON = transform.scale(
-    image.load("assets/ui/stats/lives.png"),
-    (conf.GAME_STATS_ICON_SIZE, conf.GAME_STATS_ICON_SIZE),
-)
+    return model
+
+
+def _load_baked(sources: list[str], params: tuple, build) -> list[Surface]:
+    key = make_key(sources, params)
+    models = BAKE_CACHE.get(key)
+
+    # Build the models and put them in the cache if they were not there
+    if models is None:
+        models = build()
+        BAKE_CACHE.put(key, models)
+
+    return models
+
+
+def load_model(
+    path: str, size: tuple[float] = None, angle=0, rotate_first=False
+) -> Surface:
+    return _load_baked(
+        [path],
+        (path, size, angle, rotate_first),
+        lambda: [_process_model(image.load(path), size, angle, rotate_first)],
+    )[0]
+
+
+def load_models(
+    directory: str, count: int, size: tuple[float] = None, angle=0, rotate_first=False
+) -> list[Surface]:
+    return _load_baked(
+        get_frame_sources(directory, count),
+        (directory, count, size, angle, rotate_first, MANIFEST.get(directory)),
+        lambda: [
+            _process_model(frame, size, angle, rotate_first)
+            for frame in load_frames(directory, count)
+        ],
+    )
+
+
+SCREEN_SIZE = (conf.SCREEN_WIDTH, conf.SCREEN_HEIGHT)
+STATS_ICON_SIZE = (conf.GAME_STATS_ICON_SIZE, conf.GAME_STATS_ICON_SIZE)
+PROMPT_TITLE_SIZE = (conf.PROMPT_TITLE_WIDTH, conf.PROMPT_TITLE_HEIGHT)
+PLAYER_SIZE = (conf.PLAYER_WIDTH, conf.PLAYER_HEIGHT)
+ITEM_SIZE = (conf.ITEM_WIDTH, conf.ITEM_HEIGHT)
+ENEMY_SIZE = (conf.ENEMY_WIDTH, conf.ENEMY_HEIGHT)
+
+# Backgrounds
+GAME_BG = load_model("assets/ui/game_bg.png", SCREEN_SIZE)
+MENU_BG = load_model("assets/ui/menu_bg.png", SCREEN_SIZE)
+
+# Logo
+LOGO = load_model("assets/ui/logo.png", (conf.LOGO_WIDTH, conf.LOGO_HEIGHT))
+
+# Game stats UI
+SCORE_STATS_ICON = load_model("assets/ui/stats/score.png", STATS_ICON_SIZE)
+COINS_STATS_ICON = load_model("assets/ui/stats/coins.png", STATS_ICON_SIZE)
+KILLS_STATS_ICON = load_model("assets/ui/stats/kills.png", STATS_ICON_SIZE)
+LIVES_STATS_ICON = load_model("assets/ui/stats/lives.png", STATS_ICON_SIZE)
 
 # Buttons
-HOME_BUTTON = image.load("assets/ui/buttons/home.png")
-PAUSE_BUTTON = image.load("assets/ui/buttons/pause.png")
-PLAY_BUTTON = image.load("assets/ui/buttons/play.png")
-RETRY_BUTTON = image.load("assets/ui/buttons/retry.png")
-ACTIVE_SOUND_BUTTON = image.load("assets/ui/buttons/active_sound.png")
-DEACTIVE_SOUND_BUTTON = image.load("assets/ui/buttons/deactive_sound.png")
+HOME_BUTTON = load_model("assets/ui/buttons/home.png")
+PAUSE_BUTTON = load_model("assets/ui/buttons/pause.png")
+PLAY_BUTTON = load_model("assets/ui/buttons/play.png")
+RETRY_BUTTON = load_model("assets/ui/buttons/retry.png")
+ACTIVE_SOUND_BUTTON = load_model("assets/ui/buttons/active_sound.png")
+DEACTIVE_SOUND_BUTTON = load_model("assets/ui/buttons/deactive_sound.png")
 
 # Prompt UI
-PROMPT_BOARD = image.load("assets/ui/prompt/board.png")
+PROMPT_BOARD = load_model("assets/ui/prompt/board.png")
 
-PROMPT_NEW_HIGH_SCORE_TITLE = transform.scale(
-    image.load("assets/ui/prompt/new_high_score_title.png"),
-    (conf.PROMPT_TITLE_WIDTH, conf.PROMPT_TITLE_HEIGHT),
+PROMPT_NEW_HIGH_SCORE_TITLE = load_model(
+    "assets/ui/prompt/new_high_score_title.png", PROMPT_TITLE_SIZE
 )
-
-PROMPT_PAUSE_TITLE = transform.scale(
-    image.load("assets/ui/prompt/pause_title.png"),
-    (conf.PROMPT_TITLE_WIDTH, conf.PROMPT_TITLE_HEIGHT),
-)
-
-PROMPT_YOU_LOST_TITLE = transform.scale(
-    image.load("assets/ui/prompt/you_lost_title.png"),
-    (conf.PROMPT_TITLE_WIDTH, conf.PROMPT_TITLE_HEIGHT),
+PROMPT_PAUSE_TITLE = load_model("assets/ui/prompt/pause_title.png", PROMPT_TITLE_SIZE)
+PROMPT_YOU_LOST_TITLE = load_model(
+    "assets/ui/prompt/you_lost_title.png", PROMPT_TITLE_SIZE
 )
 
 # Game objects
-PLATFORM = transform.scale(
-    transform.rotate(image.load("assets/environment/ground/1.png"), -90),
+PLATFORM = load_model(
+    "assets/environment/ground/1.png",
     (conf.PLATFORM_WIDTH, conf.PLATFORM_HEIGHT),
+    angle=-90,
+    rotate_first=True,
 )
 
-# Explosion
-EXPLOSION_MODELS: list[Surface] = []
 
-for i in range(1, 8):
-    EXPLOSION_MODELS.append(
-        transform.scale(
-            image.load(f"assets/environment/explosion/{i}.png"),
-            (conf.ENEMY_WIDTH, conf.ENEMY_HEIGHT),
-        )
-    )
+def build_platform_strip(platform: Surface):
+    # The background is a still image, so only the platform
+    # columns are drawn over it. Every column is one platform
+    # taller than the screen, so it is scrolled with one blit,
+    # and it has the format of the platform, so the opaque
+    # platform is copied without blending
+    tiles_count = math.ceil(conf.SCREEN_HEIGHT / conf.PLATFORM_HEIGHT) + 1
 
-# Player models
-PLAYER_RUN_MODELS: list[Surface] = []
-PLAYER_ATTACK_MODELS: list[Surface] = []
-PLAYER_JUMP_MODELS = [
-    transform.scale(
-        image.load(f"assets/sprites/player/jump/1.png"),
-        (conf.PLAYER_WIDTH, conf.PLAYER_HEIGHT),
+    strip = Surface(
+        (platform.get_width(), tiles_count * conf.PLATFORM_HEIGHT),
+        platform.get_flags() & SRCALPHA,
     )
-]
 
-for i in range(1, 7):
-    PLAYER_RUN_MODELS.append(
-        transform.scale(
-            image.load(f"assets/sprites/player/run/{i}.png"),
-            (conf.PLAYER_WIDTH, conf.PLAYER_HEIGHT),
-        )
-    )
+    for i in range(tiles_count):
+        copy_frame(strip, platform, (0, i * conf.PLATFORM_HEIGHT))
 
-for i in range(1, 14):
-    PLAYER_ATTACK_MODELS.append(
-        transform.scale(
-            image.load(f"assets/sprites/player/attack/{i}.png"),
-            (conf.PLAYER_WIDTH, conf.PLAYER_HEIGHT),
-        )
-    )
+    return strip
+
+
+# Platform strips of the left and the right (flipped) columns
+LEFT_PLATFORM_STRIP = build_platform_strip(PLATFORM)
+RIGHT_PLATFORM_STRIP = build_platform_strip(
+    transform.flip(PLATFORM, flip_x=True, flip_y=False)
+)
+
+# Explosion
+EXPLOSION_MODELS = load_models("assets/environment/explosion", 7, ENEMY_SIZE)
+
+# Player models
+PLAYER_RUN_MODELS = load_models("assets/sprites/player/run", 6, PLAYER_SIZE)
+PLAYER_ATTACK_MODELS = load_models("assets/sprites/player/attack", 13, PLAYER_SIZE)
+PLAYER_JUMP_MODELS = load_models("assets/sprites/player/jump", 1, PLAYER_SIZE)
 
 # Player effects
-PLAYER_HIT_EFFECTS: list[Surface] = []
-PLAYER_SHIELD_EFFECTS: list[Surface] = [
-    transform.scale(
-        image.load(f"assets/sprites/player/shield/1.png"),
-        (conf.PLAYER_WIDTH, conf.PLAYER_HEIGHT),
-    )
-]
+PLAYER_HIT_EFFECTS = load_models("assets/sprites/player/hit", 5, PLAYER_SIZE)
+PLAYER_SHIELD_EFFECTS = load_models("assets/sprites/player/shield", 1, PLAYER_SIZE)
+
+# Player pose table
+# The player is only drawn with an angle of 0 or 90
+# and facing left or right, so every rotated and flipped
+# frame is made once here instead of on every draw
+PLAYER_ANIMATIONS: dict[str, list[Surface]] = {
+    "run": PLAYER_RUN_MODELS,
+    "attack": PLAYER_ATTACK_MODELS,
+    "jump": PLAYER_JUMP_MODELS,
+    "shield": PLAYER_SHIELD_EFFECTS,
+    "hit": PLAYER_HIT_EFFECTS,
+}
+PLAYER_ANGLES = (0, 90)
+
+# Maps (animation, frame, angle, is facing left) to the pose
+# and to the collision mask of the pose
+PLAYER_POSES: dict[tuple[str, int, int, bool], Surface] = {}
+PLAYER_POSE_MASKS: dict[tuple[str, int, int, bool], mask.Mask] = {}
+
+# Shield effect blit offsets from the player position by the player side
+PLAYER_SHIELD_OFFSETS: dict[str, tuple[float, float]] = {
+    "left": (-conf.PLAYER_FOOT_MARGIN, conf.PLAYER_FOOT_MARGIN),
+    "right": (conf.PLAYER_FOOT_MARGIN, conf.PLAYER_FOOT_MARGIN),
+    "center": (conf.PLAYER_FOOT_MARGIN, conf.PLAYER_FOOT_MARGIN),
+}
+
+
+def build_player_pose_table():
+    PLAYER_POSES.clear()
+    PLAYER_POSE_MASKS.clear()
+
+    for animation, models in PLAYER_ANIMATIONS.items():
+        for frame, model in enumerate(models):
+            for angle in PLAYER_ANGLES:
+                rotated_model = transform.rotate(model, angle)
+
+                PLAYER_POSES[(animation, frame, angle, False)] = rotated_model
+                PLAYER_POSES[(animation, frame, angle, True)] = transform.flip(
+                    rotated_model, flip_x=True, flip_y=False
+                )
+
+    for pose_key, pose in PLAYER_POSES.items():
+        PLAYER_POSE_MASKS[pose_key] = mask.from_surface(pose)
 
-for i in range(1, 6):
-    PLAYER_HIT_EFFECTS.append(
-        transform.scale(
-            image.load(f"assets/sprites/player/hit/{i}.png"),
-            (conf.PLAYER_WIDTH, conf.PLAYER_HEIGHT),
-        )
-    )
 
 # Block models
-SINGLE_BLOCK_MODEL = transform.scale(
-    transform.rotate(image.load("assets/environment/block/single.png"), -90),
+SINGLE_BLOCK_MODEL = load_model(
+    "assets/environment/block/single.png",
     (conf.BLOCK_WIDTH, conf.BLOCK_HEIGHT),
+    angle=-90,
+    rotate_first=True,
 )
-DOUBLE_BLOCK_MODEL = transform.scale(
-    image.load("assets/environment/block/double.png"),
+DOUBLE_BLOCK_MODEL = load_model(
+    "assets/environment/block/double.png",
     (conf.BLOCK_WIDTH * 2, conf.BLOCK_HEIGHT),
 )
 
 # Spike models
-SPIKE_MODELS: list[Surface] = []
-
-for i in range(1, 13):
-    SPIKE_MODELS.append(
-        transform.rotate(
-            transform.scale(
-                image.load(f"assets/environment/spikes/{i}.png"),
-                (conf.SPIKE_WIDTH, conf.SPIKE_HEIGHT),
-            ),
-            -90,
-        )
-    )
+SPIKE_MODELS = load_models(
+    "assets/environment/spikes",
+    12,
+    (conf.SPIKE_WIDTH, conf.SPIKE_HEIGHT),
+    angle=-90,
+)
 
 # Dead bush
-DEAD_BUSH_MODEL = transform.rotate(
-    transform.scale(
-        image.load("assets/environment/dead_bush/1.png"),
-        (conf.DEAD_BUSH_WIDTH, conf.DEAD_BUSH_HEIGHT),
-    ),
-    -90,
+DEAD_BUSH_MODEL = load_model(
+    "assets/environment/dead_bush/1.png",
+    (conf.DEAD_BUSH_WIDTH, conf.DEAD_BUSH_HEIGHT),
+    angle=-90,
 )
 
 # Coin
-COIN_MODELS: list[Surface] = []
-
-for i in range(1, 9):
-    COIN_MODELS.append(
-        transform.scale(
-            image.load(f"assets/items/coin/{i}.png"),
-            (conf.ITEM_WIDTH, conf.ITEM_HEIGHT),
-        )
-    )
+COIN_MODELS = load_models("assets/items/coin", 8, ITEM_SIZE)
 
 # Coin bag
-COIN_BAG_MODEL = transform.scale(
-    image.load(f"assets/items/coin_bag/1.png"),
-    (conf.ITEM_WIDTH, conf.ITEM_HEIGHT),
-)
+COIN_BAG_MODEL = load_model("assets/items/coin_bag/1.png", ITEM_SIZE)
 
 # Emerald
-EMERALD_MODEL = transform.scale(
-    image.load(f"assets/items/emerald/1.png"),
-    (conf.ITEM_WIDTH, conf.ITEM_HEIGHT),
-)
+EMERALD_MODEL = load_model("assets/items/emerald/1.png", ITEM_SIZE)
 
 # Ruby
-RUBY_MODEL = transform.scale(
-    image.load(f"assets/items/ruby/1.png"),
-    (conf.ITEM_WIDTH, conf.ITEM_HEIGHT),
-)
+RUBY_MODEL = load_model("assets/items/ruby/1.png", ITEM_SIZE)
 
 # Sapphire
-SAPPHIRE_MODEL = transform.scale(
-    image.load(f"assets/items/sapphire/1.png"),
-    (conf.ITEM_WIDTH, conf.ITEM_HEIGHT),
-)
+SAPPHIRE_MODEL = load_model("assets/items/sapphire/1.png", ITEM_SIZE)
 
 # Sprint item
-SPRINT_ITEM_MODEL = transform.scale(
-    image.load(f"assets/items/sprint/1.png"),
-    (conf.ITEM_WIDTH, conf.ITEM_HEIGHT),
-)
+SPRINT_ITEM_MODEL = load_model("assets/items/sprint/1.png", ITEM_SIZE)
 
 # Score boost item
-SCORE_BOOST_ITEM_MODEL = transform.scale(
-    image.load(f"assets/items/score_boost/1.png"),
-    (conf.ITEM_WIDTH, conf.ITEM_HEIGHT),
-)
+SCORE_BOOST_ITEM_MODEL = load_model("assets/items/score_boost/1.png", ITEM_SIZE)
 
 # Shield item
-SHIELD_ITEM_MODEL = transform.scale(
-    image.load(f"assets/items/shield/1.png"),
-    (conf.ITEM_WIDTH, conf.ITEM_HEIGHT),
-)
+SHIELD_ITEM_MODEL = load_model("assets/items/shield/1.png", ITEM_SIZE)
 
 # Heart
-FULL_HEART_MODEL = transform.scale(
-    image.load(f"assets/items/heart/full.png"),
-    (conf.ITEM_WIDTH, conf.ITEM_HEIGHT),
-)
+FULL_HEART_MODEL = load_model("assets/items/heart/full.png", ITEM_SIZE)
 
 # Bringer of Death
-BRINGER_OF_DEATH_MAIN_MODELS: list[Surface] = []
-BRINGER_OF_DEATH_DEATH_MODELS: list[Surface] = []
-
-
-for i in range(1, 9):
-    BRINGER_OF_DEATH_MAIN_MODELS.append(
-        transform.rotate(
-            transform.scale(
-                image.load(f"assets/sprites/bringer_of_death/{i}.png"),
-                (conf.ENEMY_WIDTH, conf.ENEMY_HEIGHT),
-            ),
-            -90,
-        )
-    )
-
-
-for i in range(1, 12):
-    BRINGER_OF_DEATH_DEATH_MODELS.append(
-        transform.rotate(
-            transform.scale(
-                image.load(f"assets/sprites/bringer_of_death/death/{i}.png"),
-                (conf.ENEMY_WIDTH, conf.ENEMY_HEIGHT),
-            ),
-            -90,
-        )
-    )
+BRINGER_OF_DEATH_MAIN_MODELS = load_models(
+    "assets/sprites/bringer_of_death", 8, ENEMY_SIZE, angle=-90
+)
+BRINGER_OF_DEATH_DEATH_MODELS = load_models(
+    "assets/sprites/bringer_of_death/death", 11, ENEMY_SIZE, angle=-90
+)
 
 # Hellhound
-HELLHOUND_MAIN_MODELS: list[Surface] = []
-
-for i in range(1, 12):
-    HELLHOUND_MAIN_MODELS.append(
-        transform.rotate(
-            transform.scale(
-                image.load(f"assets/sprites/hellhound/{i}.png"),
-                (conf.ENEMY_WIDTH, conf.ENEMY_HEIGHT),
-            ),
-            -90,
-        )
-    )
+HELLHOUND_MAIN_MODELS = load_models(
+    "assets/sprites/hellhound", 11, ENEMY_SIZE, angle=-90
+)
 
 # Ooze
-OOZE_MAIN_MODELS = [
-    transform.rotate(
-        transform.scale(
-            image.load(f"assets/sprites/ooze/1.png"),
-            (conf.ENEMY_WIDTH, conf.ENEMY_HEIGHT),
-        ),
-        -90,
-    )
-]
+OOZE_MAIN_MODELS = load_models("assets/sprites/ooze", 1, ENEMY_SIZE, angle=-90)
 
 # Worm
-WORM_MAIN_MODELS = [
-    transform.rotate(
-        transform.scale(
-            image.load(f"assets/sprites/worm/1.png"),
-            (conf.ENEMY_WIDTH, conf.ENEMY_HEIGHT),
-        ),
-        -90,
-    )
-]
+WORM_MAIN_MODELS = load_models("assets/sprites/worm", 1, ENEMY_SIZE, angle=-90)
 
 # Ghost
-GHOST_MAIN_MODELS = [
-    transform.rotate(
-        transform.scale(
-            image.load(f"assets/sprites/ghost/1.png"),
-            (conf.ENEMY_WIDTH, conf.ENEMY_HEIGHT),
-        ),
-        -90,
-    )
-]
+GHOST_MAIN_MODELS = load_models("assets/sprites/ghost", 1, ENEMY_SIZE, angle=-90)
 
 # Golem
-GOLEM_MAIN_MODELS: list[Surface] = []
-
-for i in range(1, 5):
-    GOLEM_MAIN_MODELS.append(
-        transform.rotate(
-            transform.scale(
-                image.load(f"assets/sprites/golem/{i}.png"),
-                (conf.ENEMY_WIDTH, conf.ENEMY_HEIGHT),
-            ),
-            -90,
-        )
-    )
+GOLEM_MAIN_MODELS = load_models("assets/sprites/golem", 4, ENEMY_SIZE, angle=-90)
 
 # Bat
-BAT_MAIN_MODELS: list[Surface] = []
-
-for i in range(1, 5):
-    BAT_MAIN_MODELS.append(
-        transform.rotate(
-            transform.scale(
-                image.load(f"assets/sprites/bat/{i}.png"),
-                (conf.ENEMY_WIDTH, conf.ENEMY_HEIGHT),
-            ),
-            -90,
-        )
-    )
+BAT_MAIN_MODELS = load_models("assets/sprites/bat", 4, ENEMY_SIZE, angle=-90)
 
 # Cacodemon
-CACODEMON_MAIN_MODELS: list[Surface] = []
-CACODEMON_DEATH_MODELS: list[Surface] = []
-
-
-for i in range(1, 14):
-    CACODEMON_MAIN_MODELS.append(
-        transform.rotate(
-            transform.scale(
-                image.load(f"assets/sprites/cacodemon/{i}.png"),
-                (conf.ENEMY_WIDTH, conf.ENEMY_HEIGHT),
-            ),
-            -90,
-        )
+CACODEMON_MAIN_MODELS = load_models(
+    "assets/sprites/cacodemon", 13, ENEMY_SIZE, angle=-90
+)
+CACODEMON_DEATH_MODELS = load_models(
+    "assets/sprites/cacodemon/death", 8, ENEMY_SIZE, angle=-90
+)
+
+# Sorcerer
+SORCERER_MAIN_MODELS = load_models("assets/sprites/sorcerer", 8, ENEMY_SIZE, angle=-90)
+
+# Model atlases
+# The frames of each animation are packed in one surface
+# and the models become subsurfaces of it, so the frames
+# of an animation are kept together in memory
+MODEL_ATLASES: dict[str, tuple[Surface, list[Rect]]] = {}
+
+
+def _is_model_list(value):
+    return (
+        isinstance(value, list)
+        and bool(value)
+        and all(isinstance(model, Surface) for model in value)
     )
 
 
-for i in range(1, 9):
-    CACODEMON_DEATH_MODELS.append(
-        transform.rotate(
-            transform.scale(
-                image.load(f"assets/sprites/cacodemon/death/{i}.png"),
-                (conf.ENEMY_WIDTH, conf.ENEMY_HEIGHT),
-            ),
-            -90,
+def _cut_models(atlas: Surface, rects: list[Rect]):
+    models = [atlas.subsurface(rect) for rect in rects]
+
+    # Subsurfaces get the atlas colorkey but not its RLE acceleration
+    if atlas.get_colorkey() is not None:
+        for model in models:
+            model.set_colorkey(atlas.get_colorkey(), RLEACCEL)
+
+    return models
+
+
+def pack_model_lists():
+    for name, value in list(globals().items()):
+        if name.isupper() and _is_model_list(value) and len(value) > 1:
+            atlas, rects = pack_frames(value)
+            MODEL_ATLASES[name] = (atlas, rects)
+
+            # Model lists are changed in place because
+            # the sprite modules hold references to them
+            value[:] = _cut_models(atlas, rects)
+
+
+pack_model_lists()
+
+# Orientation cache
+# Every sprite model is stored with its x flipped variant,
+# so drawing a sprite that faces the other side is just a
+# lookup instead of a transform.flip call on every frame
+SPRITE_MODEL_NAMES: list[str] = [
+    "EXPLOSION_MODELS",
+    "SINGLE_BLOCK_MODEL",
+    "DOUBLE_BLOCK_MODEL",
+    "SPIKE_MODELS",
+    "DEAD_BUSH_MODEL",
+    "COIN_MODELS",
+    "COIN_BAG_MODEL",
+    "EMERALD_MODEL",
+    "RUBY_MODEL",
+    "SAPPHIRE_MODEL",
+    "SPRINT_ITEM_MODEL",
+    "SCORE_BOOST_ITEM_MODEL",
+    "SHIELD_ITEM_MODEL",
+    "FULL_HEART_MODEL",
+    "BRINGER_OF_DEATH_MAIN_MODELS",
+    "BRINGER_OF_DEATH_DEATH_MODELS",
+    "HELLHOUND_MAIN_MODELS",
+    "OOZE_MAIN_MODELS",
+    "WORM_MAIN_MODELS",
+    "GHOST_MAIN_MODELS",
+    "GOLEM_MAIN_MODELS",
+    "BAT_MAIN_MODELS",
+    "CACODEMON_MAIN_MODELS",
+    "CACODEMON_DEATH_MODELS",
+    "SORCERER_MAIN_MODELS",
+]
+
+# Maps each model to a (not flipped, flipped) pair
+# of the models and of their collision masks
+ORIENTED_MODELS: dict[Surface, tuple[Surface, Surface]] = {}
+MODEL_MASKS: dict[Surface, tuple[mask.Mask, mask.Mask]] = {}
+# Masks of the models that are drawn over each other,
+# they are made when they are used for the first time
+LAYERED_MODEL_MASKS: dict[tuple[Surface, Surface, bool], mask.Mask] = {}
+
+# Counts the flip allocations that have been replaced
+# by a cache lookup, "frame" is reset on every frame
+FLIP_STATS = {"frame": 0, "total": 0}
+
+
+def get_models(name: str) -> list[Surface]:
+    # Single model assets are returned as a list too
+    models = globals()[name]
+
+    return models if isinstance(models, list) else [models]
+
+
+def _mirror_rect(rect: Rect, atlas_width: int):
+    return Rect(atlas_width - rect.right, rect.y, rect.width, rect.height)
+
+
+def build_orientation_cache():
+    ORIENTED_MODELS.clear()
+    MODEL_MASKS.clear()
+    LAYERED_MODEL_MASKS.clear()
+
+    for name in SPRITE_MODEL_NAMES:
+        # Flip the whole atlas once and cut the flipped
+        # models from the mirrored frame rects
+        if name in MODEL_ATLASES:
+            atlas, rects = MODEL_ATLASES[name]
+            flipped_models = _cut_models(
+                transform.flip(atlas, flip_x=True, flip_y=False),
+                [_mirror_rect(rect, atlas.get_width()) for rect in rects],
+            )
+
+            for model, flipped_model in zip(get_models(name), flipped_models):
+                ORIENTED_MODELS[model] = (model, flipped_model)
+
+            continue
+
+        for model in get_models(name):
+            ORIENTED_MODELS[model] = (
+                model,
+                transform.flip(model, flip_x=True, flip_y=False),
+            )
+
+    for model, oriented_models in ORIENTED_MODELS.items():
+        MODEL_MASKS[model] = tuple(
+            mask.from_surface(oriented_model) for oriented_model in oriented_models
         )
-    )
 
-# Sorcerer
-SORCERER_MAIN_MODELS: list[Surface] = []
-
-for i in range(1, 9):
-    SORCERER_MAIN_MODELS.append(
-        transform.rotate(
-            transform.scale(
-                image.load(f"assets/sprites/sorcerer/{i}.png"),
-                (conf.ENEMY_WIDTH, conf.ENEMY_HEIGHT),
-            ),
-            -90,
+
+def get_oriented_model(model: Surface, flipped: bool):
+    # Only the flipped models were flipped on every draw
+    if flipped:
+        FLIP_STATS["frame"] += 1
+
+    return ORIENTED_MODELS[model][flipped]
+
+
+def get_model_mask(model: Surface, flipped: bool):
+    return MODEL_MASKS[model][flipped]
+
+
+def get_layered_model_mask(model: Surface, top_model: Surface, flipped: bool):
+    # Mask of the top model drawn over the model
+    # at the same position, e.g. a dying enemy
+    key = (model, top_model, flipped)
+
+    if key not in LAYERED_MODEL_MASKS:
+        model_mask = get_model_mask(model, flipped)
+        top_model_mask = get_model_mask(top_model, flipped)
+
+        layered_mask = mask.Mask(
+            (
+                max(model_mask.get_size()[0], top_model_mask.get_size()[0]),
+                max(model_mask.get_size()[1], top_model_mask.get_size()[1]),
+            )
         )
-    )
+        layered_mask.draw(model_mask, (0, 0))
+        layered_mask.draw(top_model_mask, (0, 0))
+
+        LAYERED_MODEL_MASKS[key] = layered_mask
+
+    return LAYERED_MODEL_MASKS[key]
+
+
+def reset_frame_flip_stats():
+    # Returns the saved flips of the last frame
+    # and starts counting for the next one
+    saved_flips = FLIP_STATS["frame"]
+    FLIP_STATS["total"] += saved_flips
+    FLIP_STATS["frame"] = 0
+
+    return saved_flips
+
+
+def build_derived_assets():
+    build_orientation_cache()
+    build_player_pose_table()
+
+
+def prepare_derived_assets():
+    # The flipped and rotated models and their masks are made
+    # once from the final models, finalize_assets makes them when
+    # there is a display and the games without a display make
+    # them from the loaded models when the first game is made
+    if not ORIENTED_MODELS:
+        build_derived_assets()
+
+
+# Write the new models to the bake cache file
+BAKE_CACHE.save()
+
+
+# Display format conversion
+# Loaded surfaces keep their file pixel format, so every blit
+# would convert them. finalize_assets converts all of them to
+# the display format once the display mode is set and picks
+# the cheapest blit mode for each one of them
+COLORKEY = (255, 0, 255)
+
+# Maps each asset name to its format: opaque, colorkey or alpha
+ASSET_FORMATS: dict[str, str] = {}
+
+
+def _pick_surface_format(surface: Surface):
+    # Palette images with a transparent color and
+    # surfaces without any transparency
+    if not surface.get_flags() & SRCALPHA:
+        return "opaque" if surface.get_colorkey() is None else "colorkey"
+
+    # Count of the pixels that are not fully transparent
+    visible_pixels = mask.from_surface(surface, 0).count()
+    # Count of the pixels that are fully opaque
+    solid_pixels = mask.from_surface(surface, 254).count()
+
+    if solid_pixels == surface.get_width() * surface.get_height():
+        return "opaque"
+
+    # If every pixel is either fully transparent or fully
+    # opaque, a colorkey can replace the alpha channel
+    if visible_pixels == solid_pixels:
+        return "colorkey"
+
+    return "alpha"
+
+
+def _convert_to_colorkey(surface: Surface):
+    colorkey = surface.get_colorkey()
+
+    if colorkey is None:
+        converted = Surface(surface.get_size()).convert()
+        converted.fill(COLORKEY)
+        converted.blit(surface, (0, 0))
+        colorkey = COLORKEY
+    else:
+        converted = surface.convert()
+
+    converted.set_colorkey(colorkey, RLEACCEL)
+
+    # If a visible pixel had the colorkey color
+    # the conversion is not accurate
+    visible_pixels = mask.from_surface(converted).count()
+
+    if visible_pixels != mask.from_surface(surface, 254).count():
+        return None
+
+    return converted
+
+
+def finalize_surface(surface: Surface) -> tuple[Surface, str]:
+    surface_format = _pick_surface_format(surface)
+
+    if surface_format == "colorkey":
+        converted = _convert_to_colorkey(surface)
+
+        if converted is not None:
+            return converted, surface_format
+
+        surface_format = "alpha"
+
+    if surface_format == "opaque":
+        return surface.convert(), surface_format
+
+    return surface.convert_alpha(), surface_format
+
+
+def finalize_assets():
+    # This function needs a display surface so it must be
+    # called after pygame.display.set_mode
+    ASSET_FORMATS.clear()
+
+    for name, value in list(globals().items()):
+        if not name.isupper():
+            continue
+
+        if isinstance(value, Surface):
+            globals()[name], ASSET_FORMATS[name] = finalize_surface(value)
+
+        # Convert the atlas of a packed model list once
+        # and cut the models out of the converted atlas
+        elif name in MODEL_ATLASES:
+            atlas, rects = MODEL_ATLASES[name]
+            atlas, ASSET_FORMATS[name] = finalize_surface(atlas)
+            MODEL_ATLASES[name] = (atlas, rects)
+
+            value[:] = _cut_models(atlas, rects)
+
+        # Model lists are changed in place because
+        # the sprite modules hold references to them
+        elif _is_model_list(value):
+            for i, model in enumerate(value):
+                value[i], ASSET_FORMATS[f"{name}[{i}]"] = finalize_surface(model)
+
+    # Flipped and rotated copies keep the
+    # format of their converted sources
+    build_derived_assets()
+
+    return ASSET_FORMATS
+
+
+def asset_format_report():
+    lines = [
+        f"{name} : {surface_format}" for name, surface_format in ASSET_FORMATS.items()
+    ]
+
+    for surface_format in ("opaque", "colorkey", "alpha"):
+        count = list(ASSET_FORMATS.values()).count(surface_format)
+        lines.append(f"{surface_format} assets : {count}")
+
+    return "\n".join(lines)
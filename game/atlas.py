@@ -0,0 +1,140 @@
+import json, os
+from pygame import image, Surface, Rect, SRCALPHA, BLEND_RGBA_MAX
+from config import conf
+
+# Animation frame sets that are baked into atlases
+# with the count of their frames
+ANIMATION_FRAME_SETS: dict[str, int] = {
+    "assets/environment/explosion": 7,
+    "assets/environment/spikes": 12,
+    "assets/items/coin": 8,
+    "assets/sprites/player/run": 6,
+    "assets/sprites/player/attack": 13,
+    "assets/sprites/player/hit": 5,
+    "assets/sprites/bringer_of_death": 8,
+    "assets/sprites/bringer_of_death/death": 11,
+    "assets/sprites/hellhound": 11,
+    "assets/sprites/golem": 4,
+    "assets/sprites/bat": 4,
+    "assets/sprites/cacodemon": 13,
+    "assets/sprites/cacodemon/death": 8,
+    "assets/sprites/sorcerer": 8,
+}
+
+
+def _load_manifest():
+    if not os.path.exists(conf.ATLAS_MANIFEST_PATH):
+        return {}
+
+    with open(conf.ATLAS_MANIFEST_PATH, mode="r") as manifest_file:
+        return json.load(manifest_file)
+
+
+def copy_frame(atlas: Surface, frame: Surface, rect: Rect):
+    # Per-pixel alpha frames are copied with max blending
+    # on the empty atlas, so their pixels won't be blended
+    if frame.get_flags() & SRCALPHA:
+        atlas.blit(frame, rect, special_flags=BLEND_RGBA_MAX)
+
+    # and colorkey or opaque frames are just blitted
+    else:
+        atlas.blit(frame, rect)
+
+
+def pack_frames(
+    frames: list[Surface], max_width: int = conf.ATLAS_MAX_WIDTH
+) -> tuple[Surface, list[Rect]]:
+    rects = []
+    x = 0
+    y = 0
+    shelf_height = 0
+
+    # Put the frames next to each other in shelves
+    # and start a new shelf when the max width is reached
+    for frame in frames:
+        width, height = frame.get_size()
+
+        if x and x + width > max_width:
+            x = 0
+            y += shelf_height
+            shelf_height = 0
+
+        rects.append(Rect(x, y, width, height))
+
+        x += width
+        shelf_height = max(shelf_height, height)
+
+    atlas = Surface(
+        (max(rect.right for rect in rects), max(rect.bottom for rect in rects)),
+        SRCALPHA,
+    )
+
+    for frame, rect in zip(frames, rects):
+        copy_frame(atlas, frame, rect)
+
+    return atlas, rects
+
+
+def get_atlas_path(directory: str):
+    name = directory.removeprefix("assets/").replace("/", "_")
+
+    return os.path.join(conf.ATLAS_DIR, f"{name}.png")
+
+
+def bake_atlases():
+    manifest = {}
+
+    os.makedirs(conf.ATLAS_DIR, exist_ok=True)
+
+    for directory, count in ANIMATION_FRAME_SETS.items():
+        frames = [image.load(f"{directory}/{i}.png") for i in range(1, count + 1)]
+        atlas, rects = pack_frames(frames)
+        atlas_path = get_atlas_path(directory)
+
+        image.save(atlas, atlas_path)
+
+        manifest[directory] = {
+            "image": atlas_path,
+            "frames": [list(rect) for rect in rects],
+        }
+
+    with open(conf.ATLAS_MANIFEST_PATH, mode="w") as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+
+    return manifest
+
+
+# Manifest of the baked atlases, it is empty
+# if the atlases are not baked yet
+MANIFEST = _load_manifest()
+
+
+def has_atlas(directory: str, count: int):
+    atlas_info = MANIFEST.get(directory)
+
+    return atlas_info is not None and len(atlas_info["frames"]) >= count
+
+
+def get_frame_sources(directory: str, count: int) -> list[str]:
+    # Image files that the frames are loaded from
+    if has_atlas(directory, count):
+        return [MANIFEST[directory]["image"]]
+
+    return [f"{directory}/{i}.png" for i in range(1, count + 1)]
+
+
+def load_frames(directory: str, count: int) -> list[Surface]:
+    # Load each frame file if there is no atlas for the directory
+    if not has_atlas(directory, count):
+        return [image.load(source) for source in get_frame_sources(directory, count)]
+
+    # otherwise open the atlas once and cut the frames out of it
+    atlas_info = MANIFEST[directory]
+    atlas = image.load(atlas_info["image"])
+
+    return [atlas.subsurface(rect) for rect in atlas_info["frames"][:count]]
+
+
+if __name__ == "__main__":
+    for directory, atlas_info in bake_atlases().items():
+        print(f"{directory} -> {atlas_info['image']}")
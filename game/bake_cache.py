@@ -0,0 +1,139 @@
+import hashlib, json, mmap, os, struct
+from pygame import image, Surface, SRCALPHA
+
+
+def make_key(sources: list[str], params: tuple) -> str:
+    # The key is a hash of the source image files and the
+    # processing parameters (sizes and angles), so changing
+    # any of them will make the cached models stale
+    digest = hashlib.sha1()
+
+    for source in sources:
+        with open(source, mode="rb") as source_file:
+            digest.update(source_file.read())
+
+    digest.update(repr(params).encode())
+
+    return digest.hexdigest()
+
+
+class BakeCache:
+    # File layout:
+    # header (magic, index length), JSON index, raw pixels
+    MAGIC = b"SHBAKE02"
+    HEADER = struct.Struct("<8sQ")
+
+    def __init__(self, filepath: str) -> None:
+        self.filepath = filepath
+        self.hits = 0
+        self.misses = 0
+
+        # Maps each key to the [offset, width, height, pixel format]
+        # of its models in the cache file
+        self.index: dict[str, list[list[int]]] = {}
+        # Models that are built or loaded in this run
+        self.models: dict[str, list[Surface]] = {}
+
+        self.__data = None
+
+        if os.path.exists(filepath):
+            self.__load()
+
+    def __load(self):
+        try:
+            with open(self.filepath, mode="rb") as cache_file:
+                # Private copy on write mapping, so the surfaces
+                # can use the mapped pixels without copying them
+                data = mmap.mmap(cache_file.fileno(), 0, access=mmap.ACCESS_COPY)
+
+            magic, index_length = self.HEADER.unpack_from(data)
+
+            if magic != self.MAGIC:
+                return
+
+            index_start = self.HEADER.size
+            index = json.loads(data[index_start : index_start + index_length])
+        except (OSError, ValueError, struct.error):
+            return
+
+        self.__data = memoryview(data)[index_start + index_length :]
+        self.index = index
+
+    def get(self, key: str):
+        if key in self.models:
+            return self.models[key]
+
+        if key not in self.index:
+            self.misses += 1
+            return None
+
+        models = []
+
+        for offset, width, height, pixel_format in self.index[key]:
+            length = width * height * len(pixel_format)
+
+            models.append(
+                image.frombuffer(
+                    self.__data[offset : offset + length],
+                    (width, height),
+                    pixel_format,
+                )
+            )
+
+        self.hits += 1
+        self.models[key] = list(models)
+
+        return models
+
+    def put(self, key: str, models: list[Surface]):
+        self.models[key] = list(models)
+
+    def save(self):
+        # Nothing to save if every model was in the cache
+        # and there is no stale model in it
+        if not self.misses and self.models.keys() == self.index.keys():
+            return
+
+        index = {}
+        pixels = []
+        offset = 0
+
+        for key, models in self.models.items():
+            index[key] = []
+
+            for model in models:
+                # Models without any transparency don't need an alpha channel
+                pixel_format = (
+                    "RGB"
+                    if not model.get_flags() & SRCALPHA and model.get_colorkey() is None
+                    else "RGBA"
+                )
+                model_pixels = image.tobytes(model, pixel_format)
+
+                index[key].append(
+                    [offset, model.get_width(), model.get_height(), pixel_format]
+                )
+                pixels.append(model_pixels)
+
+                offset += len(model_pixels)
+
+        index_bytes = json.dumps(index).encode()
+        # Every process writes its own temp file, so the
+        # processes that run the game at once won't mix them
+        temp_filepath = f"{self.filepath}.{os.getpid()}.tmp"
+
+        # The cache is optional, so the game just
+        # runs without it if it cannot be written
+        try:
+            os.makedirs(os.path.dirname(self.filepath) or ".", exist_ok=True)
+
+            with open(temp_filepath, mode="wb") as cache_file:
+                cache_file.write(self.HEADER.pack(self.MAGIC, len(index_bytes)))
+                cache_file.write(index_bytes)
+
+                for model_pixels in pixels:
+                    cache_file.write(model_pixels)
+
+            os.replace(temp_filepath, self.filepath)
+        except OSError:
+            pass
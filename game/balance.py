@@ -0,0 +1,294 @@
+import argparse, ast, os, statistics, sys, time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from random import Random
+from config import conf
+
+# NumPy is optional, the statistics are computed
+# with the standard library if it is not installed
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+METRICS = ("score", "kills", "coins", "survival_time")
+PERCENTILES = (10, 50, 90)
+STAT_NAMES = (
+    "mean",
+    "std",
+    "min",
+    *(f"p{percentile}" for percentile in PERCENTILES),
+    "max",
+)
+
+# Lookahead of the dodge policy in pixels above the player
+DODGE_POLICY_LOOKAHEAD = 250
+
+
+def random_policy(game, rng: Random):
+    # Press a random input a few times in a second
+    if rng.random() < 0.05:
+        return [rng.choice(game.INPUTS)]
+
+    return []
+
+
+def dodge_policy(game, rng: Random):
+    # Attack the enemies and jump over the obstacles
+    # that are on the player side and close to him
+    from .sprites.enemies import Enemy
+    from .sprites.obstacles import Obstacle
+
+    player = game.player
+    inputs = []
+    is_enemy_ahead = False
+
+    for sprite in game.SPRITES:
+        if sprite.side != player.side:
+            continue
+
+        if not (
+            player.rect.top - DODGE_POLICY_LOOKAHEAD
+            < sprite.y + sprite.height
+            <= player.rect.bottom
+        ):
+            continue
+
+        if isinstance(sprite, Enemy) and not sprite.is_dead:
+            is_enemy_ahead = True
+
+        elif isinstance(sprite, Obstacle) and not player.is_jumping:
+            inputs.append("left" if player.side == "right" else "right")
+
+    if is_enemy_ahead and not player.is_attacking:
+        inputs.append("attack")
+
+    elif not is_enemy_ahead and player.is_attacking:
+        inputs.append("release_attack")
+
+    return inputs
+
+
+POLICIES = {
+    "random": random_policy,
+    "dodge": dodge_policy,
+}
+
+
+def check_overrides(overrides: dict):
+    for name in overrides:
+        if not hasattr(conf, name):
+            raise ValueError(f"Unknown config value : {name}")
+
+
+def apply_overrides(overrides: dict):
+    check_overrides(overrides)
+
+    for name, value in overrides.items():
+        setattr(conf, name, value)
+
+
+def _init_worker(overrides: dict):
+    # Every worker imports pygame, so just print its message once
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+    # Some config values like the drop chances are read when
+    # the game modules are imported, so the overrides are
+    # applied before importing them in the worker
+    apply_overrides(overrides)
+
+
+def run_game(seed: int, policy_name: str, max_ticks: int):
+    from .game import Game
+
+    game = Game(save_records=False)
+    policy = POLICIES[policy_name]
+    policy_rng = Random(f"{seed}:policy")
+    spawns = Counter()
+    sprites = set()
+
+    game.start(seed)
+
+    while game.is_playing and game.total_ticks < max_ticks:
+        game.step(policy(game, policy_rng))
+
+        # Count the sprites that are spawned in this tick
+        current_sprites = set(game.SPRITES)
+        spawns.update(type(sprite).__name__ for sprite in current_sprites - sprites)
+        sprites = current_sprites
+
+    return {
+        "seed": seed,
+        "score": game.score,
+        "kills": game.kills,
+        "coins": game.coins,
+        "survival_time": game.total_ticks / conf.TICK_RATE,
+        "is_game_over": game.is_game_over,
+        "spawns": dict(spawns),
+    }
+
+
+def run_games(
+    games: int,
+    seed: int = 0,
+    policy_name: str = "dodge",
+    max_seconds: float = 600,
+    overrides: dict = None,
+    workers: int = None,
+):
+    # Every game has its own seed, so the results are the
+    # same for any count of workers and any scheduling
+    seeds = range(seed, seed + games)
+    max_ticks = int(max_seconds * conf.TICK_RATE)
+    overrides = overrides or {}
+    workers = workers or os.cpu_count()
+
+    check_overrides(overrides)
+
+    # The workers are spawned to import the game
+    # modules again with the overridden config
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(overrides,),
+    ) as executor:
+        return list(
+            executor.map(
+                run_game,
+                seeds,
+                [policy_name] * games,
+                [max_ticks] * games,
+                chunksize=max(1, games // (4 * workers)),
+            )
+        )
+
+
+def _describe(values: list[float]):
+    if numpy is not None:
+        values = numpy.asarray(values, dtype=numpy.float64)
+
+        return {
+            "mean": float(values.mean()),
+            "std": float(values.std()),
+            "min": float(values.min()),
+            "max": float(values.max()),
+            **{
+                f"p{percentile}": float(numpy.percentile(values, percentile))
+                for percentile in PERCENTILES
+            },
+        }
+
+    sorted_values = sorted(values)
+    quantiles = (
+        statistics.quantiles(sorted_values, n=100, method="inclusive")
+        if len(sorted_values) > 1
+        else sorted_values * 99
+    )
+
+    return {
+        "mean": statistics.fmean(sorted_values),
+        "std": statistics.pstdev(sorted_values),
+        "min": sorted_values[0],
+        "max": sorted_values[-1],
+        **{f"p{percentile}": quantiles[percentile - 1] for percentile in PERCENTILES},
+    }
+
+
+def summarize(results: list[dict]):
+    # The metric values are NumPy arrays if NumPy is installed
+    metrics = {metric: [result[metric] for result in results] for metric in METRICS}
+
+    if numpy is not None:
+        metrics = {
+            metric: numpy.asarray(values, dtype=numpy.float64)
+            for metric, values in metrics.items()
+        }
+
+    spawns = Counter()
+
+    for result in results:
+        spawns.update(result["spawns"])
+
+    return {
+        "games": len(results),
+        "game_overs": sum(result["is_game_over"] for result in results),
+        "metrics": metrics,
+        "stats": {metric: _describe(values) for metric, values in metrics.items()},
+        "spawns": spawns,
+    }
+
+
+def format_report(summary: dict):
+    lines = [
+        f"Games : {summary['games']}, game overs : {summary['game_overs']}",
+        "",
+        f"{'':<14}" + "".join(f"{name:>10}" for name in STAT_NAMES),
+    ]
+
+    for metric, stats in summary["stats"].items():
+        lines.append(
+            f"{metric:<14}" + "".join(f"{stats[name]:>10.2f}" for name in STAT_NAMES)
+        )
+
+    lines += ["", "Spawned sprites :"]
+    total_spawns = sum(summary["spawns"].values()) or 1
+
+    for name, count in summary["spawns"].most_common():
+        lines.append(f"{name:<14}{count:>10}{count / total_spawns:>10.1%}")
+
+    return "\n".join(lines)
+
+
+def _parse_override(value: str):
+    name, _, literal = value.partition("=")
+
+    try:
+        return name.strip(), ast.literal_eval(literal.strip())
+    except (ValueError, SyntaxError):
+        raise argparse.ArgumentTypeError(f"Invalid config value : {value}")
+
+
+def main(args: list[str] = None):
+    parser = argparse.ArgumentParser(
+        prog="python -m game.balance",
+        description="Run headless games and report the balance statistics",
+    )
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--policy", choices=POLICIES, default="dodge")
+    parser.add_argument("--max-seconds", type=float, default=600)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "--set",
+        type=_parse_override,
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help="Override a config value, e.g. --set COIN_DROP_CHANCE=2",
+    )
+    args = parser.parse_args(args)
+
+    try:
+        check_overrides(dict(args.set))
+    except ValueError as error:
+        parser.error(str(error))
+
+    start_time = time.perf_counter()
+    results = run_games(
+        args.games,
+        seed=args.seed,
+        policy_name=args.policy,
+        max_seconds=args.max_seconds,
+        overrides=dict(args.set),
+        workers=args.workers,
+    )
+    elapsed_time = time.perf_counter() - start_time
+
+    print(format_report(summarize(results)))
+    print(f"\nSimulated in {elapsed_time:.1f} seconds")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
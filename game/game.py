@@ -6,12 +6,23 @@ from .sprites.sprite import Sprite
 from .sprites.obstacles import obstacles
 from .sprites.items import items, Coin, Sprint, Health, Shield, ScoreBoost
 from .sprites.enemies import enemies, Enemy
+from .sprites.store import SpriteStore, is_store_available
+from .sprites.lanes import LaneGroup, LANES
+from .sprites.pool import SpritePool
+from .sprites.spawn_table import SpawnTables
+from .sprites.spawn_schedule import SpawnSchedule, SpawnEntry
 from .ui.button import Button
 from .ui.text import Text
 from .ui.prompt import Prompt
-from db.db import DB
+from .ui.screen import Screen
+from .ui.font import render_text, TEXT_CACHE
+from .rng import RandomStreams
+from .replay import ReplayRecorder, get_replay_path
+from db.db import open_db, RECORD_ORDERS
+from db.writer import RecordWriter
 from db.record import Record
-from random import choices as random_choices, randint
+from random import getrandbits
+from concurrent.futures import Future
 
 
 class Game:
@@ -23,12 +34,32 @@ class Game:
         c.DROP_CHANCE if c.DROP_CHANCE else 1 for c in SPRITE_CLASSES
     ]
 
-    SPRINT_DISABLE_EVENT = pygame.USEREVENT + 1
-    SHIELD_DISABLE_EVENT = pygame.USEREVENT + 2
-    SCORE_BOOST_DISABLE_EVENT = pygame.USEREVENT + 3
-
-    def __init__(self, surface: pygame.Surface) -> None:
+    # Collision handler method names of the sprite types,
+    # other sprites hit the player like obstacles
+    COLLISION_HANDLERS: dict[type, str] = {
+        Enemy: "collide_with_enemy",
+        Coin: "collide_with_coin",
+        Sprint: "collide_with_sprint",
+        ScoreBoost: "collide_with_score_boost",
+        Shield: "collide_with_shield",
+        Health: "collide_with_health",
+    }
+
+    # Inputs that can be given to the game step
+    INPUTS = ("left", "right", "attack", "release_attack")
+
+    # Orders of the leaderboard, all the records are
+    # shown in pages in the order that they are added
+    LEADERBOARD_ORDERS = RECORD_ORDERS + ("all",)
+
+    def __init__(self, surface: pygame.Surface = None, save_records=True) -> None:
+        # The surface can be None for running the game simulation
+        # without rendering and the records may not be saved
         self.surface = surface
+
+        # The flipped models and the masks are made once, by
+        # finalize_assets or by the first game without a display
+        assets.prepare_derived_assets()
         self.speed = conf.GAME_SPEED
         self.is_started = False
         self.is_paused = False
@@ -40,13 +71,83 @@ class Game:
         self.is_score_boosted = False
         self.is_muted = False
 
+        # Game ticks are run from the elapsed time and the
+        # interpolation is the progress between the previous
+        # and the current tick that is used for drawing
+        self.ticks = 0
+        self.total_ticks = 0
+        self.interpolation = 1.0
+        self.__tick_accumulator = 0.0
+
+        # Count of the flip allocations removed
+        # by the orientation cache in the last frame
+        self.saved_flips = 0
+
+        # Screen areas that are changed in the last frame,
+        # None means that the whole screen must be updated
+        self.dirty_rects = None
+        self.__drawn_rects = []
+        self.__prev_drawn_rects = []
+        self.__was_game_frame = False
+
         self.player = Player(self.player_jump_speed)
 
-        self.db = DB(conf.DB_FILEPATH)
+        # Every game has its own sprites, so more
+        # than one game can be simulated at once
+        self.SPRITES = pygame.sprite.Group()
+        self.LANES = LaneGroup()
+
+        # Spawn tables of the difficulty tiers and the
+        # table of the current tier
+        self.spawn_tables = SpawnTables(
+            self.SPRITE_CLASSES, self.SPRITE_DROP_WEIGHTS, conf.SPAWN_DIFFICULTY_TIERS
+        )
+        self.spawn_table = self.spawn_tables.get_table(self.speed)
+        self.__collision_handlers: dict[type, str] = {}
+        self.sprite_store = (
+            SpriteStore() if conf.ARRAY_SPRITE_STORE and is_store_available() else None
+        )
+        self.sprite_pool = SpritePool(self.sprite_store)
+
+        self.db = open_db() if save_records else None
+
+        # The records are saved by a writer thread and it tells
+        # if the record of the last game is a high score
+        self.record_writer = RecordWriter(self.db) if self.db else None
+        self.__high_score_future: Future = None
+
+        # The leaderboard records are read by the writer thread
+        # and they are None until they are read
+        self.is_showing_leaderboard = False
+        self.leaderboard_order = "score"
+        self.leaderboard_page = 0
+        self.leaderboard_records: list[Record] = None
+        self.__leaderboard_future: Future = None
+        self.__leaderboard_loads = 0
+
+        # Random streams of the current game and the
+        # recorder of its inputs if replays are recorded
+        self.random = RandomStreams(getrandbits(32))
+        self.replay_recorder: ReplayRecorder = None
+
+        # Upcoming spawns of the game and the last spawned
+        # sprite that the next spawn is placed after, the
+        # spawns are generated when the game is started
+        self.spawn_schedule = SpawnSchedule(())
+        self.__last_sprite: Sprite = None
+
+        # UI screens are built once and only
+        # rebuilt when their state changes
+        self.main_menu_screen = Screen(self.build_main_menu)
+        self.pause_screen = Screen(self.build_pause_prompt)
+        self.game_over_screen = Screen(self.build_game_over_prompt)
+        self.game_screen = Screen(self.build_game_screen)
+        self.leaderboard_screen = Screen(self.build_leaderboard)
 
         # This variable can move the platforms in
         # the y direction with the game speed
         self.__platform_move_y = 0
+        self.__prev_platform_move_y = 0
 
         # This variable is for saving speed
         # before performing a sprint action
@@ -54,6 +155,10 @@ class Game:
         # the sprint action has finished
         self.__speed_before_sprint = None
 
+        # Remaining ticks of the active abilities, the
+        # ability is disabled when its ticks are finished
+        self.__ability_timers: dict[str, int] = {}
+
         # Load and play the main menu theme
         self.load_and_play_music(conf.MAIN_MENU_THEME_PATH)
 
@@ -68,10 +173,36 @@ class Game:
     def is_playing(self):
         return self.is_started and self.is_running
 
+    @property
+    def current_screen(self):
+        if not self.is_started:
+            if self.is_showing_leaderboard:
+                return self.leaderboard_screen
+
+            return self.main_menu_screen
+        elif self.is_game_over:
+            return self.game_over_screen
+        elif self.is_paused:
+            return self.pause_screen
+        else:
+            return self.game_screen
+
     @property
     def player_jump_speed(self):
         return self.speed * conf.PLAYER_JUMP_SPEED_FACTOR
 
+    @property
+    def difficulty_speed(self):
+        # The game speed without the sprint
+        if self.__speed_before_sprint is not None:
+            return min(self.speed, self.__speed_before_sprint)
+
+        return self.speed
+
+    @property
+    def difficulty_tier(self):
+        return self.spawn_tables.get_tier(self.difficulty_speed)
+
     @property
     def active_ability_icons(self):
         icons = []
@@ -87,26 +218,50 @@ class Game:
 
         return icons
 
+    @property
+    def debug_stats(self):
+        return [
+            f"Ticks per frame : {self.ticks}",
+            f"Difficulty tier : {self.difficulty_tier}",
+            f"Saved flips per frame : {self.saved_flips}",
+            f"Total saved flips : {assets.FLIP_STATS['total']}",
+            f"Text cache size : {len(TEXT_CACHE)}",
+            f"Text cache hits : {TEXT_CACHE.hits}, misses : {TEXT_CACHE.misses}",
+            f"Text cache evictions : {TEXT_CACHE.evictions}",
+            f"Sprite pool size : {len(self.sprite_pool)}, "
+            f"reuse rate : {self.sprite_pool.reuse_rate:.0%}",
+            "Upcoming spawns : "
+            + ", ".join(
+                entry.sprite_class.__name__ for entry in self.spawn_schedule.upcoming
+            ),
+        ]
+
+    def __set_ability_timer(self, ability: str, duration: int):
+        # The duration is in milliseconds and it is
+        # converted to the ticks of the game step
+        self.__ability_timers[ability] = int(duration * conf.TICK_RATE / 1000)
+
     def __shield_event(self, duration: int):
         self.player.shield()
-        pygame.time.set_timer(self.SHIELD_DISABLE_EVENT, duration)
+        self.__set_ability_timer("shield", duration)
 
     def __sprint_event(self, duration: int):
         self.player.sprint()
-        pygame.time.set_timer(self.SPRINT_DISABLE_EVENT, duration)
+        self.__set_ability_timer("sprint", duration)
 
     def __score_boost_event(self, duration: int):
         self.active_score_boost()
-        pygame.time.set_timer(self.SCORE_BOOST_DISABLE_EVENT, duration)
+        self.__set_ability_timer("score_boost", duration)
 
     def __draw_game_stats_ui(
         self,
-        font: pygame.font.Font,
         text: str,
         icon: pygame.Surface,
         position: tuple[float],
     ):
-        text_surface = font.render(text, True, conf.GAME_STATS_TEXT_COLOR)
+        text_surface = render_text(
+            text, conf.GAME_STATS_ICON_SIZE, conf.GAME_STATS_TEXT_COLOR
+        )
 
         icon_rect = icon.get_rect()
         text_rect = text_surface.get_rect()
@@ -119,23 +274,112 @@ class Game:
         )
 
         self.surface.blit(icon, icon_rect)
-        self.surface.blit(text_surface, text_rect)
+        self.mark_dirty(self.surface.blit(text_surface, text_rect))
 
     def __draw_ability_icon(self, icon: pygame.Surface, position: tuple[float]):
         icon_rect = icon.get_rect()
         icon_rect.center = (position[0] - icon_rect.width, position[1])
 
-        self.surface.blit(
-            pygame.transform.scale(
-                icon, (conf.GAME_STATS_ICON_SIZE, conf.GAME_STATS_ICON_SIZE)
-            ),
-            icon_rect,
+        self.mark_dirty(
+            self.surface.blit(
+                pygame.transform.scale(
+                    icon, (conf.GAME_STATS_ICON_SIZE, conf.GAME_STATS_ICON_SIZE)
+                ),
+                icon_rect,
+            )
         )
 
+    @staticmethod
+    def __merge_rects(rects: list[pygame.Rect]):
+        merged_rects = []
+
+        # Merge every rect with the overlapping rects
+        # until there is no overlapping rect left
+        for rect in rects:
+            rect = rect.copy()
+            index = rect.collidelist(merged_rects)
+
+            while index != -1:
+                rect.union_ip(merged_rects.pop(index))
+                index = rect.collidelist(merged_rects)
+
+            merged_rects.append(rect)
+
+        return merged_rects
+
+    def __collect_dirty_rects(self, is_game_frame: bool):
+        drawn_rects = self.__drawn_rects
+        prev_drawn_rects = self.__prev_drawn_rects
+        was_game_frame = self.__was_game_frame
+
+        self.__drawn_rects = []
+        self.__prev_drawn_rects = drawn_rects
+        self.__was_game_frame = is_game_frame
+
+        # Menus, prompts, the first game frame after them
+        # and the debug stats need a full screen update
+        if (
+            not conf.DIRTY_RECT_RENDERING
+            or not is_game_frame
+            or not was_game_frame
+            or conf.SHOW_DEBUG_STATS
+        ):
+            return None
+
+        # The platforms are moving on every frame and the other
+        # objects must be updated on their previous and new areas
+        dirty_rects = [
+            pygame.Rect(0, 0, conf.PLATFORM_WIDTH, conf.SCREEN_HEIGHT),
+            pygame.Rect(
+                conf.SCREEN_WIDTH - conf.PLATFORM_WIDTH,
+                0,
+                conf.PLATFORM_WIDTH,
+                conf.SCREEN_HEIGHT,
+            ),
+        ] + self.__merge_rects(prev_drawn_rects + drawn_rects)
+
+        # Just update the whole screen if
+        # most of it is changed
+        dirty_area = sum(rect.width * rect.height for rect in dirty_rects)
+
+        if (
+            dirty_area
+            > conf.SCREEN_WIDTH * conf.SCREEN_HEIGHT * conf.DIRTY_RECTS_MAX_AREA_FACTOR
+        ):
+            return None
+
+        return dirty_rects
+
+    def mark_dirty(self, rect: pygame.Rect):
+        self.__drawn_rects.append(rect)
+
     def load_and_play_music(self, music_path: str):
+        # The simulation can run without the mixer
+        if not pygame.mixer.get_init():
+            return
+
         pygame.mixer.music.load(music_path)
         pygame.mixer.music.play(loops=-1)
 
+    def update_ability_timers(self):
+        for ability in list(self.__ability_timers):
+            self.__ability_timers[ability] -= 1
+
+            if self.__ability_timers[ability] > 0:
+                continue
+
+            del self.__ability_timers[ability]
+
+            match ability:
+                case "shield":
+                    self.player.disable_shield()
+
+                case "sprint":
+                    self.player.disable_sprint()
+
+                case "score_boost":
+                    self.deactive_score_boost()
+
     def update_speed(self):
         # Increase the speed by the sprint factor
         # if the player is sprinting until it reaches
@@ -162,6 +406,13 @@ class Game:
             self.__speed_before_sprint = None
             self.speed += conf.GAME_SPEED_INCREMENT_FACTOR
 
+        self.update_spawn_table()
+
+    def update_spawn_table(self):
+        # Pick the table of the difficulty tier after the speed is
+        # changed, the spawns are generated with the picked table
+        self.spawn_table = self.spawn_tables.get_table(self.difficulty_speed)
+
     def increment_score(self, count=1):
         self.score += count * 2 if self.is_score_boosted else count
 
@@ -183,16 +434,23 @@ class Game:
     def resume(self):
         self.is_paused = False
 
+    def save_replay(self):
+        if self.replay_recorder is None:
+            return
+
+        replay = self.replay_recorder.stop(self.total_ticks)
+        replay.save(get_replay_path(replay.seed))
+        self.replay_recorder = None
+
     def game_over(self):
-        # Save record
-        new_record = Record(score=self.score, kills=self.kills, coins=self.coins)
+        self.save_replay()
 
-        self.db.add_record(new_record)
+        if self.record_writer:
+            # Save record, the writer checks for higher records
+            # and if there is no higher record then it is a high score
+            new_record = Record(score=self.score, kills=self.kills, coins=self.coins)
 
-        # Check for higher record
-        # If there is no higher record then it is a high score
-        if not self.db.is_there_any_higher_records(new_record):
-            self.is_reached_high_score = True
+            self.__high_score_future = self.record_writer.add_record(new_record)
 
         self.is_game_over = True
 
@@ -204,30 +462,116 @@ class Game:
         self.is_paused = False
         self.is_game_over = False
         self.is_reached_high_score = False
+        self.__high_score_future = None
         self.speed = conf.GAME_SPEED
+        self.total_ticks = 0
         self.__platform_move_y = 0
+        self.__prev_platform_move_y = 0
         self.__speed_before_sprint = None
+        self.__ability_timers = {}
+        self.update_spawn_table()
 
         self.deactive_score_boost()
         self.player.reset(self.player_jump_speed)
-        self.SPRITES.empty()
+
+        # Killing the sprites puts them back to the pool
+        # and removes them from the groups and the store
+        for sprite in self.SPRITES.sprites():
+            sprite.kill()
+
+        self.__last_sprite = None
 
         self.MAXIMUM_SPRITES = 1
         self.SPRITE_DISTANCE_FACTOR = conf.MAX_SPRITES_DISTANCE_FACTOR
 
-    def start(self):
+    def start(self, seed: int = None, is_replay: bool = False):
         self.reset()
+
+        # A new seed is picked for every game if
+        # it is not given, e.g. by a replay
+        self.random = RandomStreams(getrandbits(32) if seed is None else seed)
+
+        if conf.RECORD_REPLAYS and not is_replay:
+            self.replay_recorder = ReplayRecorder(self.random.seed)
+
+        # The spawns are generated by the new random streams
+        self.spawn_schedule = SpawnSchedule(self.generate_spawns())
+
+        # Make the sprites before the game starts, so the
+        # first spawns of the game won't create them
+        self.sprite_pool.prewarm(self.SPRITE_CLASSES)
+
         self.is_started = True
         self.load_and_play_music(conf.GAME_THEME_PATH)
 
     def finish(self):
+        self.save_replay()
         self.is_started = False
         self.load_and_play_music(conf.MAIN_MENU_THEME_PATH)
 
     def quit(self):
+        # Write the queued records before quitting
+        if self.record_writer:
+            self.record_writer.close()
+
         pygame.quit()
         sys.exit()
 
+    def show_leaderboard(self):
+        self.is_showing_leaderboard = True
+        self.leaderboard_page = 0
+        self.load_leaderboard()
+
+    def hide_leaderboard(self):
+        self.is_showing_leaderboard = False
+
+    def change_leaderboard_order(self):
+        orders = self.LEADERBOARD_ORDERS
+
+        self.leaderboard_order = orders[
+            (orders.index(self.leaderboard_order) + 1) % len(orders)
+        ]
+        self.leaderboard_page = 0
+        self.load_leaderboard()
+
+    def change_leaderboard_page(self, step: int):
+        # Only all the records have pages and the next
+        # page is loaded if the current page is full
+        if self.leaderboard_order != "all" or self.leaderboard_records is None:
+            return
+
+        if step > 0 and len(self.leaderboard_records) < conf.LEADERBOARD_SIZE:
+            return
+
+        if self.leaderboard_page + step < 0:
+            return
+
+        self.leaderboard_page += step
+        self.load_leaderboard()
+
+    def load_leaderboard(self):
+        # The records are read by the writer thread after
+        # the queued records are written, so the game
+        # doesn't wait for the disk
+        self.leaderboard_records = None
+        self.__leaderboard_loads += 1
+
+        if not self.record_writer:
+            self.leaderboard_records = []
+            self.__leaderboard_future = None
+            return
+
+        size = conf.LEADERBOARD_SIZE
+        order = self.leaderboard_order
+
+        if order == "all":
+            offset = self.leaderboard_page * size
+            task = lambda db: list(db.iter_records(offset, size))
+        else:
+            task = lambda db: db.top(size, order)
+
+        self.__leaderboard_future = self.record_writer.submit(task)
+
     def toggle_mute(self):
         self.is_muted = not self.is_muted
 
@@ -245,11 +589,9 @@ class Game:
         self.__sprint_event(conf.SPRINT_ACTION_DURATION_IN_MS)
         self.__shield_event(conf.SPRINT_ACTION_DURATION_IN_MS + 5000)
 
-    def draw_main_menu(self):
-        font = pygame.font.Font(None, conf.MAIN_MENU_FONT_SIZE)
-
+    def build_main_menu(self, screen: Screen):
         # Draw background
-        self.surface.blit(assets.MENU_BG, (0, 0))
+        screen.add_image(assets.MENU_BG, (0, 0))
 
         # Set x center position
         x_center_pos = conf.SCREEN_WIDTH / 2
@@ -259,7 +601,7 @@ class Game:
         logo_rect.center = (x_center_pos, conf.SCREEN_HEIGHT / 7)
 
         # Draw logo
-        self.surface.blit(assets.LOGO, logo_rect)
+        screen.add_image(assets.LOGO, logo_rect)
 
         # Set play button
         play_btn = Button(
@@ -270,10 +612,7 @@ class Game:
             centerized=True,
         )
 
-        play_btn.draw(self.surface)
-
-        if play_btn.is_clicked():
-            self.start()
+        screen.add_button(play_btn, self.start)
 
         # Set sound button
         sound_btn = Button(
@@ -286,14 +625,11 @@ class Game:
             centerized=True,
         )
 
-        sound_btn.draw(self.surface)
-
-        if sound_btn.is_clicked():
-            self.toggle_mute()
+        screen.add_button(sound_btn, self.toggle_mute)
 
         # Set guide text
         guide_text = Text(
-            font=font,
+            font_size=conf.MAIN_MENU_FONT_SIZE,
             x=x_center_pos,
             y=conf.SCREEN_HEIGHT - 50,
             color=conf.MAIN_MENU_TEXT_COLOR,
@@ -304,12 +640,98 @@ class Game:
                 "Attack with spacebar",
                 "Pause with P",
                 "Toggle mute with M",
+                "Show leaderboard with L",
             ],
         )
 
-        guide_text.draw(self.surface)
+        screen.add_component(guide_text)
 
-    def draw_pause_prompt(self):
+    def build_leaderboard(self, screen: Screen):
+        # Draw background
+        screen.add_image(assets.MENU_BG, (0, 0))
+
+        x_center_pos = conf.SCREEN_WIDTH / 2
+        size = conf.LEADERBOARD_SIZE
+        records = self.leaderboard_records
+
+        # Set home button
+        home_btn = Button(x=10, y=10, icon=assets.HOME_BUTTON, sizes=(65, 65))
+
+        screen.add_button(home_btn, self.hide_leaderboard)
+
+        # Set title text
+        title_text = Text(
+            font_size=conf.LEADERBOARD_TITLE_FONT_SIZE,
+            x=x_center_pos,
+            y=120,
+            color=conf.LEADERBOARD_TEXT_COLOR,
+            centerized=True,
+            texts=[
+                f"All records, page {self.leaderboard_page + 1}"
+                if self.leaderboard_order == "all"
+                else f"Best {self.leaderboard_order}"
+            ],
+        )
+
+        screen.add_component(title_text)
+
+        # Set records texts, every column has its own texts
+        if records:
+            first_rank = (
+                self.leaderboard_page * size + 1
+                if self.leaderboard_order == "all"
+                else 1
+            )
+
+            columns = [
+                ("#", [str(first_rank + i) for i in range(len(records))]),
+                ("Score", [str(record.score) for record in records]),
+                ("Kills", [str(record.kills) for record in records]),
+                ("Coins", [str(record.coins) for record in records]),
+                ("Date", [record.short_date for record in records]),
+            ]
+            column_x_factors = (0.06, 0.16, 0.33, 0.48, 0.63)
+
+            for (header, texts), x_factor in zip(columns, column_x_factors):
+                column_text = Text(
+                    font_size=conf.LEADERBOARD_FONT_SIZE,
+                    x=conf.SCREEN_WIDTH * x_factor,
+                    y=200,
+                    color=conf.LEADERBOARD_TEXT_COLOR,
+                    texts=[header, *texts],
+                )
+
+                screen.add_component(column_text)
+        else:
+            status_text = Text(
+                font_size=conf.LEADERBOARD_FONT_SIZE,
+                x=x_center_pos,
+                y=conf.SCREEN_HEIGHT / 3,
+                color=conf.LEADERBOARD_TEXT_COLOR,
+                centerized=True,
+                texts=["Loading ..." if records is None else "No records"],
+            )
+
+            screen.add_component(status_text)
+
+        # Set guide text
+        guide_text = Text(
+            font_size=conf.MAIN_MENU_FONT_SIZE,
+            x=x_center_pos,
+            y=conf.SCREEN_HEIGHT - 50,
+            color=conf.MAIN_MENU_TEXT_COLOR,
+            centerized=True,
+            inverse_y_position=True,
+            texts=[
+                "Change the order with TAB",
+                "Change the page with arrow keys",
+                "Back with ESC",
+            ],
+        )
+
+        screen.add_component(guide_text)
+
+    def build_pause_prompt(self, screen: Screen):
         # Define buttons
         resume_btn = Button(x=0, y=0, icon=assets.PLAY_BUTTON, centerized=True)
 
@@ -331,20 +753,14 @@ class Game:
             texts=["Press P to continue"],
         )
 
-        # Draw prompt
-        prompt.draw(self.surface)
+        screen.add_component(prompt)
 
         # Button events
-        if resume_btn.is_clicked():
-            self.resume()
+        screen.add_action(resume_btn, self.resume)
+        screen.add_action(sound_btn, self.toggle_mute)
+        screen.add_action(exit_btn, self.finish)
 
-        if sound_btn.is_clicked():
-            self.toggle_mute()
-
-        if exit_btn.is_clicked():
-            self.finish()
-
-    def draw_game_over_prompt(self):
+    def build_game_over_prompt(self, screen: Screen):
         # Define buttons
         retry_btn = Button(x=0, y=0, icon=assets.RETRY_BUTTON, centerized=True)
 
@@ -366,17 +782,61 @@ class Game:
             ],
         )
 
-        # Draw prompt
-        prompt.draw(self.surface)
+        screen.add_component(prompt)
 
         # Button events
-        if retry_btn.is_clicked():
-            self.start()
+        screen.add_action(retry_btn, self.start)
+        screen.add_action(exit_btn, self.finish)
 
-        if exit_btn.is_clicked():
-            self.finish()
+    def build_game_screen(self, screen: Screen):
+        pause_btn = Button(x=10, y=10, icon=assets.PAUSE_BUTTON, sizes=(65, 65))
+
+        screen.add_button(pause_btn, self.pause)
+
+    def draw_main_menu(self):
+        # The main menu is only rebuilt when the mute state changes
+        self.main_menu_screen.update((self.is_muted,))
+        self.main_menu_screen.draw(self.surface)
+
+    def draw_leaderboard(self):
+        # Take the records if the writer has read them
+        if self.__leaderboard_future is not None and self.__leaderboard_future.done():
+            self.leaderboard_records = (
+                self.__leaderboard_future.result()
+                if self.__leaderboard_future.exception() is None
+                else []
+            )
+            self.__leaderboard_future = None
+
+        self.leaderboard_screen.update(
+            (self.__leaderboard_loads, self.leaderboard_records is not None)
+        )
+        self.leaderboard_screen.draw(self.surface)
+
+    def draw_pause_prompt(self):
+        self.pause_screen.update((self.is_muted,))
+        self.pause_screen.draw(self.surface)
+
+    def draw_game_over_prompt(self):
+        # The last game frame is kept until the writer
+        # tells if the record is a high score
+        if self.__high_score_future is not None:
+            if not self.__high_score_future.done():
+                return
+
+            self.is_reached_high_score = (
+                self.__high_score_future.result()
+                if self.__high_score_future.exception() is None
+                else False
+            )
+            self.__high_score_future = None
+
+        self.game_over_screen.update((self.is_reached_high_score, self.score))
+        self.game_over_screen.draw(self.surface)
+
+    def update_platforms(self):
+        self.__prev_platform_move_y = self.__platform_move_y
 
-    def draw_platforms(self):
         # Increase the y factor by the game speed
         self.__platform_move_y += self.speed
 
@@ -388,139 +848,207 @@ class Game:
         if self.__platform_move_y >= conf.PLATFORM_HEIGHT:
             self.__platform_move_y = 0
 
+    def draw_platforms(self):
+        # The platforms are moved back from the current
+        # position to the interpolated position, the moved
+        # distance is wrapped by the platform height because
+        # the platform_move_y may be reset in the last tick
+        moved_y = (
+            self.__platform_move_y - self.__prev_platform_move_y
+        ) % conf.PLATFORM_HEIGHT
+        move_y = self.__platform_move_y - moved_y * (1 - self.interpolation)
+
         # Draw side blocks :
-        # we will start the y position from
-        # the negative of platform height
-        # and increase it by platform height
-        # itself until we reach screen height
-        for y in range(-conf.PLATFORM_HEIGHT, conf.SCREEN_HEIGHT, conf.PLATFORM_HEIGHT):
-            # Right platform
-            self.surface.blit(
-                pygame.transform.flip(assets.PLATFORM, flip_x=True, flip_y=False),
-                (conf.SCREEN_WIDTH - conf.PLATFORM_WIDTH, y + self.__platform_move_y),
-            )
+        # the platform strips are one platform taller than
+        # the screen, so we will start the y position from
+        # the negative of platform height and move it down
+        # by the move_y
+        y = move_y - conf.PLATFORM_HEIGHT
 
-            # Left platform
-            self.surface.blit(
-                assets.PLATFORM,
-                (0, y + self.__platform_move_y),
+        self.surface.blit(assets.LEFT_PLATFORM_STRIP, (0, y))
+        self.surface.blit(
+            assets.RIGHT_PLATFORM_STRIP,
+            (conf.SCREEN_WIDTH - assets.RIGHT_PLATFORM_STRIP.get_width(), y),
+        )
+
+    def generate_spawns(self):
+        # Endless stream of the spawns, every spawn is generated
+        # a few spawns before it happens, so the sprite class is
+        # picked with the table of the difficulty tier of that time
+        while True:
+            yield SpawnEntry(
+                distance_offset=self.random.spawn.random(),
+                sprite_class=self.spawn_table.sample(self.random.spawn),
+                lane=self.random.placement.choice(LANES),
             )
 
     def spawn_sprite(self):
-        sprite = random_choices(self.SPRITE_CLASSES, self.SPRITE_DROP_WEIGHTS)[0]()
+        spawn = self.spawn_schedule.pop()
+
+        sprite = self.sprite_pool.acquire(
+            spawn.sprite_class, self.random.placement, spawn.lane
+        )
+        self.__last_sprite = sprite
+
+        if self.sprite_store is not None:
+            self.sprite_store.add(sprite)
 
         self.SPRITES.add(sprite)
+        self.LANES.add(sprite)
+
+    def collide_with_enemy(self, enemy: Enemy):
+        # If player is not attacking, the enemy
+        # hits him like an obstacle
+        if not self.player.is_attacking:
+            self.collide_with_obstacle(enemy)
+            return
+
+        # increment the score and kills if wasn't dead
+        if not enemy.is_dead:
+            self.increment_score(conf.ENEMY_KILL_SCORE)
+            self.increment_kill()
+
+        # and kill the enemy
+        enemy.die()
+
+    def collide_with_coin(self, coin: Coin):
+        # increment the coins by the coin count
+        self.increment_coins(coin.count)
+        # and remove the sprite
+        coin.kill()
+
+    def collide_with_sprint(self, sprint: Sprint):
+        # If player was not sprinting
+        if not self.player.is_sprinting:
+            # do the sprint action
+            self.sprint_action()
+            # and remove the sprite
+            sprint.kill()
+
+    def collide_with_score_boost(self, score_boost: ScoreBoost):
+        # If game was not score boosted
+        if not self.is_score_boosted:
+            # do the score boost action
+            self.score_boost_action()
+            # and remove the sprite
+            score_boost.kill()
+
+    def collide_with_shield(self, shield: Shield):
+        # If player was not shielded
+        if not self.player.is_shielded:
+            # do the shield action
+            self.shield_action()
+            # and remove the sprite
+            shield.kill()
+
+    def collide_with_health(self, health: Health):
+        # heal
+        self.player.heal()
+        # and remove the sprite
+        health.kill()
+
+    def collide_with_obstacle(self, sprite: Sprite):
+        # If player is shielded or got hit or the sprite
+        # is impacted, do nothing
+        if self.player.is_shielded or self.player.is_hit or sprite.is_impacted:
+            return
+
+        # otherwise we will hit the player
+        self.player.hit()
+        # impacted the sprite
+        sprite.impact()
+
+        # and if the lives were less than 1
+        if self.player.lives < 1:
+            # game is over
+            self.game_over()
+
+    def get_collision_handler(self, sprite_class: type):
+        # The handler of the nearest base class is used
+        # and it is cached for the sprite class
+        if sprite_class not in self.__collision_handlers:
+            self.__collision_handlers[sprite_class] = next(
+                (
+                    self.COLLISION_HANDLERS[base_class]
+                    for base_class in sprite_class.__mro__
+                    if base_class in self.COLLISION_HANDLERS
+                ),
+                "collide_with_obstacle",
+            )
+
+        return getattr(self, self.__collision_handlers[sprite_class])
 
     def update_sprites(self):
+        next_spawn = self.spawn_schedule.next_entry
+        last_sprite = self.__last_sprite
+
         # If the sprites on the screen was less than
-        # the maximum value
-        if len(self.SPRITES) < self.MAXIMUM_SPRITES:
-            # we will set the add sprite flag to true
-            can_add_sprite = True
-
-            # and if there is a sprite
-            if self.SPRITES:
-                last_sprite = self.SPRITES.sprites()[-1]
-
-                # and if there is not enough space after the
-                # last sprite, we won't spawn another sprite,
-                # and the distance factor will be calculated with
-                # a random value between current distance factor
-                # and maximum distance factor
-                if last_sprite.y + last_sprite.height < last_sprite.height * randint(
-                    int(self.SPRITE_DISTANCE_FACTOR), conf.MAX_SPRITES_DISTANCE_FACTOR
-                ):
-                    can_add_sprite = False
-
-            # Add sprite if we can
-            if can_add_sprite:
+        # the maximum value and there is a scheduled spawn
+        if len(self.SPRITES) < self.MAXIMUM_SPRITES and next_spawn is not None:
+            # we will spawn it if the last sprite is killed or
+            # there is enough space after the last sprite, the
+            # space is the current distance factor and the offset
+            # of the spawn, that is less than a sprite height
+            if (
+                last_sprite is None
+                or not last_sprite.alive()
+                or last_sprite.y + last_sprite.height
+                >= last_sprite.height
+                * (int(self.SPRITE_DISTANCE_FACTOR) + next_spawn.distance_offset)
+            ):
                 self.spawn_sprite()
 
-        # Loop through all sprites
-        for sprite in self.SPRITES:
-            # Draw, update and animate
-            sprite.draw(self.surface)
-            sprite.update(self.speed)
-            sprite.change_animation()
-
-            # Collision check
-            if self.player.collision_rect.colliderect(sprite.rect):
-                # If player attacked an enemy
-                if self.player.is_attacking and isinstance(sprite, Enemy):
-                    # increment the score and kills if wasn't dead
-                    if not sprite.is_dead:
-                        self.increment_score(conf.ENEMY_KILL_SCORE)
-                        self.increment_kill()
-
-                    # and kill the enemy
-                    sprite.die()
-
-                # If player got a coin
-                elif isinstance(sprite, Coin):
-                    # increment the coins by the coin count
-                    self.increment_coins(sprite.count)
-                    # and remove the sprite
-                    sprite.kill()
-
-                # If player got a sprint item
-                elif isinstance(sprite, Sprint):
-                    # and player was not sprinting
-                    if not self.player.is_sprinting:
-                        # do the sprint action
-                        self.sprint_action()
-                        # and remove the sprite
-                        sprite.kill()
-
-                # If player got a sprint item
-                elif isinstance(sprite, ScoreBoost):
-                    # and game was not score boosted
-                    if not self.is_score_boosted:
-                        # do the score boost action
-                        self.score_boost_action()
-                        # and remove the sprite
-                        sprite.kill()
-
-                # If player got a sprint item
-                elif isinstance(sprite, Shield):
-                    # and player was not shielded
-                    if not self.player.is_shielded:
-                        # do the shield action
-                        self.shield_action()
-                        # and remove the sprite
-                        sprite.kill()
-
-                # If player got an health item
-                elif isinstance(sprite, Health):
-                    # heal
-                    self.player.heal()
-                    # and remove the sprite
-                    sprite.kill()
-
-                # If player is shielded or got hit or the sprite is impacted
-                elif (
-                    self.player.is_shielded or self.player.is_hit or sprite.is_impacted
-                ):
-                    # do nothing
-                    pass
-
-                # Player got hit by an obstacle or enemy
-                else:
-                    # we will hit the player
-                    self.player.hit()
-                    # impacted the sprite
-                    sprite.impact()
-
-                    # and if the lives were less than 1
-                    if self.player.lives < 1:
-                        # game is over
-                        self.game_over()
-
-            # If the sprite went out of the screen
-            # we will delete the sprite and remove it
-            # and also increase the score
-            if sprite.y > conf.SCREEN_HEIGHT + conf.PLATFORM_HEIGHT:
-                sprite.kill()
-                self.increment_score(conf.OBSTACLE_PASSING_SCORE)
+        # Update and animate all the sprites at once if
+        # they are in the store, only the dead enemies
+        # are animated by themselves
+        if self.sprite_store is not None:
+            self.sprite_store.update(self.speed)
+
+            for sprite in self.sprite_store.animate():
+                sprite.update_rect()
+
+            for sprite in self.sprite_store.get_self_animated_sprites():
+                sprite.change_animation()
+
+        # otherwise loop through all sprites
+        else:
+            for sprite in self.SPRITES:
+                # Update and animate
+                sprite.update(self.speed)
+                sprite.change_animation()
+
+        # Only the sprites in the lanes and the y band
+        # of the player are checked for collision
+        self.LANES.sort()
+
+        # and then their masks are checked if the
+        # collisions are pixel perfect
+        if conf.PIXEL_PERFECT_COLLISION:
+            for sprite in self.LANES.get_colliding_sprites(self.player.rect):
+                if self.player.is_colliding(sprite):
+                    self.get_collision_handler(type(sprite))(sprite)
+        else:
+            for sprite in self.LANES.get_colliding_sprites(self.player.collision_rect):
+                self.get_collision_handler(type(sprite))(sprite)
+
+        # If the sprite went out of the screen
+        # we will delete the sprite and remove it
+        # and also increase the score, the sprites in
+        # the store that went out are found at once
+        if self.sprite_store is not None:
+            sprites_below = self.sprite_store.get_sprites_below(
+                conf.SCREEN_HEIGHT + conf.PLATFORM_HEIGHT
+            )
+        else:
+            sprites_below = [
+                sprite
+                for sprite in self.SPRITES
+                if sprite.y > conf.SCREEN_HEIGHT + conf.PLATFORM_HEIGHT
+            ]
+
+        for sprite in sprites_below:
+            sprite.kill()
+            self.increment_score(conf.OBSTACLE_PASSING_SCORE)
 
         # Increase max sprites on screen value
         if self.MAXIMUM_SPRITES < conf.MAX_SPRITES_ON_SCREEN:
@@ -530,12 +1058,14 @@ class Game:
         if self.SPRITE_DISTANCE_FACTOR > conf.MIN_SPRITES_DISTANCE_FACTOR:
             self.SPRITE_DISTANCE_FACTOR -= conf.SPRITES_DISTANCE_DECREMENT_FACTOR
 
+    def draw_sprites(self):
+        for sprite in self.SPRITES:
+            self.mark_dirty(sprite.draw(self.surface, self.interpolation))
+
     def draw_game_bg(self):
         self.surface.blit(assets.GAME_BG, (0, 0))
 
     def draw_stats_ui(self):
-        font = pygame.font.Font(None, conf.GAME_STATS_ICON_SIZE)
-
         stats = [
             {
                 "text": str(self.player.lives),
@@ -560,7 +1090,6 @@ class Game:
 
         for i, stat in enumerate(stats):
             self.__draw_game_stats_ui(
-                font=font,
                 text=stat["text"],
                 icon=stat["icon"],
                 position=(
@@ -581,16 +1110,114 @@ class Game:
             )
 
     def draw_pause_button(self):
-        pause_btn = Button(x=10, y=10, icon=assets.PAUSE_BUTTON, sizes=(65, 65))
+        self.game_screen.update()
+        self.game_screen.draw(self.surface)
+
+    def draw_debug_stats(self):
+        debug_text = Text(
+            font_size=conf.DEBUG_STATS_FONT_SIZE,
+            x=conf.PLATFORM_WIDTH + 10,
+            y=10,
+            color=conf.DEBUG_STATS_TEXT_COLOR,
+            texts=self.debug_stats,
+            margin_between_texts=5,
+        )
+
+        debug_text.draw(self.surface)
+
+    def apply_input(self, game_input: str):
+        # The inputs are recorded with the tick
+        # that they are applied before
+        if self.replay_recorder is not None:
+            self.replay_recorder.record(self.total_ticks, self.INPUTS.index(game_input))
+
+        match game_input:
+            case "right":
+                self.player.jump(to_right=True, to_left=False)
+
+            case "left":
+                self.player.jump(to_right=False, to_left=True)
+
+            case "attack":
+                self.player.attack()
+
+            case "release_attack":
+                self.player.disable_attack()
+
+    def step(self, inputs: tuple[str] = ()):
+        # This method runs one tick of the game
+        # simulation without any drawing
+        if not self.is_playing:
+            return
+
+        for game_input in inputs:
+            self.apply_input(game_input)
+
+        self.total_ticks += 1
+
+        self.update_platforms()
+
+        # Update player
+        self.player.update(self.player_jump_speed)
+        self.player.change_animation(self.speed)
+
+        # Update sprites
+        self.update_sprites()
 
-        pause_btn.draw(self.surface)
+        # Update game speed
+        self.update_speed()
 
-        if pause_btn.is_clicked():
-            self.pause()
+        # Update abilities
+        self.update_ability_timers()
+
+    def update(self, elapsed_time: float):
+        # Run the game ticks for the elapsed time in milliseconds,
+        # the remaining time is kept for the next frames
+        self.ticks = 0
+
+        if not self.is_playing:
+            self.__tick_accumulator = 0.0
+            self.interpolation = 1.0
+            return
+
+        self.__tick_accumulator += elapsed_time * conf.TICK_RATE / 1000
+
+        # If the game is too far behind, the extra
+        # ticks are dropped and the game is slowed down
+        self.__tick_accumulator = min(
+            self.__tick_accumulator, conf.MAX_TICKS_PER_FRAME
+        )
+
+        while self.__tick_accumulator >= 1 and self.is_playing:
+            self.step()
+            self.ticks += 1
+            self.__tick_accumulator -= 1
+
+        self.interpolation = self.__tick_accumulator if self.is_playing else 1.0
+
+    def draw_game(self):
+        # This method draws the current state of the game
+        self.draw_game_bg()
+        self.draw_platforms()
+
+        self.mark_dirty(self.player.draw(self.surface, self.interpolation))
+        self.draw_sprites()
+
+        # Draw stats UI
+        self.draw_stats_ui()
+        self.draw_ability_icon()
+
+        # Draw pause button
+        self.draw_pause_button()
 
     def update_screen(self):
+        is_game_frame = False
+
         if not self.is_started:
-            self.draw_main_menu()
+            if self.is_showing_leaderboard:
+                self.draw_leaderboard()
+            else:
+                self.draw_main_menu()
 
         elif self.is_game_over:
             self.draw_game_over_prompt()
@@ -599,27 +1226,17 @@ class Game:
             self.draw_pause_prompt()
 
         else:
-            # Update game screen
-            self.draw_game_bg()
-            self.draw_platforms()
+            is_game_frame = True
 
-            # Update player
-            self.player.draw(self.surface)
-            self.player.update(self.player_jump_speed)
-            self.player.change_animation(self.speed)
+            self.draw_game()
 
-            # Update sprites
-            self.update_sprites()
+        # Count the flips saved in this frame
+        self.saved_flips = assets.reset_frame_flip_stats()
 
-            # Update game speed
-            self.update_speed()
+        if conf.SHOW_DEBUG_STATS:
+            self.draw_debug_stats()
 
-            # Draw stats UI
-            self.draw_stats_ui()
-            self.draw_ability_icon()
-
-            # Draw pause button
-            self.draw_pause_button()
+        self.dirty_rects = self.__collect_dirty_rects(is_game_frame)
 
     def update_music(self):
         if self.is_muted or self.is_game_over:
@@ -633,27 +1250,38 @@ class Game:
             if event.type == pygame.QUIT:
                 self.quit()
 
-            if event.type == self.SHIELD_DISABLE_EVENT:
-                self.player.disable_shield()
-
-            if event.type == self.SCORE_BOOST_DISABLE_EVENT:
-                self.is_score_boosted = False
-
-            if event.type == self.SPRINT_DISABLE_EVENT:
-                self.player.disable_sprint()
+            # Left mouse button clicks on the current screen buttons
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                self.current_screen.click(event.pos)
 
             if event.type == pygame.KEYDOWN:
                 match event.key:
                     case pygame.K_m:
                         self.toggle_mute()
 
-                if not self.is_started:
+                if not self.is_started and self.is_showing_leaderboard:
+                    match event.key:
+                        case pygame.K_ESCAPE:
+                            self.hide_leaderboard()
+
+                        case pygame.K_TAB:
+                            self.change_leaderboard_order()
+
+                        case pygame.K_LEFT:
+                            self.change_leaderboard_page(-1)
+
+                        case pygame.K_RIGHT:
+                            self.change_leaderboard_page(1)
+                elif not self.is_started:
                     match event.key:
                         case pygame.K_ESCAPE:
                             self.quit()
 
                         case pygame.K_SPACE:
                             self.start()
+
+                        case pygame.K_l:
+                            self.show_leaderboard()
                 elif self.is_paused:
                     match event.key:
                         case pygame.K_ESCAPE:
@@ -671,13 +1299,13 @@ class Game:
                 else:
                     match event.key:
                         case pygame.K_RIGHT:
-                            self.player.jump(to_right=True, to_left=False)
+                            self.apply_input("right")
 
                         case pygame.K_LEFT:
-                            self.player.jump(to_right=False, to_left=True)
+                            self.apply_input("left")
 
                         case pygame.K_SPACE:
-                            self.player.attack()
+                            self.apply_input("attack")
 
                         case pygame.K_p:
                             self.pause()
@@ -686,4 +1314,4 @@ class Game:
                 if self.is_playing:
                     match event.key:
                         case pygame.K_SPACE:
-                            self.player.disable_attack()
+                            self.apply_input("release_attack")
@@ -0,0 +1,191 @@
+import argparse, gc, sys, time
+from random import Random
+from db.record import Record
+from .game import Game
+from .sprites.pool import SpritePool
+from .sprites.spawn_table import AliasTable
+from .sprites.sprite import Sprite
+
+# Values that are read on every tick for every sprite
+SPRITE_VALUES = ("x", "y", "side", "current_model")
+# Date of the loaded records, so the current date isn't made for them
+RECORD_DATE = "Sat Jan  1 00:00:00 2000"
+
+
+def make_dict_class(slotted_class: type):
+    # The same class with a dict instead of slots, it only
+    # works for the classes without slotted base classes
+    namespace = {
+        name: value
+        for name, value in vars(slotted_class).items()
+        if name not in slotted_class.__slots__ and name != "__slots__"
+    }
+
+    return type(slotted_class.__name__, slotted_class.__bases__, namespace)
+
+
+def get_slots(instance):
+    # Slots of the instance and its base classes
+    return tuple(
+        name
+        for cls in type(instance).__mro__
+        for name in cls.__dict__.get("__slots__", ())
+    )
+
+
+class DictSprite:
+    # A sprite with all the values of a slotted sprite in its dict,
+    # with its own groups set of the pygame sprite, the side and the
+    # model are found on every access as the sprites did before
+    # keeping them in slots
+    def __init__(self, sprite: Sprite) -> None:
+        for name, value in vars(sprite).items():
+            setattr(self, name, set(value))
+
+        for name in get_slots(sprite):
+            if name not in ("current_model", "side"):
+                setattr(self, name, getattr(sprite, name))
+
+    @property
+    def current_model(self):
+        return self.models[int(self.model_index)]
+
+    @property
+    def side(self):
+        return Sprite.get_side(self.x)
+
+
+def get_dict_size(instance):
+    # Size of the dict of the instance and the sets in it, i.e. the
+    # groups of a pygame sprite, the other values are shared
+    if not hasattr(instance, "__dict__"):
+        return 0
+
+    return sys.getsizeof(instance.__dict__) + sum(
+        sys.getsizeof(value)
+        for value in vars(instance).values()
+        if isinstance(value, set)
+    )
+
+
+def get_instance_size(instance):
+    return sys.getsizeof(instance) + get_dict_size(instance)
+
+
+def time_access(instances: list, names: tuple[str], repeat: int):
+    # Nanoseconds of reading one value
+    start_time = time.perf_counter()
+
+    for _ in range(repeat):
+        for instance in instances:
+            for name in names:
+                getattr(instance, name)
+
+    elapsed_time = time.perf_counter() - start_time
+
+    return elapsed_time * 1e9 / (repeat * len(instances) * len(names))
+
+
+def time_load(record_class: type, count: int):
+    # The records and the seconds of loading them
+    gc.collect()
+    start_time = time.perf_counter()
+
+    records = [
+        record_class(score=i % 500, kills=i % 50, coins=i % 200, date=RECORD_DATE)
+        for i in range(count)
+    ]
+
+    return records, time.perf_counter() - start_time
+
+
+def bench_sprites(count: int, repeat: int):
+    pool = SpritePool()
+    rng = Random(0)
+    sprites = [pool.acquire(rng.choice(Game.SPRITE_CLASSES), rng) for _ in range(count)]
+    dict_sprites = [DictSprite(sprite) for sprite in sprites]
+
+    lines = [f"{count} live sprites :"]
+
+    for name, instances in (("slots", sprites), ("dict", dict_sprites)):
+        size = sum(get_instance_size(instance) for instance in instances) / count
+        access_time = time_access(instances, SPRITE_VALUES, repeat)
+
+        lines.append(
+            f"  {name:<6}{size:>8.0f} bytes per sprite"
+            f"{access_time:>8.1f} ns per value read"
+        )
+
+    # The pygame sprite has no slots, so every sprite keeps a dict
+    dict_size = sum(get_dict_size(sprite) for sprite in sprites) / count
+    lines.append(f"  the slotted sprites have{dict_size:>5.0f} bytes of pygame dict")
+
+    return lines
+
+
+def bench_records(count: int, repeat: int):
+    lines = [f"{count} loaded records :"]
+
+    for name, record_class in (("slots", Record), ("dict", make_dict_class(Record))):
+        records, load_time = time_load(record_class, count)
+        size = sum(get_instance_size(record) for record in records) / count
+        access_time = time_access(records[: count // 10], Record.HEADERS, repeat)
+
+        lines.append(
+            f"  {name:<6}{size:>8.0f} bytes per record"
+            f"{access_time:>8.1f} ns per value read"
+            f"{load_time:>8.2f} seconds to load"
+        )
+
+        del records
+
+    return lines
+
+
+def bench_spawns(count: int, repeat: int):
+    # The spawns were picked by random.choices before the alias tables
+    items, weights = Game.SPRITE_CLASSES, Game.SPRITE_DROP_WEIGHTS
+    table = AliasTable(items, weights)
+    rng = Random(0)
+
+    lines = [f"{count} sampled spawns :"]
+
+    for name, sample in (
+        ("alias", lambda: table.sample(rng)),
+        ("choices", lambda: rng.choices(items, weights)[0]),
+    ):
+        best_time = float("inf")
+
+        for _ in range(repeat):
+            start_time = time.perf_counter()
+
+            for _ in range(count):
+                sample()
+
+            best_time = min(best_time, time.perf_counter() - start_time)
+
+        lines.append(f"  {name:<8}{best_time * 1e9 / count:>8.1f} ns per spawn")
+
+    return lines
+
+
+def main(args: list[str] = None):
+    parser = argparse.ArgumentParser(
+        prog="python -m game.microbench",
+        description="Compare the slotted classes and the spawn sampling",
+    )
+    parser.add_argument("--sprites", type=int, default=5000)
+    parser.add_argument("--records", type=int, default=1000000)
+    parser.add_argument("--spawns", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(args)
+
+    lines = bench_sprites(args.sprites, args.repeat)
+    lines += [""] + bench_records(args.records, args.repeat)
+    lines += [""] + bench_spawns(args.spawns, args.repeat)
+
+    print("\n".join(lines))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,4 +1,4 @@
-from pygame import Surface, transform, Rect
+from pygame import Surface, Rect
 from config import conf
 from .assets import (
     PLAYER_RUN_MODELS,
@@ -6,10 +6,39 @@ from .assets import (
     PLAYER_JUMP_MODELS,
     PLAYER_SHIELD_EFFECTS,
     PLAYER_HIT_EFFECTS,
+    PLAYER_POSES,
+    PLAYER_POSE_MASKS,
+    PLAYER_SHIELD_OFFSETS,
 )
 
 
 class Player:
+    # The player values are kept in slots instead of a dict
+    __slots__ = (
+        "__jump_speed",
+        "model_index",
+        "shield_effect_index",
+        "hit_effect_index",
+        "is_jumping",
+        "is_attacking",
+        "is_disabling_attack",
+        "is_shielded",
+        "is_sprinting",
+        "is_hit",
+        "lives",
+        "jump_dir",
+        "angle",
+        "shield_effects",
+        "hit_effects",
+        "animation",
+        "models",
+        "side",
+        "rect",
+        "right_pos",
+        "left_pos",
+        "prev_x",
+    )
+
     def __init__(self, jump_speed: float) -> None:
         self.__jump_speed = jump_speed
         self.model_index = 0
@@ -27,6 +56,8 @@ class Player:
         self.shield_effects = PLAYER_SHIELD_EFFECTS
         self.hit_effects = PLAYER_HIT_EFFECTS
 
+        self.__update_animation()
+
         # Set the player position
         self.rect = self.current_model.get_rect()
         self.right_pos = (
@@ -41,14 +72,24 @@ class Player:
         self.rect.y = conf.PLAYER_Y_POS
         self.rect.x = self.right_pos
 
-    @property
-    def models(self):
+        self.__update_side()
+
+        # X position before the last update
+        self.prev_x = self.rect.x
+
+    def __update_animation(self):
+        # The animation and its models only change when
+        # the player attacks or jumps, so they are kept
+        # until one of them is changed
         if self.is_attacking:
-            return PLAYER_ATTACK_MODELS
+            self.animation = "attack"
+            self.models = PLAYER_ATTACK_MODELS
         elif self.is_jumping:
-            return PLAYER_JUMP_MODELS
+            self.animation = "jump"
+            self.models = PLAYER_JUMP_MODELS
         else:
-            return PLAYER_RUN_MODELS
+            self.animation = "run"
+            self.models = PLAYER_RUN_MODELS
 
     @property
     def current_model(self):
@@ -62,17 +103,21 @@ class Player:
     def current_shield_effect(self):
         return self.shield_effects[int(self.shield_effect_index)]
 
-    @property
-    def side(self):
-        # This property shows that the player is
+    def __update_side(self):
+        # This method sets that the player is
         # on which side of platforms, the right or
-        # the left
+        # the left, the side only changes when the
+        # player moves
         if self.rect.x <= self.left_pos:
-            return "left"
+            self.side = "left"
         elif self.rect.x >= self.right_pos:
-            return "right"
+            self.side = "right"
         else:
-            return "center"
+            self.side = "center"
+
+    @property
+    def is_facing_left(self):
+        return self.side == "left" or self.jump_dir == "left"
 
     @property
     def jump_speed(self):
@@ -114,39 +159,55 @@ class Player:
 
         return collision_rect
 
-    def __rotate_model(self, model: Surface):
-        return transform.flip(
-            transform.rotate(model, self.angle),
-            self.side == "left" or self.jump_dir == "left",
-            False,
+    @property
+    def current_mask(self):
+        # Collision mask of the drawn player pose
+        return PLAYER_POSE_MASKS[
+            (self.animation, int(self.model_index), self.angle, self.is_facing_left)
+        ]
+
+    def is_colliding(self, sprite):
+        # The rects must be colliding already, so
+        # only the masks of them are checked here
+        return (
+            self.current_mask.overlap(
+                sprite.current_mask,
+                (sprite.rect.x - self.rect.x, sprite.rect.y - self.rect.y),
+            )
+            is not None
         )
 
-    def __draw_player(self, surface: Surface):
-        surface.blit(
-            self.__rotate_model(self.current_model),
-            self.rect,
+    def __get_pose(self, animation: str, frame_index: float):
+        return PLAYER_POSES[
+            (animation, int(frame_index), self.angle, self.is_facing_left)
+        ]
+
+    def __get_draw_position(self, interpolation: float):
+        # Move back from the current position to the position
+        # between the previous and the current update
+        return (
+            self.rect.x - (self.rect.x - self.prev_x) * (1 - interpolation),
+            self.rect.y,
         )
 
-    def __draw_shield(self, surface: Surface):
-        current_shield_model = self.__rotate_model(self.current_shield_effect)
-
-        x_pos = (
-            self.rect.x - conf.PLAYER_FOOT_MARGIN
-            if self.side == "left"
-            else self.rect.x + conf.PLAYER_FOOT_MARGIN
+    def __draw_player(self, surface: Surface, position: tuple[float]):
+        return surface.blit(
+            self.__get_pose(self.animation, self.model_index),
+            position,
         )
 
-        y_pos = self.rect.y + conf.PLAYER_FOOT_MARGIN
+    def __draw_shield(self, surface: Surface, position: tuple[float]):
+        x_offset, y_offset = PLAYER_SHIELD_OFFSETS[self.side]
 
-        surface.blit(
-            current_shield_model,
-            (x_pos, y_pos),
+        return surface.blit(
+            self.__get_pose("shield", self.shield_effect_index),
+            (position[0] + x_offset, position[1] + y_offset),
         )
 
-    def __draw_hit(self, surface: Surface):
-        surface.blit(
-            self.__rotate_model(self.current_hit_effect),
-            self.rect,
+    def __draw_hit(self, surface: Surface, position: tuple[float]):
+        return surface.blit(
+            self.__get_pose("hit", self.hit_effect_index),
+            position,
         )
 
     def jump(self, to_left: bool, to_right: bool):
@@ -160,6 +221,8 @@ class Player:
             self.model_index = 0
             self.angle = 0
 
+            self.__update_animation()
+
             # Setting the jump direction
             if to_left:
                 self.jump_dir = "left"
@@ -174,10 +237,14 @@ class Player:
             self.is_disabling_attack = False
             self.model_index = 0
 
+            self.__update_animation()
+
     def reset_attack(self):
         self.is_attacking = False
         self.model_index = 0
 
+        self.__update_animation()
+
     def disable_attack(self):
         if self.is_attacking:
             self.is_disabling_attack = True
@@ -189,6 +256,8 @@ class Player:
             self.jump_dir = None
             self.angle = 90
 
+            self.__update_animation()
+
     def shield(self):
         self.is_shielded = True
 
@@ -217,6 +286,8 @@ class Player:
         if new_jump_speed is not None:
             self.__jump_speed = new_jump_speed
 
+        self.prev_x = self.rect.x
+
         # If the player is jumping
         if self.is_jumping:
             # and the jump direction is left and he is
@@ -235,19 +306,25 @@ class Player:
             else:
                 self.disable_jump()
 
-    def draw(self, surface: Surface):
+            self.__update_side()
+
+    def draw(self, surface: Surface, interpolation: float = 1.0):
+        # This method returns the changed area of the surface
+        position = self.__get_draw_position(interpolation)
+
         # Draw shield effect
         if self.is_shielded:
-            self.__draw_player(surface)
-            self.__draw_shield(surface)
+            return self.__draw_player(surface, position).union(
+                self.__draw_shield(surface, position)
+            )
 
         # Draw hit effect
         elif self.is_hit:
-            self.__draw_hit(surface)
+            return self.__draw_hit(surface, position)
 
         # Draw player
         else:
-            self.__draw_player(surface)
+            return self.__draw_player(surface, position)
 
     def change_animation(self, current_game_speed: float):
         # If there is more than one image on the player
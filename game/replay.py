@@ -0,0 +1,171 @@
+import os, sys, time
+from config import conf
+
+# File layout:
+# magic, then varints of the seed, the ticks count,
+# the inputs count and the inputs, every input is a
+# varint of its delta ticks from the previous input
+# and its index in the game inputs
+MAGIC = b"SHRP01"
+INPUT_BITS = 2
+
+
+def encode_varint(value: int) -> bytes:
+    # Unsigned LEB128, 7 bits in every byte and the high
+    # bit shows that there are more bytes after it
+    data = bytearray()
+
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+
+        if value:
+            data.append(byte | 0x80)
+        else:
+            data.append(byte)
+            return bytes(data)
+
+
+def decode_varint(data: bytes, offset: int) -> tuple[int, int]:
+    # Returns the value and the offset after it
+    value = 0
+    shift = 0
+
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        shift += 7
+
+        if not byte & 0x80:
+            return value, offset
+
+
+class Replay:
+    def __init__(
+        self, seed: int, ticks: int = 0, inputs: list[tuple[int, int]] = None
+    ) -> None:
+        self.seed = seed
+        self.ticks = ticks
+        # List of the (tick, input index) pairs
+        self.inputs = inputs if inputs is not None else []
+
+    def to_bytes(self):
+        data = bytearray(MAGIC)
+        data += encode_varint(self.seed)
+        data += encode_varint(self.ticks)
+        data += encode_varint(len(self.inputs))
+
+        prev_tick = 0
+
+        for tick, input_index in self.inputs:
+            data += encode_varint(((tick - prev_tick) << INPUT_BITS) | input_index)
+            prev_tick = tick
+
+        return bytes(data)
+
+    @classmethod
+    def from_bytes(cls, data: bytes):
+        if not data.startswith(MAGIC):
+            raise ValueError("Not a replay file")
+
+        offset = len(MAGIC)
+        seed, offset = decode_varint(data, offset)
+        ticks, offset = decode_varint(data, offset)
+        inputs_count, offset = decode_varint(data, offset)
+
+        inputs = []
+        tick = 0
+
+        for _ in range(inputs_count):
+            value, offset = decode_varint(data, offset)
+            tick += value >> INPUT_BITS
+            inputs.append((tick, value & ((1 << INPUT_BITS) - 1)))
+
+        return cls(seed, ticks, inputs)
+
+    def save(self, filepath: str):
+        os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+
+        with open(filepath, mode="wb") as replay_file:
+            replay_file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, filepath: str):
+        with open(filepath, mode="rb") as replay_file:
+            return cls.from_bytes(replay_file.read())
+
+    def get_inputs_by_tick(self) -> dict[int, list[int]]:
+        inputs_by_tick = {}
+
+        for tick, input_index in self.inputs:
+            inputs_by_tick.setdefault(tick, []).append(input_index)
+
+        return inputs_by_tick
+
+
+class ReplayRecorder:
+    def __init__(self, seed: int) -> None:
+        self.replay = Replay(seed)
+
+    def record(self, tick: int, input_index: int):
+        # The input is applied before running the tick
+        self.replay.inputs.append((tick, input_index))
+
+    def stop(self, ticks: int):
+        self.replay.ticks = ticks
+
+        return self.replay
+
+
+def get_replay_path(seed: int):
+    # The milliseconds and the seed keep the games that
+    # end in the same second from using the same file
+    now = time.time()
+    name = time.strftime("%Y%m%d-%H%M%S", time.localtime(now))
+    milliseconds = int(now * 1000) % 1000
+
+    return os.path.join(
+        conf.REPLAYS_DIR, f"{name}-{milliseconds:03d}-{seed}{conf.REPLAY_FILE_SUFFIX}"
+    )
+
+
+def play_replay(replay: Replay, game=None):
+    # Runs the replay without rendering and returns the game
+    from .game import Game
+
+    if game is None:
+        game = Game(save_records=False)
+
+    # The played replay isn't recorded again
+    game.start(replay.seed, is_replay=True)
+
+    inputs_by_tick = replay.get_inputs_by_tick()
+
+    for tick in range(replay.ticks):
+        if not game.is_playing:
+            break
+
+        game.step(
+            [Game.INPUTS[input_index] for input_index in inputs_by_tick.get(tick, ())]
+        )
+
+    return game
+
+
+if __name__ == "__main__":
+    # Load the game and its assets before timing the replays
+    from .game import Game
+
+    for replay_path in sys.argv[1:]:
+        replay = Replay.load(replay_path)
+
+        start_time = time.perf_counter()
+        game = play_replay(replay)
+        elapsed_time = time.perf_counter() - start_time
+
+        print(
+            f"{replay_path} : seed {replay.seed}, ticks {game.total_ticks}, "
+            f"score {game.score}, kills {game.kills}, coins {game.coins}, "
+            f"{game.total_ticks / elapsed_time:.0f} ticks per second"
+        )
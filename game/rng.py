@@ -0,0 +1,15 @@
+from random import Random
+
+# Every subsystem has its own random stream, so the
+# random values of one subsystem won't change when
+# another subsystem uses more or less random values
+RANDOM_STREAMS = ("spawn", "placement")
+
+
+class RandomStreams:
+    def __init__(self, seed: int) -> None:
+        self.seed = seed
+
+        # String seeds are hashed the same way in every run
+        for name in RANDOM_STREAMS:
+            setattr(self, name, Random(f"{seed}:{name}"))
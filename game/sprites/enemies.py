@@ -1,5 +1,5 @@
 from .sprite import Sprite
-from pygame import Surface, transform
+from pygame import Surface
 from config import conf
 from ..assets import (
     BRINGER_OF_DEATH_MAIN_MODELS,
@@ -14,11 +14,24 @@ from ..assets import (
     CACODEMON_DEATH_MODELS,
     CACODEMON_MAIN_MODELS,
     SORCERER_MAIN_MODELS,
+    get_oriented_model,
+    get_model_mask,
+    get_layered_model_mask,
 )
 
 
 class Enemy(Sprite):
     DROP_CHANCE = conf.ENEMY_DROP_CHANCE
+    SPAWN_CATEGORY = "enemy"
+
+    __slots__ = (
+        "is_dead",
+        "death_model_index",
+        "main_models",
+        "has_death_model",
+        "death_models",
+        "death_animation_speed",
+    )
 
     def __init__(
         self,
@@ -45,39 +58,64 @@ class Enemy(Sprite):
             animation_speed=animation_speed,
         )
 
+    def reset(self):
+        super().reset()
+
+        self.is_dead = False
+        self.death_model_index = 0
+
     @property
     def current_death_model(self):
         return self.death_models[int(self.death_model_index)]
 
-    def __draw_death_model(self, surface: Surface):
-        surface.blit(
-            transform.flip(
-                self.current_death_model,
-                self.side == "right",
-                False,
-            ),
-            (self.x, self.y),
+    @property
+    def current_mask(self):
+        # The mask of the models that are drawn, the enemy
+        # without its own death models is drawn under them
+        if not self.is_dead:
+            return super().current_mask
+
+        if not self.has_death_model:
+            return get_layered_model_mask(
+                self.current_model, self.current_death_model, self.side == "right"
+            )
+
+        return get_model_mask(self.current_death_model, self.side == "right")
+
+    def __draw_death_model(self, surface: Surface, interpolation: float):
+        return surface.blit(
+            get_oriented_model(self.current_death_model, self.side == "right"),
+            self.get_draw_position(interpolation),
         )
 
     def die(self):
         self.is_dead = True
         self.y_speed = 0
 
-    def draw(self, surface: Surface):
+        # The death models are not animated by the store
+        if self.store is not None:
+            self.store.is_animated[self.slot] = False
+
+    def draw(self, surface: Surface, interpolation: float = 1.0):
         # If the enemy is dead
         if self.is_dead:
             # and if it doesn't have special
             # death model, then draw the enemy itself
+            # and then draw its death models
             if not self.has_death_model:
-                super().draw(surface)
+                return (
+                    super()
+                    .draw(surface, interpolation)
+                    .union(self.__draw_death_model(surface, interpolation))
+                )
 
-            # then draw its death models
-            self.__draw_death_model(surface)
+            # otherwise just draw its death models
+            return self.__draw_death_model(surface, interpolation)
 
         # otherwise
         else:
             # draw it normally
-            super().draw(surface)
+            return super().draw(surface, interpolation)
 
     def change_animation(self):
         # If the enemy is dead
@@ -99,6 +137,8 @@ class Enemy(Sprite):
 
 
 class BringerOfDeath(Enemy):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(
             BRINGER_OF_DEATH_MAIN_MODELS,
@@ -110,36 +150,50 @@ class BringerOfDeath(Enemy):
 
 
 class Hellhound(Enemy):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(HELLHOUND_MAIN_MODELS, y_speed=0.5, animation_speed=0.1)
 
 
 class Ooze(Enemy):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(OOZE_MAIN_MODELS)
 
 
 class Worm(Enemy):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(WORM_MAIN_MODELS)
 
 
 class Ghost(Enemy):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(GHOST_MAIN_MODELS)
 
 
 class Bat(Enemy):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(BAT_MAIN_MODELS, y_speed=0.6, animation_speed=0.1)
 
 
 class Golem(Enemy):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(GOLEM_MAIN_MODELS, animation_speed=0.1)
 
 
 class Cacodemon(Enemy):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(
             CACODEMON_MAIN_MODELS,
@@ -151,6 +205,8 @@ class Cacodemon(Enemy):
 
 
 class Sorcerer(Enemy):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(SORCERER_MAIN_MODELS, animation_speed=0.06)
 
@@ -0,0 +1,103 @@
+import math
+from bisect import bisect_left, insort
+from operator import attrgetter
+from pygame import sprite, Rect
+from config import conf
+
+LANES = ("left", "right")
+
+get_y = attrgetter("y")
+
+
+class LaneGroup(sprite.AbstractGroup):
+    # Sprite group that keeps the sprites of every lane sorted
+    # by their y position, so only the sprites that are in the
+    # y band of a rect are checked for collision with it
+    def __init__(self, *sprites) -> None:
+        self.lanes: dict[str, list] = {lane: [] for lane in LANES}
+
+        # The x reach of every lane and its tallest model, so the
+        # lanes out of a rect are skipped and the y band is known.
+        # The sprites don't move on x, so the reach only grows
+        self.lefts = {lane: math.inf for lane in LANES}
+        self.rights = {lane: -math.inf for lane in LANES}
+        self.max_heights = {lane: 0 for lane in LANES}
+
+        # Sprites are checked in the order that they are added
+        self.__sprite_lanes = {}
+        self.__sprite_orders = {}
+        self.__next_order = 0
+
+        # The abstract group doesn't take the sprites
+        super().__init__()
+        self.add(*sprites)
+
+    @staticmethod
+    def get_lane(sprite):
+        # The sprites are on the edges, so their center shows
+        # their lane even if they are wider than half of it
+        return (
+            "left" if sprite.x + sprite.width / 2 < conf.SCREEN_WIDTH / 2 else "right"
+        )
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+
+        lane = self.get_lane(sprite)
+
+        self.__sprite_lanes[sprite] = lane
+        self.__sprite_orders[sprite] = self.__next_order
+        self.__next_order += 1
+
+        self.lefts[lane] = min(self.lefts[lane], sprite.x)
+        self.rights[lane] = max(
+            self.rights[lane],
+            *(sprite.x + model.get_width() for model in sprite.models),
+        )
+        self.max_heights[lane] = max(
+            self.max_heights[lane], *(model.get_height() for model in sprite.models)
+        )
+
+        insort(self.lanes[lane], sprite, key=get_y)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+
+        self.lanes[self.__sprite_lanes.pop(sprite)].remove(sprite)
+        del self.__sprite_orders[sprite]
+
+    def sort(self):
+        # The sprites are moving with different speeds, but the
+        # lanes are almost sorted and sorting them is fast
+        for lane_sprites in self.lanes.values():
+            lane_sprites.sort(key=get_y)
+
+    def __is_lane_reached(self, lane: str, rect: Rect):
+        # One pixel is added to the reach because the
+        # sprite rects are truncated from the float positions
+        return rect.right > self.lefts[lane] - 1 and rect.left < self.rights[lane] + 1
+
+    def get_colliding_sprites(self, rect: Rect):
+        colliding_sprites = []
+
+        for lane, lane_sprites in self.lanes.items():
+            if not lane_sprites or not self.__is_lane_reached(lane, rect):
+                continue
+
+            # The sprites in the y band of the rect, one pixel is
+            # added to the band because the sprite rects are
+            # truncated from the float positions
+            start = bisect_left(
+                lane_sprites, rect.top - self.max_heights[lane] - 1, key=get_y
+            )
+            end = bisect_left(lane_sprites, rect.bottom + 1, key=get_y)
+
+            for lane_sprite in lane_sprites[start:end]:
+                lane_sprite.sync_rect()
+
+                if rect.colliderect(lane_sprite.rect):
+                    colliding_sprites.append(lane_sprite)
+
+        colliding_sprites.sort(key=self.__sprite_orders.__getitem__)
+
+        return colliding_sprites
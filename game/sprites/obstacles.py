@@ -1,15 +1,14 @@
 from .sprite import Sprite
 from pygame import Surface
 from config import conf
-from ..assets import (
-    DOUBLE_BLOCK_MODEL,
-    SINGLE_BLOCK_MODEL,
-    SPIKE_MODELS,
-    DEAD_BUSH_MODEL,
-)
+from .. import assets
 
 
 class Obstacle(Sprite):
+    SPAWN_CATEGORY = "obstacle"
+
+    __slots__ = ()
+
     def __init__(
         self,
         models: list[Surface],
@@ -24,29 +23,37 @@ class Obstacle(Sprite):
 class SingleBlock(Obstacle):
     DROP_CHANCE = conf.SINGLE_BLOCK_DROP_CHANCE
 
+    __slots__ = ()
+
     def __init__(self):
-        super().__init__([SINGLE_BLOCK_MODEL])
+        super().__init__([assets.SINGLE_BLOCK_MODEL])
 
 
 class DoubleBlock(Obstacle):
     DROP_CHANCE = conf.DOUBLE_BLOCK_DROP_CHANCE
 
+    __slots__ = ()
+
     def __init__(self):
-        super().__init__([DOUBLE_BLOCK_MODEL])
+        super().__init__([assets.DOUBLE_BLOCK_MODEL])
 
 
 class Spike(Obstacle):
     DROP_CHANCE = conf.SPIKE_DROP_CHANCE
 
+    __slots__ = ()
+
     def __init__(self):
-        super().__init__(SPIKE_MODELS, 0.1)
+        super().__init__(assets.SPIKE_MODELS, 0.1)
 
 
 class DeadBush(Obstacle):
     DROP_CHANCE = conf.DEAD_BUSH_DROP_CHANCE
 
+    __slots__ = ()
+
     def __init__(self):
-        super().__init__([DEAD_BUSH_MODEL])
+        super().__init__([assets.DEAD_BUSH_MODEL])
 
 
 obstacles = [SingleBlock, DoubleBlock, Spike, DeadBush]
@@ -0,0 +1,76 @@
+from random import Random
+from config import conf
+from .store import get_unstored_class
+
+
+class SpritePool:
+    # Killed sprites are kept for every sprite class and
+    # they are reset and reused for the next spawns of
+    # that class instead of creating new sprites, the
+    # sprites are made for the store if it is given
+    def __init__(self, store=None) -> None:
+        self.store = store
+        self.created = 0
+        self.acquired = 0
+        self.reused = 0
+        # The free sprites of every class are the keys of a dict, so a
+        # sprite that is released twice is only kept once and the last
+        # released sprite is acquired first
+        self.__free_sprites: dict[type, dict] = {}
+
+    def __len__(self):
+        return sum(len(free_sprites) for free_sprites in self.__free_sprites.values())
+
+    @property
+    def reuse_rate(self):
+        return self.reused / self.acquired if self.acquired else 0.0
+
+    @property
+    def stats(self):
+        return {
+            "size": len(self),
+            "created": self.created,
+            "acquired": self.acquired,
+            "reused": self.reused,
+            "reuse_rate": self.reuse_rate,
+        }
+
+    def __create(self, sprite_class: type, rng: Random, lane: str = None):
+        sprite = sprite_class.spawn(rng, lane, self.store)
+        sprite.pool = self
+        self.created += 1
+
+        return sprite
+
+    def acquire(self, sprite_class: type, rng: Random, lane: str = None):
+        self.acquired += 1
+        free_sprites = self.__free_sprites.get(sprite_class)
+
+        if not free_sprites:
+            return self.__create(sprite_class, rng, lane)
+
+        self.reused += 1
+
+        sprite, _ = free_sprites.popitem()
+        sprite.rng = rng
+        sprite.spawn_lane = lane
+        sprite.reset()
+
+        return sprite
+
+    def release(self, sprite):
+        sprite_class = get_unstored_class(type(sprite))
+        self.__free_sprites.setdefault(sprite_class, {})[sprite] = None
+
+    def prewarm(
+        self, sprite_classes: list[type], count: int = conf.SPRITE_POOL_PREWARM_COUNT
+    ):
+        # The prewarmed sprites are placed again when they are
+        # acquired, so their own random stream doesn't matter
+        rng = Random()
+
+        for sprite_class in sprite_classes:
+            free_sprites = self.__free_sprites.setdefault(sprite_class, {})
+
+            while len(free_sprites) < count:
+                free_sprites[self.__create(sprite_class, rng)] = None
@@ -0,0 +1,55 @@
+from collections import deque
+from typing import Iterable, NamedTuple
+from config import conf
+
+
+class SpawnEntry(NamedTuple):
+    # The space after the distance factor of the game in
+    # sprite heights, the class and the lane of a spawn
+    distance_offset: float
+    sprite_class: type
+    lane: str
+
+
+class SpawnSchedule:
+    # Takes the spawns from a stream of spawn entries a few
+    # spawns before they happen, so the game only compares the
+    # last sprite with the next entry and the upcoming spawns
+    # can be inspected, the stream can be any iterable e.g. a
+    # recorded list of entries and no sprite is spawned after
+    # a finite stream is ended
+    def __init__(
+        self,
+        entries: Iterable[SpawnEntry],
+        look_ahead: int = conf.SPAWN_SCHEDULE_LOOK_AHEAD,
+    ) -> None:
+        self.look_ahead = look_ahead
+        self.upcoming: deque[SpawnEntry] = deque()
+        self.spawned = 0
+        self.__entries = iter(entries)
+
+        self.__fill()
+
+    def __len__(self):
+        return len(self.upcoming)
+
+    def __fill(self):
+        while len(self.upcoming) < self.look_ahead:
+            entry = next(self.__entries, None)
+
+            if entry is None:
+                break
+
+            self.upcoming.append(entry)
+
+    @property
+    def next_entry(self):
+        return self.upcoming[0] if self.upcoming else None
+
+    def pop(self):
+        entry = self.upcoming.popleft()
+        self.spawned += 1
+
+        self.__fill()
+
+        return entry
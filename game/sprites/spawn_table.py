@@ -0,0 +1,92 @@
+from bisect import bisect_right
+from random import Random
+
+
+class AliasTable:
+    # Walker's alias method, every item is picked with
+    # one random number in constant time
+    def __init__(self, items: list, weights: list[float]) -> None:
+        count = len(items)
+        weights = list(weights)
+        total_weight = sum(weights)
+
+        if not count:
+            raise ValueError("Alias table needs at least one item")
+
+        if len(weights) != count:
+            raise ValueError(
+                f"Alias table has {count} items but {len(weights)} weights"
+            )
+
+        if any(weight < 0 for weight in weights):
+            raise ValueError("Alias table weights can't be negative")
+
+        if total_weight <= 0:
+            raise ValueError("Alias table weights can't all be zero")
+
+        self.items = list(items)
+        self.probabilities = [0.0] * count
+        self.aliases = [0] * count
+
+        # Scale the weights so their average is 1 and split them
+        # to the columns that are less and more than the average
+        scaled_weights = [weight * count / total_weight for weight in weights]
+        small = [i for i, weight in enumerate(scaled_weights) if weight < 1]
+        large = [i for i, weight in enumerate(scaled_weights) if weight >= 1]
+
+        # Fill every small column with the extra of a large column
+        while small and large:
+            small_index = small.pop()
+            large_index = large[-1]
+
+            self.probabilities[small_index] = scaled_weights[small_index]
+            self.aliases[small_index] = large_index
+
+            scaled_weights[large_index] -= 1 - scaled_weights[small_index]
+
+            if scaled_weights[large_index] < 1:
+                small.append(large.pop())
+
+        # The remaining columns are full, they can only be
+        # left with small rounding errors
+        for i in small + large:
+            self.probabilities[i] = 1.0
+            self.aliases[i] = i
+
+    def sample(self, rng: Random):
+        # The integer part picks the column and the
+        # fraction picks the item or its alias
+        value = rng.random() * len(self.items)
+        index = int(value)
+
+        if value - index < self.probabilities[index]:
+            return self.items[index]
+
+        return self.items[self.aliases[index]]
+
+
+class SpawnTables:
+    # Alias tables of the sprite classes for every difficulty
+    # tier, they are made once and the game just picks one
+    def __init__(
+        self, sprite_classes: list[type], weights: list[float], tiers: list[dict]
+    ) -> None:
+        self.tiers = sorted(tiers, key=lambda tier: tier["min_speed"])
+        self.min_speeds = [tier["min_speed"] for tier in self.tiers]
+
+        self.tables = [
+            AliasTable(
+                sprite_classes,
+                [
+                    weight * tier.get(sprite_class.SPAWN_CATEGORY, 1)
+                    for sprite_class, weight in zip(sprite_classes, weights)
+                ],
+            )
+            for tier in self.tiers
+        ]
+
+    def get_tier(self, speed: float):
+        return max(bisect_right(self.min_speeds, speed) - 1, 0)
+
+    def get_table(self, speed: float):
+        return self.tables[self.get_tier(speed)]
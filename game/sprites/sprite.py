@@ -1,10 +1,65 @@
-from pygame import sprite, Surface, transform
+from pygame import sprite, Surface
 from config import conf
-from random import random, choice as random_choice
+from ..assets import get_oriented_model, get_model_mask
+from .store import get_stored_class
+from random import Random
 
 
 class Sprite(sprite.Sprite):
     DROP_CHANCE = 1
+    # Category of the sprite for the difficulty tiers
+    SPAWN_CATEGORY = None
+
+    # Random stream for placing the sprites, the game
+    # gives its own stream to the spawned sprites
+    DEFAULT_RNG = Random()
+
+    # The sprite values are kept in slots instead of a dict,
+    # only the groups of the pygame sprite are in its dict
+    __slots__ = (
+        "rng",
+        "spawn_lane",
+        "store",
+        "slot",
+        "pool",
+        "models",
+        "current_model",
+        "model_index",
+        "animation_speed",
+        "start_y_speed",
+        "is_on_edges",
+        "is_impacted",
+        "rect",
+        "x",
+        "y",
+        "prev_x",
+        "prev_y",
+        "y_speed",
+        "width",
+        "height",
+        "side",
+    )
+
+    def __new__(cls, *args, **kwargs):
+        # The slots don't have default values, so they
+        # are set before the sprite is initialized
+        sprite = super().__new__(cls)
+
+        # The random stream and the lane are given when the
+        # sprite is spawned, a random lane is picked by the
+        # stream if the lane is not given
+        sprite.rng = cls.DEFAULT_RNG
+        sprite.spawn_lane = None
+
+        # The store and the slot of the sprite
+        # if it is kept in a sprite store
+        sprite.store = None
+        sprite.slot = None
+
+        # The pool that the sprite goes back to when it is killed
+        sprite.pool = None
+
+        return sprite
 
     def __init__(
         self,
@@ -17,38 +72,53 @@ class Sprite(sprite.Sprite):
 
         self.models = models
         self.model_index = 0
+        self.current_model = models[0]
         self.animation_speed = animation_speed
-        self.y_speed = y_speed
+        self.start_y_speed = y_speed
         self.is_on_edges = is_on_edges
-        self.width = self.current_model.get_width()
-        self.height = self.current_model.get_height()
-        self.is_impacted = False
 
         self.rect = self.current_model.get_rect()
 
-        self.__set_positions(self.__set_x_pos(), -self.height * 2.0)
+        self.reset()
 
-    @property
-    def current_model(self):
-        return self.models[int(self.model_index)]
+    @classmethod
+    def spawn(cls, rng: Random, lane: str = None, store=None):
+        # Create the sprite with the given random stream on the
+        # given lane, the sprite of a store is made as the stored
+        # class and its slot is reserved before it is initialized
+        sprite_class = cls if store is None else get_stored_class(cls)
+        sprite = sprite_class.__new__(sprite_class)
+        sprite.rng = rng
+        sprite.spawn_lane = lane
+
+        if store is not None:
+            store.reserve(sprite)
+
+        sprite.__init__()
+
+        return sprite
 
     @property
-    def side(self):
-        # This property shows that the sprite is
+    def current_mask(self):
+        # Collision mask of the model as it is drawn
+        return get_model_mask(self.current_model, self.side == "right")
+
+    @staticmethod
+    def get_side(x: float):
+        # This method shows that the sprite is
         # on which side, the right or
         # the left. If we cut the screen in half
         # then the sides are obvious
-        if conf.PLATFORM_WIDTH <= self.x <= conf.SCREEN_WIDTH / 2:
+        if conf.PLATFORM_WIDTH <= x <= conf.SCREEN_WIDTH / 2:
             return "left"
-        elif conf.SCREEN_WIDTH / 2 < self.x <= conf.SCREEN_WIDTH - conf.PLATFORM_WIDTH:
+        elif conf.SCREEN_WIDTH / 2 < x <= conf.SCREEN_WIDTH - conf.PLATFORM_WIDTH:
             return "right"
         else:
             return None
 
-    @staticmethod
-    def __generate_random_x_pos():
+    def __generate_random_x_pos(self):
         return (
-            random() * (conf.SCREEN_WIDTH - conf.PLATFORM_WIDTH * 2)
+            self.rng.random() * (conf.SCREEN_WIDTH - conf.PLATFORM_WIDTH * 2)
             + conf.PLATFORM_WIDTH
         )
 
@@ -56,6 +126,8 @@ class Sprite(sprite.Sprite):
         if x:
             self.x = x
             self.rect.x = x
+            # The side only changes with the x position
+            self.side = self.get_side(x)
 
         if y:
             self.y = y
@@ -71,14 +143,57 @@ class Sprite(sprite.Sprite):
 
             left_pos = conf.PLATFORM_FLOOR_WIDTH
 
-            x_pos = random_choice([left_pos, right_pos])
+            if self.spawn_lane is None:
+                x_pos = self.rng.choice([left_pos, right_pos])
+            else:
+                x_pos = left_pos if self.spawn_lane == "left" else right_pos
         else:
             # otherwise generate a random x position
             x_pos = self.__generate_random_x_pos()
 
         return x_pos
 
-    def __update_rect(self):
+    def sync_rect(self):
+        # The store moves the sprites without their rects
+        self.rect.x = self.x
+        self.rect.y = self.y
+
+    def kill(self):
+        # A sprite can be killed more than once in a tick,
+        # but it must go back to its pool only once
+        is_alive = self.alive()
+
+        if self.store is not None:
+            self.store.remove(self)
+
+        super().kill()
+
+        if is_alive and self.pool is not None:
+            self.pool.release(self)
+
+    def reset(self):
+        # Put the sprite on its starting state, it is
+        # used for new and recycled sprites
+        self.model_index = 0
+        self.current_model = self.models[0]
+        self.y_speed = self.start_y_speed
+        self.width = self.current_model.get_width()
+        self.height = self.current_model.get_height()
+        self.is_impacted = False
+
+        self.rect.size = (self.width, self.height)
+
+        self.__set_positions(self.__set_x_pos(), -self.height * 2.0)
+
+        # Positions before the last update
+        self.prev_x = self.x
+        self.prev_y = self.y
+
+    def update_rect(self):
+        # The model index is changed, so the current model
+        # is picked again and the rect is resized to it
+        self.current_model = self.models[int(self.model_index)]
+
         # First we get the new model width
         new_width = self.current_model.get_width()
         # and its height
@@ -106,23 +221,33 @@ class Sprite(sprite.Sprite):
     def impact(self):
         self.is_impacted = True
 
+    def get_draw_position(self, interpolation: float = 1.0):
+        # Move back from the current position to the position
+        # between the previous and the current update
+        return (
+            self.x - (self.x - self.prev_x) * (1 - interpolation),
+            self.y - (self.y - self.prev_y) * (1 - interpolation),
+        )
+
     def update(self, game_speed: float):
+        self.prev_x = self.x
+        self.prev_y = self.y
+
         self.__set_positions(y=self.y + game_speed + self.y_speed)
 
-    def draw(self, surface: Surface):
-        surface.blit(
-            transform.flip(
-                self.current_model,
-                self.side == "right",
-                False,
-            ),
-            (self.x, self.y),
+    def draw(self, surface: Surface, interpolation: float = 1.0):
+        # Returns the changed area of the surface
+        return surface.blit(
+            get_oriented_model(self.current_model, self.side == "right"),
+            self.get_draw_position(interpolation),
         )
 
     def change_animation(self):
         # If there is more than one image for the sprite
         # and the animation speed is non-zero
         if self.animation_speed > 0 and len(self.models) > 1:
+            prev_model_index = int(self.model_index)
+
             # increase the model_index by animation_speed
             self.model_index += self.animation_speed
 
@@ -132,5 +257,6 @@ class Sprite(sprite.Sprite):
                 # reset the index
                 self.model_index = 0
 
-            # and then update model rect
-            self.__update_rect()
+            # and then update model rect if the model is changed
+            if int(self.model_index) != prev_model_index:
+                self.update_rect()
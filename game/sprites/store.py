@@ -0,0 +1,196 @@
+from config import conf
+
+# NumPy is optional, the sprites keep their own
+# values if it is not installed
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+FLOAT_FIELDS = (
+    "x",
+    "y",
+    "prev_x",
+    "prev_y",
+    "y_speed",
+    "model_index",
+    "animation_speed",
+)
+
+
+def is_store_available():
+    return numpy is not None
+
+
+class StoreField:
+    # A sprite value that is read from the arrays of the
+    # sprite store, it is only used by the stored classes
+    def __set_name__(self, owner: type, name: str):
+        self.name = name
+
+    def __get__(self, sprite, owner: type = None):
+        if sprite is None:
+            return self
+
+        return getattr(sprite.store, self.name)[sprite.slot]
+
+    def __set__(self, sprite, value: float):
+        getattr(sprite.store, self.name)[sprite.slot] = value
+
+
+# Stored classes of the sprite classes
+STORED_CLASSES: dict[type, type] = {}
+
+
+def get_stored_class(sprite_class: type):
+    # The sprites of a store are made as a subclass of their
+    # class that reads the values from the store, so the other
+    # sprites keep their values in their own slots without
+    # checking for a store on every access
+    if sprite_class not in STORED_CLASSES:
+        STORED_CLASSES[sprite_class] = type(
+            sprite_class.__name__,
+            (sprite_class,),
+            {
+                "__slots__": (),
+                "__module__": sprite_class.__module__,
+                "__qualname__": sprite_class.__qualname__,
+                "UNSTORED_CLASS": sprite_class,
+                **{field: StoreField() for field in FLOAT_FIELDS},
+            },
+        )
+
+    return STORED_CLASSES[sprite_class]
+
+
+def get_unstored_class(sprite_class: type):
+    # The spawned class of a stored or a normal sprite class
+    return getattr(sprite_class, "UNSTORED_CLASS", sprite_class)
+
+
+class SpriteStore:
+    # Keeps the positions, speeds, animation indices and type
+    # ids of the sprites in arrays, so they can be updated for
+    # all the sprites at once and the sprites only read them
+    def __init__(self, capacity: int = conf.SPRITE_STORE_CAPACITY) -> None:
+        self.capacity = capacity
+        self.sprites = [None] * capacity
+        self.type_ids: dict[type, int] = {}
+        self.__free_slots = list(range(capacity - 1, -1, -1))
+
+        for field in FLOAT_FIELDS:
+            setattr(self, field, numpy.zeros(capacity, dtype=numpy.float64))
+
+        self.models_count = numpy.zeros(capacity, dtype=numpy.int32)
+        self.type_id = numpy.zeros(capacity, dtype=numpy.int32)
+        self.is_active = numpy.zeros(capacity, dtype=bool)
+        # Dead enemies are animated by themselves
+        self.is_animated = numpy.zeros(capacity, dtype=bool)
+
+    def __len__(self):
+        # Count of the sprites that have a slot
+        return self.capacity - len(self.__free_slots)
+
+    def __grow(self):
+        new_capacity = self.capacity * 2
+
+        for field in FLOAT_FIELDS + (
+            "models_count",
+            "type_id",
+            "is_active",
+            "is_animated",
+        ):
+            array = getattr(self, field)
+            new_array = numpy.zeros(new_capacity, dtype=array.dtype)
+            new_array[: self.capacity] = array
+            setattr(self, field, new_array)
+
+        self.sprites += [None] * (new_capacity - self.capacity)
+        self.__free_slots = list(range(new_capacity - 1, self.capacity - 1, -1))
+        self.capacity = new_capacity
+
+    def get_type_id(self, sprite_class: type):
+        return self.type_ids.setdefault(sprite_class, len(self.type_ids))
+
+    def reserve(self, sprite):
+        # Gives a slot to a sprite of a stored class before it is
+        # initialized, the sprite keeps the slot for its whole life
+        # and it is only activated when it is spawned
+        if not self.__free_slots:
+            self.__grow()
+
+        slot = self.__free_slots.pop()
+
+        self.type_id[slot] = self.get_type_id(get_unstored_class(type(sprite)))
+        self.is_active[slot] = False
+        self.is_animated[slot] = False
+        self.sprites[slot] = sprite
+
+        sprite.store = self
+        sprite.slot = slot
+
+    def add(self, sprite):
+        # The sprite values are already in its slot
+        slot = sprite.slot
+
+        self.models_count[slot] = len(sprite.models)
+        self.is_active[slot] = True
+        self.is_animated[slot] = True
+
+    def remove(self, sprite):
+        # The sprite keeps its slot, so it is used
+        # again when the sprite is recycled
+        self.is_active[sprite.slot] = False
+        self.is_animated[sprite.slot] = False
+
+    def clear(self):
+        self.is_active[:] = False
+        self.is_animated[:] = False
+
+    def update(self, game_speed: float):
+        # Move all the sprites down, the inactive sprites are
+        # placed again when they are spawned so they are moved too
+        self.prev_x[:] = self.x
+        self.prev_y[:] = self.y
+        self.y[:] = self.y + game_speed + self.y_speed
+
+    def animate(self):
+        # Returns the sprites that their model is changed
+        animated = (
+            self.is_animated & (self.animation_speed > 0) & (self.models_count > 1)
+        )
+        prev_model_indices = self.model_index.astype(numpy.int32)
+
+        self.model_index[animated] += self.animation_speed[animated]
+
+        # Reset the index if it reaches the last model
+        self.model_index[animated & (self.model_index >= self.models_count - 1)] = 0
+
+        changed = animated & (
+            self.model_index.astype(numpy.int32) != prev_model_indices
+        )
+
+        return [self.sprites[slot] for slot in numpy.flatnonzero(changed)]
+
+    def get_self_animated_sprites(self):
+        # The active sprites that aren't animated by the store, e.g. dead enemies
+        return [
+            self.sprites[slot]
+            for slot in numpy.flatnonzero(self.is_active & ~self.is_animated)
+        ]
+
+    def get_sprites_below(self, y: float):
+        return [
+            self.sprites[slot]
+            for slot in numpy.flatnonzero(self.is_active & (self.y > y))
+        ]
+
+    def get_type_counts(self):
+        counts = numpy.bincount(
+            self.type_id[self.is_active], minlength=len(self.type_ids)
+        )
+
+        return {
+            sprite_class: int(counts[type_id])
+            for sprite_class, type_id in self.type_ids.items()
+        }
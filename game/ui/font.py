@@ -0,0 +1,85 @@
+from collections import OrderedDict
+from pygame import font as pygame_font, Surface
+from config import conf
+
+# Every font is made once and shared by all the UI components
+FONTS: dict[tuple[str, int], pygame_font.Font] = {}
+
+
+def get_font(size: int, name: str = None):
+    key = (name, size)
+
+    if key not in FONTS:
+        FONTS[key] = pygame_font.Font(name, size)
+
+    return FONTS[key]
+
+
+class TextCache:
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # The most recently used surfaces are at the end
+        self.__surfaces: OrderedDict[tuple, Surface] = OrderedDict()
+
+    def __len__(self):
+        return len(self.__surfaces)
+
+    @property
+    def stats(self):
+        return {
+            "size": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def render(
+        self,
+        text: str,
+        size: int,
+        color: tuple[int],
+        antialias: bool = True,
+        font_name: str = None,
+    ) -> Surface:
+        key = (font_name, size, text, tuple(color), antialias)
+
+        # If the text was rendered before
+        # just mark it as recently used
+        if key in self.__surfaces:
+            self.hits += 1
+            self.__surfaces.move_to_end(key)
+
+            return self.__surfaces[key]
+
+        self.misses += 1
+
+        text_surface = get_font(size, font_name).render(text, antialias, color)
+        self.__surfaces[key] = text_surface
+
+        # Remove the least recently used surface
+        # if the cache is full
+        if len(self.__surfaces) > self.max_size:
+            self.__surfaces.popitem(last=False)
+            self.evictions += 1
+
+        return text_surface
+
+    def clear(self):
+        self.__surfaces.clear()
+
+
+TEXT_CACHE = TextCache(conf.TEXT_CACHE_SIZE)
+
+
+def render_text(
+    text: str,
+    size: int,
+    color: tuple[int],
+    antialias: bool = True,
+    font_name: str = None,
+) -> Surface:
+    return TEXT_CACHE.render(text, size, color, antialias, font_name)
@@ -1,4 +1,4 @@
-from pygame import Surface, font as pygame_font, transform
+from pygame import Surface, transform
 from .button import Button
 from .text import Text
 from config import conf
@@ -14,8 +14,6 @@ class Prompt:
         button_spacing: float = None,
         button_size: float = None,
     ) -> None:
-        font = pygame_font.Font(None, conf.PROMPT_FONT_SIZE)
-
         self.title = title
         self.title_rect = title.get_rect()
 
@@ -27,7 +25,7 @@ class Prompt:
 
         self.text_component = (
             Text(
-                font=font,
+                font_size=conf.PROMPT_FONT_SIZE,
                 texts=texts,
                 centerized=True,
                 color=conf.PROMPT_TEXT_COLOR,
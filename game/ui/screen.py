@@ -0,0 +1,53 @@
+from pygame import Surface, Rect
+from .button import Button
+
+
+class Screen:
+    def __init__(self, build) -> None:
+        # build is called with the screen itself and adds
+        # the screen components to it, the screen is only
+        # rebuilt when its state changes
+        self.build = build
+        self.state = None
+        self.is_built = False
+        self.__draw_calls = []
+        self.__actions = []
+
+    def add_image(self, image: Surface, position: Rect):
+        self.__draw_calls.append(lambda surface: surface.blit(image, position))
+
+    def add_component(self, component):
+        # component can be any UI class with a draw method
+        self.__draw_calls.append(component.draw)
+
+    def add_action(self, button: Button, action):
+        self.__actions.append((button, action))
+
+    def add_button(self, button: Button, action):
+        self.add_component(button)
+        self.add_action(button, action)
+
+    def update(self, state: tuple = ()):
+        if self.is_built and state == self.state:
+            return
+
+        self.__draw_calls = []
+        self.__actions = []
+
+        self.build(self)
+
+        self.state = state
+        self.is_built = True
+
+    def draw(self, surface: Surface):
+        for draw_call in self.__draw_calls:
+            draw_call(surface)
+
+    def click(self, position: tuple[int]):
+        # Run the action of the clicked button if there is any
+        for button, action in self.__actions:
+            if button.icon_rect.collidepoint(position):
+                action()
+                return True
+
+        return False
@@ -1,10 +1,11 @@
-from pygame import font as pygame_font, Surface
+from pygame import Surface
+from .font import render_text
 
 
 class Text:
     def __init__(
         self,
-        font: pygame_font.Font,
+        font_size: int,
         x: float,
         y: float,
         texts: list[str],
@@ -12,6 +13,7 @@ class Text:
         centerized: bool = False,
         inverse_y_position: bool = False,
         margin_between_texts: float = 20,
+        font_name: str = None,
     ) -> None:
         # If the texts are inversely positioned
         # we need to reverse the texts list, so
@@ -19,7 +21,9 @@ class Text:
         if inverse_y_position:
             texts.reverse()
 
-        self.text_surfaces = [font.render(text, True, color) for text in texts]
+        self.text_surfaces = [
+            render_text(text, font_size, color, font_name=font_name) for text in texts
+        ]
         self.centerized = centerized
         self.inverse_y_position = inverse_y_position
         self.margin_between_texts = margin_between_texts
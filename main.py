@@ -1,5 +1,6 @@
 import pygame
-from config.conf import SCREEN_WIDTH, SCREEN_HEIGHT, FPS
+from config.conf import SCREEN_WIDTH, SCREEN_HEIGHT, FPS, SHOW_DEBUG_STATS
+from game import assets
 from game.game import Game
 
 
@@ -8,16 +9,25 @@ def main():
     pygame.mixer.init()
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption("Soul Hunter")
+
+    # Convert the assets to the display format
+    assets.finalize_assets()
+
+    if SHOW_DEBUG_STATS:
+        print(assets.asset_format_report())
+
     clock = pygame.time.Clock()
 
     game = Game(screen)
 
     while True:
         game.get_events()
+        # Run the game ticks for the time of the last frame
+        game.update(clock.tick(FPS))
         game.update_screen()
         game.update_music()
-        pygame.display.update()
-        clock.tick(FPS)
+        # Update the changed areas or the whole screen
+        pygame.display.update(game.dirty_rects)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,6 @@
+import os
+
+# The game modules load pygame assets, they
+# are loaded without a window or a sound device
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
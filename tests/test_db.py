@@ -0,0 +1,293 @@
+import os, sqlite3
+from random import Random
+import pytest
+from config import conf
+from db import log_db
+from db.db import DB, CSVDB, RECORD_ORDERS, open_db
+from db.log_db import RecordLogDB, ROW, convert_csv_to_log, convert_log_to_csv
+from db.record import Record
+from db.sqlite_db import SQLiteDB
+
+DATES = [
+    "Mon Jan  2 10:00:00 2023",
+    "Sat Oct 18 07:48:30 2025",
+    "Fri Mar  3 12:30:00 2023",
+]
+
+
+def test_backend_without_abstract_methods_can_not_be_created(tmp_path):
+    class IncompleteDB(DB):
+        def add_record(self, record: Record):
+            pass
+
+    with pytest.raises(TypeError):
+        IncompleteDB(str(tmp_path / "records"))
+
+
+def test_sqlite_keeps_dates_as_seconds(tmp_path):
+    db = SQLiteDB(str(tmp_path / "records.db"))
+    db.add_records(
+        [Record(score=i, kills=i, coins=i, date=date) for i, date in enumerate(DATES)]
+    )
+
+    assert [record.date for record in db.get_all_records()] == DATES
+    # The date index is in the order of the dates
+    assert db.connection.execute("SELECT id FROM records ORDER BY date").fetchall() == [
+        (1,),
+        (3,),
+        (2,),
+    ]
+
+    db.close()
+
+
+def test_sqlite_migrates_text_dates(tmp_path):
+    filepath = str(tmp_path / "records.db")
+
+    # The records table before the dates are kept as seconds
+    connection = sqlite3.connect(filepath)
+    connection.execute(
+        "CREATE TABLE records (id INTEGER PRIMARY KEY, date TEXT NOT NULL, "
+        "score INTEGER NOT NULL, kills INTEGER NOT NULL, coins INTEGER NOT NULL)"
+    )
+    connection.execute("CREATE INDEX records_date ON records (date)")
+    connection.executemany(
+        "INSERT INTO records (date, score, kills, coins) VALUES (?, 1, 2, 3)",
+        [(date,) for date in DATES],
+    )
+    connection.commit()
+    connection.close()
+
+    db = SQLiteDB(filepath)
+
+    assert [record.date for record in db.get_all_records()] == DATES
+    assert db.connection.execute(
+        "SELECT DISTINCT typeof(date) FROM records"
+    ).fetchall() == [("integer",)]
+    assert db.best_score == 1
+
+    db.close()
+
+
+def test_csv_and_sqlite_records_are_the_same(tmp_path):
+    records = [Record(score=i * 7 % 5, kills=i, coins=i % 3) for i in range(20)]
+    csv_db = CSVDB(str(tmp_path / "records.csv"))
+    sqlite_db = SQLiteDB(str(tmp_path / "records.db"))
+
+    for db in (csv_db, sqlite_db):
+        db.add_records(records)
+
+    for by in ("score", "kills", "coins"):
+        assert [str(record) for record in csv_db.top(5, by)] == [
+            str(record) for record in sqlite_db.top(5, by)
+        ]
+
+    assert [str(record) for record in csv_db.iter_records(3, 4)] == [
+        str(record) for record in sqlite_db.iter_records(3, 4)
+    ]
+
+    sqlite_db.close()
+
+
+def test_csv_records_are_imported_once_by_the_default_backend(tmp_path, monkeypatch):
+    # The records of the CSV file before the SQLite backend
+    csv_filepath = str(tmp_path / "records.csv")
+    records = [
+        Record(score=i, kills=i, coins=i, date=date) for i, date in enumerate(DATES)
+    ]
+    CSVDB(csv_filepath).add_records(records)
+
+    monkeypatch.setattr(conf, "DB_FILEPATH", csv_filepath)
+    monkeypatch.setattr(conf, "SQLITE_DB_FILEPATH", str(tmp_path / "records.db"))
+
+    db = open_db()
+
+    assert conf.DB_BACKEND == "sqlite"
+    assert [str(record) for record in db.get_all_records()] == list(map(str, records))
+    assert db.best_score == 2
+
+    db.add_record(Record(score=10, kills=0, coins=0, date=DATES[0]))
+    db.close()
+
+    # The CSV file is kept as it was and it is not imported again
+    assert len(CSVDB(csv_filepath).get_all_records()) == len(records)
+
+    db = open_db()
+
+    assert len(db.get_all_records()) == len(records) + 1
+    assert db.best_score == 10
+
+    db.close()
+
+
+def make_random_records(count: int, seed: int = 0):
+    rng = Random(seed)
+
+    return [
+        Record(
+            score=rng.randrange(50),
+            kills=rng.randrange(20),
+            coins=rng.randrange(30),
+            date=rng.choice(DATES),
+        )
+        for _ in range(count)
+    ]
+
+
+def get_strings(records):
+    return [str(record) for record in records]
+
+
+@pytest.fixture(params=["numpy", "no numpy"])
+def log_filepath(request, tmp_path, monkeypatch):
+    # The log is read row by row without NumPy
+    if request.param == "numpy" and log_db.numpy is None:
+        pytest.skip("NumPy is not installed")
+
+    if request.param == "no numpy":
+        monkeypatch.setattr(log_db, "numpy", None)
+
+    return str(tmp_path / "records.log")
+
+
+def test_log_records_are_read_after_reopening(log_filepath):
+    records = make_random_records(30)
+    db = RecordLogDB(log_filepath)
+    db.add_records(records[:20])
+
+    for record in records[20:]:
+        db.add_record(record)
+
+    db.close()
+
+    db = RecordLogDB(log_filepath)
+
+    assert db.record_count == len(records)
+    assert get_strings(db.get_all_records()) == get_strings(records)
+    assert db.best_score == max(record.score for record in records)
+
+    db.close()
+
+
+def test_half_written_row_is_dropped(log_filepath):
+    records = make_random_records(5)
+    db = RecordLogDB(log_filepath)
+    db.add_records(records)
+    db.close()
+
+    # The game is stopped while a row is written
+    with open(log_filepath, mode="ab") as log_file:
+        log_file.write(ROW.pack(0, 1, 2, 3)[:7])
+
+    db = RecordLogDB(log_filepath)
+
+    assert db.record_count == len(records)
+    assert os.path.getsize(log_filepath) == len(log_db.MAGIC) + 5 * ROW.size
+    assert get_strings(db.get_all_records()) == get_strings(records)
+
+    # The next rows are added after the last full row
+    db.add_record(records[0])
+
+    assert get_strings(db.get_all_records()) == get_strings(records + records[:1])
+
+    db.close()
+
+
+def test_cleared_rows_are_removed_by_compacting(log_filepath):
+    records = make_random_records(10)
+    db = RecordLogDB(log_filepath)
+    db.add_records(records)
+    db.clear_all_records()
+
+    # The records and the marker row are cleared
+    assert db.record_count == 0
+    assert db.cleared_rows == len(records) + 1
+    assert db.get_all_records() == []
+    assert db.best_score is None
+
+    db.add_records(records[:3])
+    db.compact()
+
+    assert db.record_count == 3
+    assert db.cleared_rows == 0
+    assert os.path.getsize(log_filepath) == len(log_db.MAGIC) + 3 * ROW.size
+    assert get_strings(db.get_all_records()) == get_strings(records[:3])
+
+    db.close()
+
+    db = RecordLogDB(log_filepath)
+
+    assert db.record_count == 3
+    assert db.cleared_rows == 0
+
+    db.close()
+
+
+def test_log_is_compacted_when_half_of_it_is_cleared(log_filepath, monkeypatch):
+    monkeypatch.setattr(conf, "RECORD_LOG_COMPACTION_ROWS", 4)
+    db = RecordLogDB(log_filepath)
+    db.add_records(make_random_records(5))
+    db.clear_all_records()
+
+    assert db.cleared_rows == 0
+    assert os.path.getsize(log_filepath) == len(log_db.MAGIC)
+
+    db.close()
+
+
+def test_records_are_converted_between_csv_and_log(log_filepath, tmp_path):
+    records = make_random_records(30)
+    csv_filepath = str(tmp_path / "records.csv")
+    CSVDB(csv_filepath).add_records(records)
+
+    assert convert_csv_to_log(csv_filepath, log_filepath) == len(records)
+
+    converted_csv_filepath = str(tmp_path / "converted.csv")
+
+    assert convert_log_to_csv(log_filepath, converted_csv_filepath) == len(records)
+
+    with open(csv_filepath) as csv_file, open(converted_csv_filepath) as converted:
+        assert converted.read() == csv_file.read()
+
+
+def test_log_and_csv_records_are_the_same(log_filepath, tmp_path):
+    records = make_random_records(60)
+    csv_db = CSVDB(str(tmp_path / "records.csv"))
+    db = RecordLogDB(log_filepath)
+
+    for records_db in (csv_db, db):
+        records_db.add_records(records)
+
+    for by in RECORD_ORDERS:
+        for k in (0, 1, 5, conf.DB_TOP_RECORDS_COUNT, 25, 100):
+            assert get_strings(db.top(k, by)) == get_strings(csv_db.top(k, by))
+
+    for offset, limit in ((0, None), (0, 10), (7, 13), (55, 10), (60, 5), (100, 1)):
+        assert get_strings(db.iter_records(offset, limit)) == get_strings(
+            csv_db.iter_records(offset, limit)
+        )
+
+    db.close()
+
+
+def test_log_array_is_a_snapshot(log_filepath):
+    if log_db.numpy is None:
+        with pytest.raises(RuntimeError):
+            RecordLogDB(log_filepath).get_array()
+
+        return
+
+    records = make_random_records(10)
+    db = RecordLogDB(log_filepath)
+    db.add_records(records)
+    array = db.get_array()
+
+    db.clear_all_records()
+    db.add_records(records[:2])
+    db.compact()
+
+    # The old array keeps the records of the old file
+    assert array["coins"].sum() == sum(record.coins for record in records)
+    assert db.get_array()["coins"].sum() == sum(record.coins for record in records[:2])
+
+    db.close()
@@ -0,0 +1,96 @@
+from random import Random
+import pytest
+from pygame import Rect
+from config import conf
+from game.game import Game
+from game.sprites.lanes import LaneGroup
+
+
+def get_brute_force_collisions(sprites: list, lane_group: LaneGroup, rect: Rect):
+    colliding_sprites = []
+
+    for sprite in sprites:
+        sprite.sync_rect()
+
+        if lane_group.has(sprite) and rect.colliderect(sprite.rect):
+            colliding_sprites.append(sprite)
+
+    return colliding_sprites
+
+
+def get_random_rect(rng: Random):
+    width = rng.randint(1, conf.SCREEN_WIDTH)
+    height = rng.randint(1, conf.SCREEN_HEIGHT // 2)
+
+    return Rect(
+        rng.randint(-width, conf.SCREEN_WIDTH),
+        rng.randint(-height - 200, conf.SCREEN_HEIGHT + 200),
+        width,
+        height,
+    )
+
+
+def spawn_sprites(rng: Random, count: int, is_anywhere: bool):
+    sprites = []
+
+    for _ in range(count):
+        sprite = rng.choice(Game.SPRITE_CLASSES).spawn(rng)
+
+        # The sprites that are anywhere on x can cross the middle
+        # of the screen and be out of the platform floors
+        if is_anywhere:
+            sprite.x = rng.uniform(-sprite.width / 2, conf.SCREEN_WIDTH)
+
+        sprite.y = rng.uniform(-300, conf.SCREEN_HEIGHT)
+        sprite.sync_rect()
+        sprites.append(sprite)
+
+    return sprites
+
+
+@pytest.mark.parametrize("is_anywhere", [False, True])
+@pytest.mark.parametrize("seed", range(5))
+def test_colliding_sprites_match_brute_force(seed, is_anywhere):
+    rng = Random(seed)
+    sprites = spawn_sprites(rng, 60, is_anywhere)
+    lane_group = LaneGroup(*sprites)
+
+    for _ in range(40):
+        # Move the sprites with different speeds, some of them
+        # leave the screen and they are removed from the group
+        for sprite in sprites:
+            sprite.y += rng.uniform(0, 40)
+
+            if sprite.y > conf.SCREEN_HEIGHT + conf.PLATFORM_HEIGHT:
+                lane_group.remove(sprite)
+
+        lane_group.sort()
+
+        for _ in range(10):
+            rect = get_random_rect(rng)
+
+            assert lane_group.get_colliding_sprites(rect) == get_brute_force_collisions(
+                sprites, lane_group, rect
+            )
+
+
+def test_sprites_are_in_their_lanes():
+    rng = Random(0)
+    sprites = spawn_sprites(rng, 40, is_anywhere=True)
+    lane_group = LaneGroup(*sprites)
+
+    for lane, lane_sprites in lane_group.lanes.items():
+        assert lane_sprites == sorted(lane_sprites, key=lambda sprite: sprite.y)
+
+        for sprite in lane_sprites:
+            assert LaneGroup.get_lane(sprite) == lane
+
+    assert sum(map(len, lane_group.lanes.values())) == len(sprites)
+
+
+def test_full_screen_rect_finds_every_sprite_on_it():
+    sprites = spawn_sprites(Random(1), 30, is_anywhere=False)
+    lane_group = LaneGroup(*sprites)
+    screen_rect = Rect(0, -400, conf.SCREEN_WIDTH, conf.SCREEN_HEIGHT + 800)
+
+    assert lane_group.get_colliding_sprites(screen_rect) == sprites
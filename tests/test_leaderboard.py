@@ -0,0 +1,187 @@
+import pygame
+import pytest
+from config import conf
+from db.db import RECORD_ORDERS
+from db.record import Record
+from game.game import Game
+
+DATE = "Mon Jan  2 10:00:00 2023"
+SIZE = conf.LEADERBOARD_SIZE
+
+
+@pytest.fixture(params=["csv", "sqlite", "log"])
+def make_game(request, tmp_path, monkeypatch):
+    # The games save their records to their own files
+    monkeypatch.setattr(conf, "DB_BACKEND", request.param)
+    monkeypatch.setattr(conf, "DB_FILEPATH", str(tmp_path / "records.csv"))
+    monkeypatch.setattr(conf, "SQLITE_DB_FILEPATH", str(tmp_path / "records.db"))
+    monkeypatch.setattr(conf, "RECORD_LOG_FILEPATH", str(tmp_path / "records.log"))
+
+    pygame.init()
+    games = []
+
+    def make_game(records: list[Record] = ()):
+        game = Game(pygame.Surface((conf.SCREEN_WIDTH, conf.SCREEN_HEIGHT)))
+        game.db.add_records(list(records))
+        games.append(game)
+
+        return game
+
+    yield make_game
+
+    for game in games:
+        game.record_writer.close()
+
+
+def make_records(count: int):
+    # Every value has its own order, so the orders give other records
+    return [
+        Record(score=i * 7 % count, kills=i * 3 % count, coins=i, date=DATE)
+        for i in range(count)
+    ]
+
+
+def get_leaderboard(game: Game):
+    # Wait for the writer thread and take the read records
+    game.record_writer.flush()
+    game.draw_leaderboard()
+
+    return [str(record) for record in game.leaderboard_records]
+
+
+def show_order(game: Game, order: str):
+    game.show_leaderboard()
+
+    while game.leaderboard_order != order:
+        game.change_leaderboard_order()
+
+    return get_leaderboard(game)
+
+
+def test_leaderboard_starts_with_the_best_scores(make_game):
+    game = make_game(make_records(25))
+    game.show_leaderboard()
+
+    assert game.leaderboard_records is None
+    assert game.leaderboard_order == "score"
+    assert get_leaderboard(game) == [str(record) for record in game.db.top(SIZE)]
+
+
+@pytest.mark.parametrize("order", RECORD_ORDERS)
+def test_leaderboard_orders_are_the_top_records(make_game, order):
+    records = make_records(25)
+    game = make_game(records)
+    top_records = sorted(records, key=lambda record: -getattr(record, order))
+
+    assert show_order(game, order) == [str(record) for record in top_records[:SIZE]]
+    assert game.leaderboard_page == 0
+
+
+def test_leaderboard_orders_are_cycled(make_game):
+    game = make_game()
+    game.show_leaderboard()
+    orders = []
+
+    for _ in range(len(Game.LEADERBOARD_ORDERS) + 1):
+        game.change_leaderboard_order()
+        orders.append(game.leaderboard_order)
+
+    assert orders == list(Game.LEADERBOARD_ORDERS[1:] + Game.LEADERBOARD_ORDERS[:2])
+
+
+def test_all_records_are_paged(make_game):
+    records = make_records(SIZE * 2 + 3)
+    game = make_game(records)
+    pages = [show_order(game, "all")]
+
+    # The next page is only loaded after a full page
+    while len(pages[-1]) == SIZE:
+        game.change_leaderboard_page(1)
+        pages.append(get_leaderboard(game))
+
+    assert [len(page) for page in pages] == [SIZE, SIZE, 3]
+    assert sum(pages, []) == [str(record) for record in records]
+    assert game.leaderboard_page == 2
+
+
+def test_page_bounds(make_game):
+    game = make_game(make_records(SIZE))
+    show_order(game, "all")
+
+    # There is no page before the first one
+    game.change_leaderboard_page(-1)
+
+    assert game.leaderboard_page == 0
+    assert game.leaderboard_records is not None
+
+    # The page after a full page is empty, and there is no page after it
+    game.change_leaderboard_page(1)
+
+    assert get_leaderboard(game) == []
+    assert game.leaderboard_page == 1
+
+    game.change_leaderboard_page(1)
+
+    assert game.leaderboard_page == 1
+
+    game.change_leaderboard_page(-1)
+
+    assert len(get_leaderboard(game)) == SIZE
+    assert game.leaderboard_page == 0
+
+
+@pytest.mark.parametrize("order", RECORD_ORDERS)
+def test_only_all_records_have_pages(make_game, order):
+    game = make_game(make_records(SIZE * 3))
+    show_order(game, order)
+
+    game.change_leaderboard_page(1)
+
+    assert game.leaderboard_page == 0
+    assert game.leaderboard_records is not None
+
+
+def test_pages_wait_for_the_records(make_game):
+    game = make_game(make_records(SIZE * 3))
+    game.show_leaderboard()
+
+    while game.leaderboard_order != "all":
+        game.change_leaderboard_order()
+
+    # The page can't be changed before its records are read
+    game.change_leaderboard_page(1)
+
+    assert game.leaderboard_page == 0
+
+
+@pytest.mark.parametrize("order", Game.LEADERBOARD_ORDERS)
+def test_empty_leaderboard(make_game, order):
+    game = make_game()
+
+    assert show_order(game, order) == []
+
+    game.change_leaderboard_page(1)
+
+    assert game.leaderboard_page == 0
+
+
+def test_leaderboard_goes_back_to_the_first_page(make_game):
+    game = make_game(make_records(SIZE * 3))
+    show_order(game, "all")
+    game.change_leaderboard_page(1)
+    get_leaderboard(game)
+
+    game.change_leaderboard_order()
+
+    assert game.leaderboard_page == 0
+
+    game.show_leaderboard()
+
+    assert game.leaderboard_page == 0
+
+
+def test_leaderboard_without_records():
+    game = Game(save_records=False)
+    game.show_leaderboard()
+
+    assert game.leaderboard_records == []
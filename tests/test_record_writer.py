@@ -0,0 +1,172 @@
+import threading, time
+import pytest
+from db.db import CSVDB
+from db.record import Record
+from db.writer import RecordWriter
+
+
+class BatchDB(CSVDB):
+    # Keeps the size of every written batch and
+    # can fail the next batches on purpose
+    def __init__(self, filepath: str) -> None:
+        super().__init__(filepath)
+
+        self.batch_sizes = []
+        self.failures = 0
+        self.is_closed = False
+
+    def add_records(self, records: list[Record]):
+        if self.failures:
+            self.failures -= 1
+            raise OSError("Disk is full")
+
+        # The size is kept after the batch is written, so
+        # the tests that wait for it can read the records
+        super().add_records(records)
+        self.batch_sizes.append(len(records))
+
+    def close(self):
+        self.is_closed = True
+
+
+def make_records(count: int):
+    return [Record(score=i, kills=i, coins=i) for i in range(count)]
+
+
+def get_scores(db: CSVDB):
+    return [record.score for record in db.get_all_records()]
+
+
+@pytest.fixture
+def db(tmp_path):
+    return BatchDB(str(tmp_path / "records.csv"))
+
+
+def test_records_are_written_in_batches(db):
+    writer = RecordWriter(db, batch_size=4, flush_interval=60)
+
+    for record in make_records(10):
+        writer.add_record(record)
+
+    writer.flush()
+
+    assert db.batch_sizes == [4, 4, 2]
+    assert get_scores(db) == list(range(10))
+
+    writer.close()
+
+
+def test_batch_is_written_after_the_flush_interval(db):
+    writer = RecordWriter(db, batch_size=100, flush_interval=0.05)
+
+    for record in make_records(3):
+        writer.add_record(record)
+
+    deadline = time.monotonic() + 5
+
+    while not db.batch_sizes and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert db.batch_sizes == [3]
+    assert get_scores(db) == [0, 1, 2]
+
+    writer.close()
+
+
+def test_close_writes_the_queued_records(db):
+    writer = RecordWriter(db, batch_size=100, flush_interval=60)
+
+    for record in make_records(25):
+        writer.add_record(record)
+
+    writer.close()
+
+    assert db.is_closed
+    assert get_scores(CSVDB(db.filepath)) == list(range(25))
+
+
+def test_high_scores_are_found_before_writing(db):
+    db.add_records([Record(score=10, kills=0, coins=0)])
+    writer = RecordWriter(db, batch_size=100, flush_interval=60)
+
+    futures = [
+        writer.add_record(Record(score=score, kills=0, coins=0))
+        for score in (5, 12, 11, 12)
+    ]
+
+    assert [future.result(timeout=5) for future in futures] == [
+        False,
+        True,
+        False,
+        True,
+    ]
+
+    writer.close()
+
+
+def test_failed_batch_is_written_again(db):
+    # The full batch and the flush fail, the next flush writes it
+    db.failures = 2
+    writer = RecordWriter(db, batch_size=2, flush_interval=60)
+
+    for record in make_records(2):
+        writer.add_record(record)
+
+    with pytest.raises(OSError):
+        writer.flush()
+
+    writer.add_record(Record(score=2, kills=0, coins=0))
+    writer.flush()
+
+    assert writer.error is None
+    assert get_scores(db) == [0, 1, 2]
+
+    writer.close()
+
+
+def test_closed_writer_fails_new_tasks_at_once(db):
+    writer = RecordWriter(db)
+    writer.close()
+    writer.close()
+
+    record_future = writer.add_record(Record(score=1, kills=0, coins=0))
+    task_future = writer.submit(lambda db: db.get_all_records())
+
+    for future in (record_future, task_future):
+        assert future.done()
+        assert isinstance(future.exception(), RuntimeError)
+
+    assert not writer.is_running
+    assert get_scores(db) == []
+
+
+def test_full_queue_fails_new_tasks_at_once(db):
+    writer = RecordWriter(db, queue_size=2)
+    is_started, is_released = threading.Event(), threading.Event()
+
+    def wait(db):
+        is_started.set()
+        is_released.wait()
+
+    # The thread is kept busy and the queue is filled
+    wait_future = writer.submit(wait)
+    is_started.wait()
+    record_futures = [writer.add_record(record) for record in make_records(2)]
+
+    full_futures = [
+        writer.add_record(Record(score=9, kills=0, coins=0)),
+        writer.submit(lambda db: db.get_all_records()),
+    ]
+
+    for future in full_futures:
+        assert future.done()
+        assert isinstance(future.exception(), RuntimeError)
+
+    is_released.set()
+    wait_future.result()
+    writer.flush()
+
+    assert [future.result() for future in record_futures] == [True, True]
+    assert get_scores(db) == [0, 1]
+
+    writer.close()
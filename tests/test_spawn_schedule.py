@@ -0,0 +1,99 @@
+from itertools import count
+import pytest
+from config import conf
+from game.game import Game
+from game.sprites.spawn_schedule import SpawnEntry, SpawnSchedule
+
+
+def make_entries(length: int = None):
+    # Entries that are numbered by their distance offsets
+    numbers = count() if length is None else range(length)
+
+    return (SpawnEntry(float(i), Game.SPRITE_CLASSES[0], "left") for i in numbers)
+
+
+def get_offsets(entries):
+    return [entry.distance_offset for entry in entries]
+
+
+def test_schedule_is_filled_to_the_look_ahead():
+    schedule = SpawnSchedule(make_entries(), look_ahead=3)
+
+    assert len(schedule) == 3
+    assert get_offsets(schedule.upcoming) == [0, 1, 2]
+    assert schedule.next_entry.distance_offset == 0
+    assert schedule.spawned == 0
+
+
+def test_entries_are_popped_in_order_and_refilled():
+    schedule = SpawnSchedule(make_entries(), look_ahead=3)
+
+    assert get_offsets(schedule.pop() for _ in range(5)) == [0, 1, 2, 3, 4]
+    assert get_offsets(schedule.upcoming) == [5, 6, 7]
+    assert schedule.spawned == 5
+
+
+def test_finite_stream_is_ended():
+    schedule = SpawnSchedule(make_entries(4), look_ahead=3)
+
+    assert get_offsets(schedule.pop() for _ in range(4)) == [0, 1, 2, 3]
+    assert len(schedule) == 0
+    assert schedule.next_entry is None
+
+    with pytest.raises(IndexError):
+        schedule.pop()
+
+
+def test_stream_is_only_read_to_the_look_ahead():
+    entries = make_entries()
+    schedule = SpawnSchedule(entries, look_ahead=2)
+    schedule.pop()
+
+    # The schedule has read the popped entry and the two upcoming ones
+    assert next(entries).distance_offset == 3
+
+
+def get_schedule(seed: int, pops: int):
+    # The upcoming entries and the popped ones of a game schedule
+    game = Game(save_records=False)
+    game.start(seed)
+
+    upcoming = list(game.spawn_schedule.upcoming)
+    popped = [game.spawn_schedule.pop() for _ in range(pops)]
+
+    return upcoming, popped
+
+
+def test_game_schedule_is_filled_to_the_look_ahead():
+    upcoming, _ = get_schedule(seed=0, pops=0)
+
+    assert len(upcoming) == conf.SPAWN_SCHEDULE_LOOK_AHEAD
+
+
+def test_same_seed_gives_same_schedule():
+    assert get_schedule(seed=7, pops=100) == get_schedule(seed=7, pops=100)
+
+
+def test_other_seed_gives_other_schedule():
+    assert get_schedule(seed=7, pops=100) != get_schedule(seed=8, pops=100)
+
+
+def test_same_seed_gives_same_spawns_in_game():
+    # The played games spawn the same sprites at the same places
+    def play(seed: int, ticks: int = 600):
+        game = Game(save_records=False)
+        game.start(seed)
+
+        for _ in range(ticks):
+            game.step()
+
+        sprites = sorted(
+            (sprite.y, sprite.x, type(sprite).__name__) for sprite in game.SPRITES
+        )
+
+        return game.spawn_schedule.spawned, sprites
+
+    spawned, sprites = play(3)
+
+    assert spawned > 0
+    assert play(3) == (spawned, sprites)
@@ -0,0 +1,132 @@
+import math
+from collections import Counter
+from random import Random
+import pytest
+from config import conf
+from game.game import Game
+from game.sprites.spawn_table import AliasTable, SpawnTables
+
+SAMPLES = 200000
+
+
+def get_frequencies(table: AliasTable, samples: int = SAMPLES, seed: int = 0):
+    rng = Random(seed)
+    counts = Counter(table.sample(rng) for _ in range(samples))
+
+    return {item: counts[item] / samples for item in table.items}
+
+
+def check_frequencies(items: list, weights: list[float], table: AliasTable):
+    # Every frequency is in 5 standard deviations of its weight
+    total_weight = sum(weights)
+    frequencies = get_frequencies(table)
+
+    for item, weight in zip(items, weights):
+        probability = weight / total_weight
+        tolerance = 5 * math.sqrt(probability * (1 - probability) / SAMPLES)
+
+        assert abs(frequencies[item] - probability) <= tolerance, item
+
+
+@pytest.mark.parametrize(
+    "weights",
+    [
+        [1] * 8,
+        [100, 1, 1, 1],
+        [0.01, 0.2, 5, 0, 3.5, 0.7],
+        Game.SPRITE_DROP_WEIGHTS,
+    ],
+)
+def test_frequencies_match_weights(weights):
+    items = list(range(len(weights)))
+
+    check_frequencies(items, weights, AliasTable(items, weights))
+
+
+def test_zero_weight_is_never_sampled():
+    table = AliasTable(["a", "b", "c"], [1, 0, 2])
+
+    assert get_frequencies(table, samples=20000)["b"] == 0
+
+
+def test_single_item():
+    table = AliasTable(["a"], [3])
+
+    assert get_frequencies(table, samples=100) == {"a": 1}
+
+
+def test_same_seed_samples_same_items():
+    table = AliasTable(Game.SPRITE_CLASSES, Game.SPRITE_DROP_WEIGHTS)
+    rng_1, rng_2 = Random(5), Random(5)
+
+    assert [table.sample(rng_1) for _ in range(1000)] == [
+        table.sample(rng_2) for _ in range(1000)
+    ]
+
+
+@pytest.mark.parametrize("tier_index", range(len(conf.SPAWN_DIFFICULTY_TIERS)))
+def test_tier_frequencies_match_weights(tier_index):
+    spawn_tables = SpawnTables(
+        Game.SPRITE_CLASSES, Game.SPRITE_DROP_WEIGHTS, conf.SPAWN_DIFFICULTY_TIERS
+    )
+    tier = spawn_tables.tiers[tier_index]
+    weights = [
+        weight * tier.get(sprite_class.SPAWN_CATEGORY, 1)
+        for sprite_class, weight in zip(Game.SPRITE_CLASSES, Game.SPRITE_DROP_WEIGHTS)
+    ]
+
+    assert spawn_tables.get_tier(tier["min_speed"]) == tier_index
+
+    check_frequencies(
+        Game.SPRITE_CLASSES, weights, spawn_tables.get_table(tier["min_speed"])
+    )
+
+
+@pytest.mark.parametrize(
+    "items, weights",
+    [
+        ([], []),
+        (["a", "b"], [1, -1]),
+        (["a", "b"], [0, 0]),
+        (["a", "b"], [1]),
+    ],
+)
+def test_invalid_weights_raise_value_error(items, weights):
+    with pytest.raises(ValueError):
+        AliasTable(items, weights)
+
+
+def test_tier_without_weights_raises_value_error():
+    tiers = [{"min_speed": 0, "enemy": 0, "obstacle": 0, "item": 0}]
+
+    with pytest.raises(ValueError):
+        SpawnTables(Game.SPRITE_CLASSES, Game.SPRITE_DROP_WEIGHTS, tiers)
+
+
+def test_generating_spawns_keeps_the_spawn_table():
+    game = Game(save_records=False)
+    game.start(seed=0)
+    spawn_table = game.spawn_table
+
+    # The speed is changed without picking the table again
+    game.speed = conf.MAX_GAME_SPEED
+
+    for _ in range(10):
+        game.spawn_schedule.pop()
+
+    assert game.spawn_table is spawn_table
+
+
+def test_spawn_table_follows_the_difficulty_tier():
+    game = Game(save_records=False)
+    game.start(seed=0)
+
+    for tier in game.spawn_tables.tiers:
+        game.speed = tier["min_speed"]
+        game.update_spawn_table()
+
+        assert game.spawn_table is game.spawn_tables.get_table(tier["min_speed"])
+
+    game.reset()
+
+    assert game.spawn_table is game.spawn_tables.get_table(conf.GAME_SPEED)
@@ -0,0 +1,122 @@
+from random import Random
+import pytest
+from pygame.sprite import Group
+from game.game import Game
+from game.sprites.enemies import Enemy
+from game.sprites.pool import SpritePool
+
+# The slots that are not the state of the sprite itself
+POOL_SLOTS = ("rng", "pool", "store", "slot")
+
+
+def get_state(sprite):
+    # All the slot values of the sprite and its rect
+    state = {
+        name: getattr(sprite, name)
+        for cls in type(sprite).__mro__
+        for name in cls.__dict__.get("__slots__", ())
+        if name not in POOL_SLOTS
+    }
+    state["rect"] = tuple(state["rect"])
+
+    return state
+
+
+def spawn(pool: SpritePool, sprite_class: type, seed: int, lane: str = None):
+    # Only the sprites in a group go back to the pool when they are killed
+    sprite = pool.acquire(sprite_class, Random(seed), lane)
+    Group(sprite)
+
+    return sprite
+
+
+@pytest.mark.parametrize("sprite_class", Game.SPRITE_CLASSES)
+def test_killed_sprite_is_reused_with_a_fresh_state(sprite_class):
+    pool = SpritePool()
+    sprite = spawn(pool, sprite_class, seed=1)
+
+    # Change the sprite like a game does before it is killed
+    for _ in range(30):
+        sprite.update(7)
+        sprite.change_animation()
+
+    sprite.is_impacted = True
+
+    if isinstance(sprite, Enemy):
+        sprite.die()
+
+    sprite.kill()
+
+    reused_sprite = pool.acquire(sprite_class, Random(2), "right")
+
+    assert reused_sprite is sprite
+    assert get_state(reused_sprite) == get_state(sprite_class.spawn(Random(2), "right"))
+    assert pool.stats["created"] == 1
+    assert pool.stats["reused"] == 1
+
+
+def test_sprite_is_released_once_when_it_is_killed_twice():
+    pool = SpritePool()
+    sprite_class = Game.SPRITE_CLASSES[0]
+    sprite = spawn(pool, sprite_class, seed=1)
+
+    sprite.kill()
+    sprite.kill()
+
+    assert len(pool) == 1
+    assert pool.acquire(sprite_class, Random(1)) is sprite
+    assert pool.acquire(sprite_class, Random(1)) is not sprite
+
+
+def test_sprite_is_kept_once_when_it_is_released_twice():
+    pool = SpritePool()
+    sprite_class = Game.SPRITE_CLASSES[0]
+    sprite = pool.acquire(sprite_class, Random(1))
+
+    pool.release(sprite)
+    pool.release(sprite)
+
+    assert len(pool) == 1
+
+
+def test_last_released_sprite_is_acquired_first():
+    pool = SpritePool()
+    sprite_class = Game.SPRITE_CLASSES[0]
+    sprites = [spawn(pool, sprite_class, seed) for seed in range(3)]
+
+    for sprite in sprites:
+        sprite.kill()
+
+    assert [pool.acquire(sprite_class, Random(0)) for _ in sprites] == sprites[::-1]
+
+
+def test_sprites_of_other_classes_are_not_reused():
+    pool = SpritePool()
+    first_class, second_class = Game.SPRITE_CLASSES[:2]
+
+    spawn(pool, first_class, seed=1).kill()
+
+    assert type(pool.acquire(second_class, Random(1))) is second_class
+    assert pool.stats["reused"] == 0
+
+
+def test_prewarmed_sprites_are_reused():
+    pool = SpritePool()
+    pool.prewarm(Game.SPRITE_CLASSES, count=2)
+
+    assert len(pool) == 2 * len(Game.SPRITE_CLASSES)
+
+    for sprite_class in Game.SPRITE_CLASSES:
+        pool.acquire(sprite_class, Random(0))
+
+    assert pool.stats["created"] == 2 * len(Game.SPRITE_CLASSES)
+    assert pool.reuse_rate == 1.0
+
+
+@pytest.mark.parametrize("sprite_class", Game.SPRITE_CLASSES)
+def test_sprite_values_are_kept_in_slots(sprite_class):
+    # Only the groups of the pygame sprite are in its dict
+    sprite = spawn(SpritePool(), sprite_class, seed=0)
+
+    assert "__slots__" in vars(sprite_class)
+    assert list(vars(sprite)) == ["_Sprite__g"]
@@ -0,0 +1,108 @@
+from random import Random
+import pytest
+from pygame.sprite import Group
+from game.game import Game
+from game.sprites.pool import SpritePool
+from game.sprites.store import (
+    FLOAT_FIELDS,
+    SpriteStore,
+    get_stored_class,
+    get_unstored_class,
+    is_store_available,
+)
+
+pytestmark = pytest.mark.skipif(
+    not is_store_available(), reason="The sprite store needs NumPy"
+)
+
+SPRITE_VALUES = FLOAT_FIELDS + ("width", "height", "side", "current_model")
+
+
+def get_values(sprite):
+    return {name: getattr(sprite, name) for name in SPRITE_VALUES}
+
+
+@pytest.mark.parametrize("sprite_class", Game.SPRITE_CLASSES)
+def test_stored_sprite_has_the_values_of_a_normal_sprite(sprite_class):
+    store = SpriteStore(capacity=2)
+    stored_sprite = sprite_class.spawn(Random(3), "left", store)
+    sprite = sprite_class.spawn(Random(3), "left")
+
+    assert isinstance(stored_sprite, sprite_class)
+    assert type(stored_sprite) is get_stored_class(sprite_class)
+    assert get_unstored_class(type(stored_sprite)) is sprite_class
+    assert get_values(stored_sprite) == get_values(sprite)
+
+    for field in FLOAT_FIELDS:
+        assert getattr(store, field)[stored_sprite.slot] == getattr(sprite, field)
+
+
+@pytest.mark.parametrize("sprite_class", Game.SPRITE_CLASSES)
+def test_values_survive_adding_and_removing(sprite_class):
+    store = SpriteStore(capacity=2)
+    sprite = sprite_class.spawn(Random(3), None, store)
+    sprite_type = type(sprite)
+
+    store.add(sprite)
+    store.update(4.0)
+    sprite.sync_rect()
+    values = get_values(sprite)
+
+    assert store.is_active[sprite.slot]
+
+    store.remove(sprite)
+
+    assert not store.is_active[sprite.slot]
+    assert type(sprite) is sprite_type
+    assert get_values(sprite) == values
+
+
+def test_values_survive_growing_the_store():
+    store = SpriteStore(capacity=1)
+    sprites = [
+        sprite_class.spawn(Random(i), None, store)
+        for i, sprite_class in enumerate(Game.SPRITE_CLASSES)
+    ]
+    values = [get_values(sprite) for sprite in sprites]
+
+    assert store.capacity >= len(sprites)
+    assert [get_values(sprite) for sprite in sprites] == values
+    assert len({sprite.slot for sprite in sprites}) == len(sprites)
+
+
+@pytest.mark.parametrize("sprite_class", Game.SPRITE_CLASSES)
+def test_recycled_sprite_keeps_its_class_and_slot(sprite_class):
+    store = SpriteStore(capacity=2)
+    pool = SpritePool(store)
+
+    # Only the sprites in a group go back to the pool
+    sprite = pool.acquire(sprite_class, Random(1))
+    store.add(sprite)
+    Group(sprite)
+    slot = sprite.slot
+    sprite.kill()
+
+    recycled_sprite = pool.acquire(sprite_class, Random(1))
+
+    assert recycled_sprite is sprite
+    assert type(recycled_sprite) is get_stored_class(sprite_class)
+    assert recycled_sprite.slot == slot
+    assert get_values(recycled_sprite) == get_values(sprite_class.spawn(Random(1)))
+
+
+def test_dead_enemies_animate_themselves():
+    store = SpriteStore(capacity=4)
+    enemy_class = next(
+        sprite_class
+        for sprite_class in Game.SPRITE_CLASSES
+        if sprite_class.SPAWN_CATEGORY == "enemy"
+    )
+    enemies = [enemy_class.spawn(Random(i), None, store) for i in range(3)]
+
+    for enemy in enemies:
+        store.add(enemy)
+
+    enemies[1].die()
+    store.remove(enemies[2])
+
+    assert store.get_self_animated_sprites() == [enemies[1]]
@@ -0,0 +1,161 @@
+import json, os, shutil
+import pytest
+from config import conf
+from db.db import CSVDB
+from db.log_db import RecordLogDB
+from db.record import Record
+
+DATE = "Mon Jan  2 10:00:00 2023"
+
+# The backends that save their top records next to their file
+BACKENDS = {"csv": (CSVDB, "records.csv"), "log": (RecordLogDB, "records.log")}
+
+
+@pytest.fixture(params=BACKENDS)
+def open_db(request, tmp_path):
+    db_class, filename = BACKENDS[request.param]
+    opened_dbs = []
+
+    def open_db():
+        db = db_class(str(tmp_path / filename))
+        opened_dbs.append(db)
+
+        return db
+
+    yield open_db
+
+    for db in opened_dbs:
+        db.close()
+
+
+def make_records(scores: list[int]):
+    return [Record(score=score, kills=0, coins=0, date=DATE) for score in scores]
+
+
+def get_scores(db):
+    return [record.score for record in db.top_records.records]
+
+
+def read_top_records_file(db):
+    with open(db.top_records_filepath) as top_records_file:
+        return json.load(top_records_file)
+
+
+def write_top_records_file(db, data):
+    with open(db.top_records_filepath, mode="w") as top_records_file:
+        top_records_file.write(data if isinstance(data, str) else json.dumps(data))
+
+
+def test_top_records_are_saved_with_the_file_signature(open_db):
+    db = open_db()
+    db.add_records(make_records([3, 9, 5]))
+
+    data = read_top_records_file(db)
+
+    assert data["signature"] == db.file_signature
+    assert [record[1] for record in data["records"]] == [9, 5, 3]
+
+
+def test_top_records_of_the_same_file_are_loaded(open_db):
+    db = open_db()
+    db.add_records(make_records([3, 9, 5]))
+
+    # The loaded records are trusted, so they are not read from the file
+    data = read_top_records_file(db)
+    data["records"] = [[DATE, 42, 0, 0]]
+    write_top_records_file(db, data)
+
+    assert get_scores(open_db()) == [42]
+
+
+def test_top_records_are_read_again_for_a_changed_file(open_db):
+    db = open_db()
+    db.add_records(make_records([3, 9]))
+    old_top_records_filepath = db.top_records_filepath + ".old"
+    shutil.copy(db.top_records_filepath, old_top_records_filepath)
+
+    # The file is changed after the top records are saved
+    db.add_records(make_records([12]))
+    shutil.copy(old_top_records_filepath, db.top_records_filepath)
+
+    reopened_db = open_db()
+
+    assert get_scores(reopened_db) == [12, 9, 3]
+    assert read_top_records_file(reopened_db)["signature"] == db.file_signature
+
+
+def test_top_records_are_read_again_for_another_signature(open_db):
+    db = open_db()
+    db.add_records(make_records([3, 9]))
+    write_top_records_file(db, {"signature": [0, 0], "records": [[DATE, 42, 0, 0]]})
+
+    assert get_scores(open_db()) == [9, 3]
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        "{not json",
+        "",
+        "[]",
+        '{"records": []}',
+        json.dumps({"signature": None, "records": [[DATE, "42"]]}),
+    ],
+)
+def test_broken_top_records_are_read_again(open_db, data):
+    db = open_db()
+    db.add_records(make_records([3, 9]))
+    write_top_records_file(db, data)
+
+    reopened_db = open_db()
+
+    assert get_scores(reopened_db) == [9, 3]
+    # The broken file is replaced by the read top records
+    assert read_top_records_file(reopened_db)["signature"] == db.file_signature
+
+
+def test_missing_top_records_are_read_again(open_db):
+    db = open_db()
+    db.add_records(make_records([3, 9]))
+    db.close()
+
+    os.remove(db.top_records_filepath)
+
+    assert get_scores(open_db()) == [9, 3]
+
+
+def test_cleared_records_have_no_top_records(open_db):
+    db = open_db()
+    db.add_records(make_records([3, 9]))
+    db.clear_all_records()
+
+    assert db.best_score is None
+    assert read_top_records_file(db) == {
+        "signature": db.file_signature,
+        "records": [],
+    }
+
+    reopened_db = open_db()
+
+    assert reopened_db.best_score is None
+
+    reopened_db.add_records(make_records([4]))
+
+    assert get_scores(open_db()) == [4]
+
+
+def test_top_records_of_cleared_records_are_read_again(open_db):
+    db = open_db()
+    db.add_records(make_records([3, 9]))
+    write_top_records_file(db, "{not json")
+    db.clear_all_records()
+    write_top_records_file(db, "{not json")
+
+    assert open_db().best_score is None
+
+
+def test_only_the_best_records_are_kept(open_db):
+    db = open_db()
+    db.add_records(make_records(range(conf.DB_TOP_RECORDS_COUNT + 5)))
+
+    assert get_scores(open_db()) == list(range(conf.DB_TOP_RECORDS_COUNT + 4, 4, -1))